@@ -5,6 +5,12 @@ import os
 import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
+from ocitools.paging import paginate
+
 # --- Configurações ---
 CSV_FILE = "oci_instances_backup_policies_report.csv"
 LOG_DIR = "./logs"
@@ -68,19 +74,14 @@ def listar_instancias_e_politicas():
     nas regiões especificadas e exporta para um arquivo CSV.
     """
     # Carrega a configuração padrão do OCI
-    config = oci.config.from_file()
-    identity_client = oci.identity.IdentityClient(config)
+    config = load_config()
+    identity_client = create_client(oci.identity.IdentityClient, config)
     tenancy_id = config['tenancy']
     
     # Lista todos os compartimentos (inclusive o root)
     logging.info("Listando compartimentos na tenancy...")
     try:
-        compartments = oci.pagination.list_call_get_all_results(
-            identity_client.list_compartments,
-            tenancy_id,
-            compartment_id_in_subtree=True
-        ).data
-        compartments.append(identity_client.get_compartment(tenancy_id).data)
+        compartments = CompartmentTree.load(identity_client, tenancy_id).compartments(include_root=True)
     except Exception as e:
         logging.error(f"Erro ao listar compartimentos: {e}")
         return
@@ -97,8 +98,8 @@ def listar_instancias_e_politicas():
             logging.info(f"\nIniciando processamento na região: {region}...")
             config['region'] = region
             try:
-                compute_client = oci.core.ComputeClient(config)
-                block_storage_client = oci.core.BlockstorageClient(config)
+                compute_client = create_client(oci.core.ComputeClient, config)
+                block_storage_client = create_client(oci.core.BlockstorageClient, config)
             except Exception as e:
                 logging.error(f"Erro ao criar clientes OCI para a região {region}: {e}")
                 continue
@@ -110,10 +111,10 @@ def listar_instancias_e_politicas():
                 logging.info(f"  > Processando compartment: {comp.name}")
                 
                 try:
-                    instances = oci.pagination.list_call_get_all_results(
+                    instances = list(paginate(
                         compute_client.list_instances,
                         compartment_id=comp.id
-                    ).data
+                    ))
                 except Exception as e:
                     logging.warning(f"    - Erro ao listar instâncias no compartment {comp.name}: {e}")
                     continue
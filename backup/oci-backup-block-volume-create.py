@@ -1,6 +1,4 @@
 import oci
-import time
-import random
 import logging
 import smtplib
 from email.mime.multipart import MIMEMultipart
@@ -9,6 +7,13 @@ from email.mime.base import MIMEBase
 from email import encoders
 from datetime import datetime, timedelta, timezone
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
+from ocitools.paging import paginate
 
 # Configurações
 RETENCAO_DIAS = 15
@@ -34,10 +39,10 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 ])
 
 # OCI Config
-config = oci.config.from_file()
+config = load_config()
 config['region'] = 'sa-saopaulo-1'
-block_storage = oci.core.BlockstorageClient(config)
-identity = oci.identity.IdentityClient(config)
+block_storage = create_client(oci.core.BlockstorageClient, config, rate_limit=True)
+identity = create_client(oci.identity.IdentityClient, config, rate_limit=True)
 
 def enviar_email_alerta(log_filename):
     try:
@@ -64,19 +69,15 @@ def enviar_email_alerta(log_filename):
         logging.error(f"Erro ao enviar email de alerta: {str(e)}")
 
 def get_compartment_id():
-    compartments = oci.pagination.list_call_get_all_results(
-        identity.list_compartments,
-        config['tenancy'],
-        compartment_id_in_subtree=True
-    ).data
-    for comp in compartments:
-        if comp.name == COMPARTMENT_NAME:
-            return comp.id
-    raise ValueError(f"Compartment {COMPARTMENT_NAME} não encontrado")
+    try:
+        # Sem o cache de compartimentos: este script altera recursos
+        return CompartmentTree.load(identity, config['tenancy'], refresh=True).id_of(COMPARTMENT_NAME, lifecycle_state=None)
+    except KeyError:
+        raise ValueError(f"Compartment {COMPARTMENT_NAME} não encontrado")
 
 def delete_old_backups(volume_id):
     cutoff_time = datetime.now(timezone.utc) - timedelta(days=RETENCAO_DIAS)
-    backups = block_storage.list_volume_backups(compartment_id=compartment_id, volume_id=volume_id).data
+    backups = paginate(block_storage.list_volume_backups, compartment_id=compartment_id, volume_id=volume_id)
     for backup in backups:
         backup_time = backup.time_created.replace(tzinfo=timezone.utc)
         if backup_time < cutoff_time:
@@ -89,31 +90,24 @@ def delete_old_backups(volume_id):
             else:
                 logging.warning(f"⏳ Backup ignorado (estado {backup.lifecycle_state}): {backup.display_name}")
 
-def criar_backup_com_backoff(volume, max_retentativas=5):
-    espera = 5
+def criar_backup(volume):
     backup_name = f"BlockBackup-{volume.display_name}-{datetime.now(timezone.utc).strftime('BKPAUTCITEL-%Y%m%d-%H%M')}"
     backup_details = oci.core.models.CreateVolumeBackupDetails(
         volume_id=volume.id,
         display_name=backup_name,
         type="FULL"
     )
-    for tentativa in range(max_retentativas):
-        try:
-            block_storage.create_volume_backup(backup_details)
-            logging.info(f"✅ Backup criado: {backup_name}")
-            return True
-        except oci.exceptions.ServiceError as e:
-            if e.status == 429 and "TooManyRequests" in str(e):
-                logging.warning(f"⚠️ Tentativa {tentativa+1}: Limite de requisições. Aguardando {espera}s...")
-                time.sleep(espera + random.uniform(0, 5))
-                espera *= 2
-            else:
-                logging.error(f"❌ Erro ao criar backup: {str(e)}")
-                return False
-        except Exception as e:
-            logging.error(f"❌ Erro inesperado: {str(e)}")
-            return False
-    return False
+    # Limites de requisições (429) são tratados pelo rate limiter compartilhado do cliente
+    try:
+        block_storage.create_volume_backup(backup_details)
+        logging.info(f"✅ Backup criado: {backup_name}")
+        return True
+    except oci.exceptions.ServiceError as e:
+        logging.error(f"❌ Erro ao criar backup: {str(e)}")
+        return False
+    except Exception as e:
+        logging.error(f"❌ Erro inesperado: {str(e)}")
+        return False
 
 def main():
     global compartment_id
@@ -127,7 +121,7 @@ def main():
         if bv.lifecycle_state != "AVAILABLE":
             continue
         logging.info(f"\n🔍 Processando block volume: {bv.display_name}")
-        sucesso = criar_backup_com_backoff(bv)
+        sucesso = criar_backup(bv)
         if not sucesso:
             falhas.append(bv)
         delete_old_backups(bv.id)
@@ -135,7 +129,7 @@ def main():
         logging.info("\n🔁 Tentando novamente os backups que falharam...")
         for bv in falhas:
             logging.info(f"\n🔄 Reprocessando: {bv.display_name}")
-            criar_backup_com_backoff(bv)
+            criar_backup(bv)
 
 if __name__ == "__main__":
     try:
@@ -1,8 +1,6 @@
 # INÍCIO DO SCRIPT
 
 import oci
-import time
-import random
 import logging
 import smtplib
 from email.mime.multipart import MIMEMultipart
@@ -11,6 +9,13 @@ from email.mime.base import MIMEBase
 from email import encoders
 from datetime import datetime, timedelta, timezone
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
+from ocitools.paging import paginate
 
 # Configurações
 RETENCAO_DIAS = 15
@@ -36,10 +41,10 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 ])
 
 # OCI Config
-config = oci.config.from_file()
+config = load_config()
 config['region'] = 'sa-saopaulo-1'
-block_storage = oci.core.BlockstorageClient(config)
-identity = oci.identity.IdentityClient(config)
+block_storage = create_client(oci.core.BlockstorageClient, config, rate_limit=True)
+identity = create_client(oci.identity.IdentityClient, config, rate_limit=True)
 
 def enviar_email_alerta(log_filename):
     try:
@@ -66,22 +71,19 @@ def enviar_email_alerta(log_filename):
         logging.error(f"Erro ao enviar email de alerta: {str(e)}")
 
 def get_compartment_id():
-    compartments = oci.pagination.list_call_get_all_results(
-        identity.list_compartments,
-        config['tenancy'],
-        compartment_id_in_subtree=True
-    ).data
-    for comp in compartments:
-        if comp.name == COMPARTMENT_NAME:
-            return comp.id
-    raise ValueError(f"Compartment {COMPARTMENT_NAME} não encontrado")
+    try:
+        # Sem o cache de compartimentos: este script altera recursos
+        return CompartmentTree.load(identity, config['tenancy'], refresh=True).id_of(COMPARTMENT_NAME, lifecycle_state=None)
+    except KeyError:
+        raise ValueError(f"Compartment {COMPARTMENT_NAME} não encontrado")
 
 def delete_old_backups(boot_volume_id):
     cutoff_time = datetime.now(timezone.utc) - timedelta(days=RETENCAO_DIAS)
-    backups = block_storage.list_boot_volume_backups(
+    backups = paginate(
+        block_storage.list_boot_volume_backups,
         compartment_id=compartment_id,
         boot_volume_id=boot_volume_id
-    ).data
+    )
     for backup in backups:
         backup_time = backup.time_created.replace(tzinfo=timezone.utc)
         if backup_time < cutoff_time:
@@ -94,31 +96,24 @@ def delete_old_backups(boot_volume_id):
             else:
                 logging.warning(f"⏳ Backup ignorado (estado {backup.lifecycle_state}): {backup.display_name}")
 
-def criar_backup_com_backoff(boot_volume, max_retentativas=5):
-    espera = 1
+def criar_backup(boot_volume):
     backup_name = f"BootBackup-{boot_volume.display_name}-{datetime.now(timezone.utc).strftime('BKPAUTCITEL-%Y%m%d-%H%M')}"
     backup_details = oci.core.models.CreateBootVolumeBackupDetails(
         boot_volume_id=boot_volume.id,
         display_name=backup_name,
         type="FULL"
     )
-    for tentativa in range(max_retentativas):
-        try:
-            block_storage.create_boot_volume_backup(backup_details)
-            logging.info(f"✅ Backup criado: {backup_name}")
-            return True
-        except oci.exceptions.ServiceError as e:
-            if e.status == 429 and "TooManyRequests" in str(e):
-                logging.warning(f"⚠️ Tentativa {tentativa+1}: Limite de requisições. Aguardando {espera}s...")
-                time.sleep(espera + random.uniform(0, 5))
-                espera *= 2
-            else:
-                logging.error(f"❌ Erro ao criar backup: {str(e)}")
-                return False
-        except Exception as e:
-            logging.error(f"❌ Erro inesperado: {str(e)}")
-            return False
-    return False
+    # Limites de requisições (429) são tratados pelo rate limiter compartilhado do cliente
+    try:
+        block_storage.create_boot_volume_backup(backup_details)
+        logging.info(f"✅ Backup criado: {backup_name}")
+        return True
+    except oci.exceptions.ServiceError as e:
+        logging.error(f"❌ Erro ao criar backup: {str(e)}")
+        return False
+    except Exception as e:
+        logging.error(f"❌ Erro inesperado: {str(e)}")
+        return False
 
 def main():
     global compartment_id
@@ -132,7 +127,7 @@ def main():
         if bv.lifecycle_state != "AVAILABLE":
             continue
         logging.info(f"\n🔍 Processando boot volume: {bv.display_name}")
-        sucesso = criar_backup_com_backoff(bv)
+        sucesso = criar_backup(bv)
         if not sucesso:
             falhas.append(bv)
         delete_old_backups(bv.id)
@@ -140,7 +135,7 @@ def main():
         logging.info("\n🔁 Tentando novamente os backups que falharam...")
         for bv in falhas:
             logging.info(f"\n🔄 Reprocessando: {bv.display_name}")
-            criar_backup_com_backoff(bv)
+            criar_backup(bv)
 
 if __name__ == "__main__":
     try:
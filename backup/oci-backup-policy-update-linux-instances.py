@@ -5,6 +5,12 @@ import json
 import datetime
 import logging
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
 
 # Configuração de logging
 log_file = '/var/log/backup_policy_updater.log'
@@ -24,16 +30,9 @@ target_policy_name = "Bkp-Hora-Hora"
 
 def get_compartment_ocid(identity_client, tenancy_id, compartment_name):
     try:
-        compartments = oci.pagination.list_call_get_all_results(
-            identity_client.list_compartments,
-            tenancy_id,
-            compartment_id_in_subtree=True,
-            access_level="ANY"
-        ).data
-
-        for compartment in compartments:
-            if compartment.name == compartment_name and compartment.lifecycle_state == "ACTIVE":
-                return compartment.id
+        # Sem o cache de compartimentos: este script altera recursos
+        return CompartmentTree.load(identity_client, tenancy_id, refresh=True).id_of(compartment_name)
+    except KeyError:
         return None
     except Exception as e:
         logger.error(f"Erro ao buscar compartimento: {str(e)}")
@@ -52,13 +51,13 @@ def main():
         try:
             signer = oci.auth.signers.InstancePrincipalsSecurityTokenSigner()
             config = {'region': signer.region, 'tenancy': signer.tenancy_id}
-            identity_client = oci.identity.IdentityClient(config, signer=signer)
+            identity_client = create_client(oci.identity.IdentityClient, config, signer=signer)
             logger.info("Autenticação via Instance Principal")
         except Exception as auth_error:
             logger.warning(f"Falha Instance Principal: {str(auth_error)}")
             logger.warning("Usando autenticação por arquivo de configuração")
-            config = oci.config.from_file()
-            identity_client = oci.identity.IdentityClient(config)
+            config = load_config()
+            identity_client = create_client(oci.identity.IdentityClient, config)
         
         # Obter OCID do Tenancy
         tenancy_id = config["tenancy"] if "tenancy" in config else signer.tenancy_id
@@ -2,14 +2,21 @@ import oci
 import subprocess
 import json
 import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
 
 # Nome do compartimento e da policy alvo
 compartment_name = "ClientesAutcom1"
 target_policy_name = "TESTE_RETENTION"
 
 # Configuração OCI
-config = oci.config.from_file()
-identity_client = oci.identity.IdentityClient(config)
+config = load_config()
+identity_client = create_client(oci.identity.IdentityClient, config)
 
 # Obter hora atual em UTC e calcular próxima hora
 now_utc = datetime.datetime.utcnow()
@@ -20,17 +27,11 @@ print(f"🎯 Definindo backup para próxima hora cheia: {target_hour:02d}:00 UTC
 
 # Função para obter OCID do compartimento
 def get_compartment_ocid(compartment_name, identity_client, tenancy_id):
-    compartments = oci.pagination.list_call_get_all_results(
-        identity_client.list_compartments,
-        tenancy_id,
-        compartment_id_in_subtree=True,
-        access_level="ANY"
-    ).data
-
-    for compartment in compartments:
-        if compartment.name == compartment_name and compartment.lifecycle_state == "ACTIVE":
-            return compartment.id
-    return None
+    try:
+        # Sem o cache de compartimentos: este script altera recursos
+        return CompartmentTree.load(identity_client, tenancy_id, refresh=True).id_of(compartment_name)
+    except KeyError:
+        return None
 
 # Obter OCID do Tenancy
 tenancy_id = config["tenancy"]
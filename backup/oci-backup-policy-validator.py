@@ -6,6 +6,14 @@ import argparse
 from datetime import datetime, timedelta, timezone
 from concurrent.futures import ThreadPoolExecutor
 from collections import defaultdict
+from itertools import islice
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
+from ocitools.paging import paginate
 
 # Códigos ANSI para cores
 RESET = "\033[0m"
@@ -58,27 +66,22 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 ])
 
 # Carrega configuração da OCI
-config = oci.config.from_file()
+config = load_config()
 config['region'] = 'sa-saopaulo-1'
 
 # Inicializa os clients
-compute_client = oci.core.ComputeClient(config)
-block_storage_client = oci.core.BlockstorageClient(config)
-identity_client = oci.identity.IdentityClient(config)
+compute_client = create_client(oci.core.ComputeClient, config)
+block_storage_client = create_client(oci.core.BlockstorageClient, config)
+identity_client = create_client(oci.identity.IdentityClient, config)
 
 # Armazena os resumos por instância
 resumo_por_instancia = defaultdict(list)
 
 def get_compartment_id():
-    compartments = oci.pagination.list_call_get_all_results(
-        identity_client.list_compartments,
-        config['tenancy'],
-        compartment_id_in_subtree=True
-    ).data
-    for comp in compartments:
-        if comp.name == COMPARTMENT_NAME:
-            return comp.id
-    raise ValueError(f"Compartment {COMPARTMENT_NAME} não encontrado")
+    try:
+        return CompartmentTree.load(identity_client, config['tenancy']).id_of(COMPARTMENT_NAME, lifecycle_state=None)
+    except KeyError:
+        raise ValueError(f"Compartment {COMPARTMENT_NAME} não encontrado")
 
 def verificar_backups(backups, volume_name, volume_type):
     now = datetime.now(timezone.utc)
@@ -130,11 +133,11 @@ def processar_instancia(instancia, compartment_id):
         print(f"  {BOLD}{GREEN}🟢 BootVolume:{RESET} {boot_volume.display_name} - ID: {boot_volume.id}")
         logging.info(f"  🟢 BootVolume: {boot_volume.display_name} - ID: {boot_volume.id}")
 
-        backups = oci.pagination.list_call_get_all_results(
+        backups = list(paginate(
             block_storage_client.list_boot_volume_backups,
             compartment_id=compartment_id,
             boot_volume_id=boot_volume.id
-        ).data
+        ))
 
         # Aplicar filtros
         if SOURCE_TYPE:
@@ -162,11 +165,11 @@ def processar_instancia(instancia, compartment_id):
         print(f"  {BOLD}{BLUE}🔵 BlockVolume:{RESET} {block_volume.display_name} - ID: {block_volume.id}")
         logging.info(f"  🔵 BlockVolume: {block_volume.display_name} - ID: {block_volume.id}")
 
-        backups = oci.pagination.list_call_get_all_results(
+        backups = list(paginate(
             block_storage_client.list_volume_backups,
             compartment_id=compartment_id,
             volume_id=block_volume.id
-        ).data
+        ))
 
         # Aplicar filtros
         if SOURCE_TYPE:
@@ -186,13 +189,14 @@ def processar_instancia(instancia, compartment_id):
     return instancias_com_backup
 
 def listar_instancias_e_volumes(compartment_id):
-    instancias = oci.pagination.list_call_get_all_results(
+    instancias = paginate(
         compute_client.list_instances,
         compartment_id=compartment_id
-    ).data
+    )
 
     if LIMIT > 0:
-        instancias = instancias[:LIMIT]
+        # Para de paginar ao atingir o limite
+        instancias = islice(instancias, LIMIT)
 
     with ThreadPoolExecutor(max_workers=5) as executor:
         executor.map(lambda instancia: processar_instancia(instancia, compartment_id), instancias)
@@ -2,6 +2,13 @@ import oci
 import csv
 import logging
 import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
+from ocitools.paging import paginate
 
 # --- Configuração de Logs ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[
@@ -35,21 +42,16 @@ def get_instance_backup_policies():
     O resultado é exportado para um arquivo CSV.
     """
     try:
-        config = oci.config.from_file()
-        identity_client = oci.identity.IdentityClient(config)
-        compute_client = oci.core.ComputeClient(config)
-        block_storage_client = oci.core.BlockstorageClient(config)
+        config = load_config()
+        identity_client = create_client(oci.identity.IdentityClient, config)
+        compute_client = create_client(oci.core.ComputeClient, config)
+        block_storage_client = create_client(oci.core.BlockstorageClient, config)
         
         tenancy_id = config["tenancy"]
         report_data = []
 
         logging.info("Buscando todos os compartimentos na tenancy...")
-        compartments = oci.pagination.list_call_get_all_results(
-            identity_client.list_compartments,
-            tenancy_id,
-            compartment_id_in_subtree=True
-        ).data
-        compartments.append(identity_client.get_compartment(tenancy_id).data)
+        compartments = CompartmentTree.load(identity_client, tenancy_id).compartments(include_root=True)
 
         for compartment in compartments:
             if compartment.lifecycle_state != "ACTIVE":
@@ -58,10 +60,10 @@ def get_instance_backup_policies():
             logging.info(f"Processando compartimento: {compartment.name}")
             
             try:
-                instances = oci.pagination.list_call_get_all_results(
+                instances = list(paginate(
                     compute_client.list_instances,
                     compartment_id=compartment.id
-                ).data
+                ))
             except Exception as e:
                 logging.error(f"  Erro ao listar instâncias no compartimento {compartment.name}: {e}")
                 continue
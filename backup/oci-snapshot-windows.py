@@ -2,7 +2,14 @@ import oci
 import datetime
 import csv
 import os
-import time
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
+from ocitools.image_cache import ImageCache
+from ocitools.paging import paginate
 
 # Lista para armazenar os resultados.
 results = []
@@ -13,11 +20,13 @@ csv_filename = f'snapshot_log_windows_only_{datetime.datetime.now().strftime("%Y
 
 # Configura o OCI usando a autenticação do Cloud Shell
 try:
-    config = oci.config.from_file('~/.oci/config', 'DEFAULT')
-    identity_client = oci.identity.IdentityClient(config)
-    compute_client = oci.core.ComputeClient(config)
-    block_storage_client = oci.core.BlockstorageClient(config)
+    config = load_config('~/.oci/config', 'DEFAULT')
+    identity_client = create_client(oci.identity.IdentityClient, config, rate_limit=True)
+    # O rate limiter compartilhado espaça as chamadas e desacelera em caso de 429
+    compute_client = create_client(oci.core.ComputeClient, config, rate_limit=True)
+    block_storage_client = create_client(oci.core.BlockstorageClient, config, rate_limit=True)
     tenancy_id = config['tenancy']
+    image_cache = ImageCache(compute_client)
 except Exception as e:
     print(f"Erro ao carregar a configuração da OCI. Verifique se o Cloud Shell está configurado corretamente. Erro: {e}")
     exit()
@@ -28,16 +37,9 @@ def get_all_compartment_ids(identity_client, tenancy_id):
     
     print("Buscando todos os compartimentos do tenant...")
     try:
-        list_compartments_response = oci.pagination.list_call_get_all_results(
-            identity_client.list_compartments,
-            compartment_id=tenancy_id,
-            compartment_id_in_subtree=True,
-            access_level="ACCESSIBLE"
-        )
-        
-        for c in list_compartments_response.data:
-            if c.lifecycle_state == 'ACTIVE':
-                compartments.append(c.id)
+        # Sem o cache de compartimentos: este script altera recursos
+        tree = CompartmentTree.load(identity_client, tenancy_id, access_level="ACCESSIBLE", refresh=True)
+        compartments.extend(c.id for c in tree.compartments(lifecycle_state="ACTIVE"))
         
         print(f"Encontrados {len(compartments)} compartimentos ativos para busca.")
         return compartments
@@ -53,11 +55,10 @@ all_instances = []
 print("\nIniciando a varredura de todas as instâncias em todos os compartimentos...")
 for compartment_id_to_check in all_compartment_ids:
     try:
-        list_instances_response = compute_client.list_instances(
+        all_instances.extend(paginate(
+            compute_client.list_instances,
             compartment_id=compartment_id_to_check
-        )
-        for instance in list_instances_response.data:
-            all_instances.append(instance)
+        ))
     except oci.exceptions.ServiceError as e:
         print(f"Aviso: Pulando o compartimento {compartment_id_to_check}. Erro de permissão: {e.code}")
         
@@ -69,11 +70,8 @@ for instance in all_instances:
     print(f"--- Processando o servidor: {server_name} ---")
 
     try:
-        # Pausa para evitar limites da API
-        time.sleep(3)
-        
         # Pega a imagem da instância para identificar o OS
-        image = compute_client.get_image(image_id=instance.image_id).data
+        image = image_cache.get(instance.image_id)
         detected_os = image.operating_system
         result_entry['OS'] = detected_os
 
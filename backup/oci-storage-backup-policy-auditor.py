@@ -3,6 +3,12 @@ import csv
 import logging
 import sys
 from collections import defaultdict
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
 
 # --- Configuração de Logs ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[
@@ -62,21 +68,16 @@ def audit_backup_policies():
     O resultado é exportado para um arquivo CSV.
     """
     try:
-        config = oci.config.from_file()
-        identity_client = oci.identity.IdentityClient(config)
-        block_storage_client = oci.core.BlockstorageClient(config)
-        compute_client = oci.core.ComputeClient(config)
+        config = load_config()
+        identity_client = create_client(oci.identity.IdentityClient, config)
+        block_storage_client = create_client(oci.core.BlockstorageClient, config)
+        compute_client = create_client(oci.core.ComputeClient, config)
         
         tenancy_id = config["tenancy"]
         report_data = []
 
         logging.info("Buscando todos os compartimentos na tenancy...")
-        compartments = oci.pagination.list_call_get_all_results(
-            identity_client.list_compartments,
-            tenancy_id,
-            compartment_id_in_subtree=True
-        ).data
-        compartments.append(identity_client.get_compartment(tenancy_id).data)
+        compartments = CompartmentTree.load(identity_client, tenancy_id).compartments(include_root=True)
 
         logging.info("Buscando todas as políticas de backup...")
         policies = oci.pagination.list_call_get_all_results(
@@ -0,0 +1,117 @@
+"""
+Benchmark: import time of every dispatcher subcommand.
+
+Each subcommand runs ``python3 -m ocitools --import-time <group> <command>``
+in a fresh process, so only the script's top-level imports are measured and
+nothing is cached between runs. The dispatcher's own startup is checked too:
+``ocitools --list`` must not load the SDK, openpyxl or pandas.
+
+    python3 benchmarks/bench_imports.py --repeat 5 --check benchmarks/import_baseline.json
+    python3 benchmarks/bench_imports.py --repeat 5 --save benchmarks/import_baseline.json
+    python3 benchmarks/bench_imports.py inventory/collector security/iam-audit
+
+``--check`` exits with status 1 when a subcommand imports slower than its
+baseline times the tolerance (plus ``--slack`` milliseconds of noise) or
+loads an OCI service package that the baseline did not. The committed
+baseline was measured with oci 2.188 (pandas not installed); refresh it with
+``--save`` after a change that is meant to alter import times.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ocitools.cli import COMMANDS, HEAVY_PACKAGES
+
+
+def dispatcher_modules():
+    """Heavy packages loaded by the dispatcher before any script runs."""
+    code = ("import json, sys; from ocitools.cli import main; main(['--list']); "
+            f"print(json.dumps([name for name in {HEAVY_PACKAGES!r} if name in sys.modules]), file=sys.stderr)")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stderr)
+
+
+def measure(command, repeat):
+    argv = [sys.executable, "-m", "ocitools", "--import-time"] + command.split()
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run(argv, cwd=ROOT, capture_output=True, text=True)
+        if result.returncode:
+            return {"command": command, "error": result.stderr.strip().splitlines()[-1]}
+        runs.append(json.loads(result.stdout))
+    return dict(runs[-1], import_ms=min(run["import_ms"] for run in runs))
+
+
+def regressions(results, baseline, tolerance, slack):
+    previous = {entry["command"]: entry for entry in baseline}
+    problems = []
+    for result in results:
+        before = previous.get(result["command"])
+        if before is None or "error" in before:
+            continue
+        if "error" in result:
+            problems.append(f"{result['command']}: {result['error']}")
+            continue
+        limit = before["import_ms"] * tolerance + slack
+        if result["import_ms"] > limit:
+            problems.append(f"{result['command']}: {result['import_ms']:.0f} ms > {limit:.0f} ms "
+                            f"(baseline {before['import_ms']:.0f} ms)")
+        new_services = sorted(set(result["oci_services"]) - set(before["oci_services"]))
+        if new_services:
+            problems.append(f"{result['command']}: now imports oci.{', oci.'.join(new_services)}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("commands", nargs="*", metavar="GROUP/COMMAND",
+                        help="Subcommands to measure (default: all), e.g. inventory/collector.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per subcommand; the fastest is kept (noise only adds time).")
+    parser.add_argument("--save", metavar="PATH", help="Write the results as a baseline.")
+    parser.add_argument("--check", metavar="PATH", help="Compare against a baseline and fail on regressions.")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="Allowed slowdown factor (default: 1.25).")
+    parser.add_argument("--slack", type=float, default=50, help="Allowed extra milliseconds (default: 50).")
+    args = parser.parse_args()
+
+    commands = [command.replace("/", " ") for command in args.commands] or \
+               [f"{group} {command}" for group, names in COMMANDS.items() for command in names]
+
+    loaded = dispatcher_modules()
+    print(f"dispatcher startup loads: {', '.join(loaded) or 'standard library only'}")
+    print(f"{'command':<28}{'import (ms)':>12}{'modules':>9}  packages / OCI services")
+    results = []
+    for command in commands:
+        result = measure(command, args.repeat)
+        results.append(result)
+        if "error" in result:
+            print(f"{command:<28}{'-':>12}{'-':>9}  {result['error']}")
+            continue
+        print(f"{command:<28}{result['import_ms']:>12.1f}{result['modules']:>9}  "
+              f"{', '.join(result['packages']) or '-'} / {', '.join(result['oci_services']) or '-'}")
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=4)
+        print(f"Baseline saved to '{args.save}'.")
+    failed = bool(loaded)
+    if loaded:
+        print(f"REGRESSION: the dispatcher imports {', '.join(loaded)} before running a script.")
+    if args.check:
+        with open(args.check) as file:
+            problems = regressions(results, json.load(file), args.tolerance, args.slack)
+        for problem in problems:
+            print(f"REGRESSION: {problem}")
+        failed = failed or bool(problems)
+        if not problems:
+            print(f"No import time regressions against '{args.check}'.")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: single-cursor vs prefix-sharded bucket listing.
+
+Runs against an in-process Object Storage double that serves ``list_objects``
+pages with a fixed per-call latency, so the numbers reflect round trips rather
+than local CPU. Every sharded run is checked against the single-cursor summary
+and listing.
+
+    python3 benchmarks/bench_object_listing.py --objects 200000 --prefixes 16 --latency 0.02
+"""
+
+import argparse
+import bisect
+import datetime
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.object_listing import ShardedObjectLister, iter_objects, summarize_bucket
+
+
+class FakeObjectStorage:
+    """Serves a sorted synthetic bucket through the ``list_objects`` contract."""
+
+    def __init__(self, object_count, prefix_count, latency):
+        base = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        names = [f"p{i % prefix_count:03d}/obj{i:09d}" for i in range(object_count)]
+        names += [f"root{i:03d}" for i in range(10)]
+        names.sort()
+        self.names = names
+        self.objects = [SimpleNamespace(name=name, size=len(name) * 100,
+                                        time_created=base + datetime.timedelta(seconds=i))
+                        for i, name in enumerate(names)]
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def list_objects(self, namespace_name, bucket_name, prefix=None, start=None, limit=1000,
+                     delimiter=None, fields=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        prefix = prefix or ""
+        index = bisect.bisect_left(self.names, max(start or "", prefix))
+        objects, prefixes, next_start = [], [], None
+        while index < len(self.names) and self.names[index].startswith(prefix):
+            name = self.names[index]
+            if delimiter and delimiter in name[len(prefix):]:
+                common = prefix + name[len(prefix):].split(delimiter)[0] + delimiter
+                prefixes.append(common)
+                # Skip the whole prefix, as the service does
+                index = bisect.bisect_left(self.names, common[:-1] + chr(ord(delimiter) + 1))
+                continue
+            if len(objects) == limit:
+                next_start = name
+                break
+            objects.append(self.objects[index])
+            index += 1
+        return SimpleNamespace(data=SimpleNamespace(objects=objects, prefixes=prefixes, next_start_with=next_start))
+
+
+def run(label, fn, client):
+    client.calls = 0
+    started = time.perf_counter()
+    rows = fn().rows()
+    return label, time.perf_counter() - started, client.calls, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--objects", type=int, default=200000)
+    parser.add_argument("--prefixes", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds per list_objects call.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    client = FakeObjectStorage(args.objects, args.prefixes, args.latency)
+    results = [run("single cursor", lambda: summarize_bucket(client, "ns", "bucket"), client)]
+    cursor_names = [obj.name for obj in iter_objects(client, "ns", "bucket", "name")]
+    same_listing = True
+    for workers in args.workers:
+        with ShardedObjectLister(client, "ns", workers) as lister:
+            results.append(run(f"sharded x{workers}", lambda: lister.summarize("bucket"), client))
+            same_listing &= [obj.name for obj in lister.list_objects("bucket")] == cursor_names
+
+    baseline_time, baseline_rows = results[0][1], results[0][3]
+    print(f"{args.objects} objects, {args.prefixes} top-level prefixes, {args.latency * 1000:.0f} ms per call")
+    print(f"{'mode':<16}{'calls':>8}{'wall (s)':>10}{'speedup':>9}  same result")
+    for label, elapsed, calls, rows in results:
+        print(f"{label:<16}{calls:>8}{elapsed:>10.2f}{baseline_time / elapsed:>8.1f}x  {rows == baseline_rows}")
+    print(f"sharded list_objects in the same order as one cursor: {same_listing}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark: "who can <verb> <resource> in <compartment>" on a large policy set.
+
+Builds a synthetic compartment tree, groups with members and policies spread
+over the tree, then measures parsing/indexing, building the resolver and the
+latency of cold and memoized queries on random (verb, resource, compartment)
+questions. Every cold answer is checked against a brute-force scan of all
+statements that applies the same inheritance rules.
+
+    python3 benchmarks/bench_permissions.py --statements 50000 --compartments 500 --queries 1000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.iam_permissions import PermissionResolver
+from ocitools.iam_policies import FAMILY_MEMBERS, PolicyIndex
+
+VERBS = ["inspect", "read", "use", "manage"]
+RESOURCES = sorted(FAMILY_MEMBERS) + ["instances", "volumes", "buckets", "vcns", "secrets", "all-resources"]
+
+
+class SyntheticTree:
+    """The parts of ``CompartmentTree`` the policy index uses."""
+
+    def __init__(self, count, rng):
+        self.tenancy_id = "ocid1.tenancy.oc1..root"
+        self.parents = {self.tenancy_id: None}
+        self.names = {self.tenancy_id: "acme"}
+        ids = [self.tenancy_id]
+        for i in range(count):
+            compartment_id = f"ocid1.compartment.oc1..c{i}"
+            # Mostly shallow and wide, some chains several levels deep
+            self.parents[compartment_id] = rng.choice(ids[-20:] if rng.random() < 0.5 else ids)
+            self.names[compartment_id] = f"C{i:04d}"
+            ids.append(compartment_id)
+        self.children = {}
+        for compartment_id, parent in self.parents.items():
+            self.children.setdefault(parent, []).append(compartment_id)
+
+    def __contains__(self, compartment_id):
+        return compartment_id in self.parents
+
+    def path_of(self, compartment_id, separator="/"):
+        names = []
+        while compartment_id is not None:
+            names.append(self.names[compartment_id])
+            compartment_id = self.parents[compartment_id]
+        return separator.join(reversed(names))
+
+    def walk(self, compartment_id):
+        stack = [compartment_id]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(self.children.get(current, []))
+
+
+def make_tenancy(args, rng):
+    tree = SyntheticTree(args.compartments, rng)
+    compartment_ids = list(tree.parents)
+    groups = [SimpleNamespace(id=f"ocid1.group.oc1..g{i}", name=f"Group{i:04d}") for i in range(args.groups)]
+    users = [SimpleNamespace(id=f"ocid1.user.oc1..u{i}", name=f"user{i:05d}") for i in range(args.users)]
+    group_user_map = {}
+    for user in users:
+        for group in rng.sample(groups, rng.randint(1, 3)):
+            group_user_map.setdefault(group.id, []).append(user.id)
+
+    policies = []
+    per_policy = 20
+    for p in range(args.statements // per_policy):
+        attached = rng.choice(compartment_ids)
+        statements = []
+        for _ in range(per_policy):
+            # Locations relative to the attachment point: one of its descendants
+            target = rng.choice(list(tree.walk(attached))[:50])
+            relative = tree.path_of(target).split("/")[len(tree.path_of(attached).split("/")):]
+            location = f"compartment {':'.join(relative)}" if relative else \
+                ("tenancy" if attached == tree.tenancy_id else f"compartment id {attached}")
+            statement = f"Allow group {rng.choice(groups).name} to {rng.choice(VERBS)} {rng.choice(RESOURCES)} in {location}"
+            if rng.random() < 0.1:
+                statement += " where request.permission != 'VOLUME_DELETE'"
+            statements.append(statement)
+        policies.append(SimpleNamespace(name=f"policy{p:05d}", compartment_id=attached, statements=statements))
+    return tree, groups, users, group_user_map, policies
+
+
+def brute_force(index, verb, resource, path):
+    verbs = PermissionResolver.verbs_covering(verb)
+    resources = PermissionResolver.resources_covering(resource)
+    found = []
+    for statement in index.statements:
+        if statement.verb in verbs and statement.resource in resources and statement.compartment is not None:
+            scope = statement.compartment.lower()
+            if scope == "" or path.lower() == scope or path.lower().startswith(scope + "/"):
+                found.append(statement)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--statements", type=int, default=50000)
+    parser.add_argument("--compartments", type=int, default=500)
+    parser.add_argument("--groups", type=int, default=400)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    tree, groups, users, group_user_map, policies = make_tenancy(args, rng)
+
+    started = time.perf_counter()
+    index = PolicyIndex(policies, tree)
+    index_s = time.perf_counter() - started
+    started = time.perf_counter()
+    resolver = PermissionResolver(index, groups, group_user_map, users)
+    resolver_s = time.perf_counter() - started
+
+    paths = [index.path_of(compartment_id) for compartment_id in tree.parents]
+    queries = [(rng.choice(VERBS), rng.choice(RESOURCES), rng.choice(paths)) for _ in range(args.queries)]
+    cold, warm, correct, grants = [], [], True, 0
+    for verb, resource, path in queries:
+        started = time.perf_counter()
+        answer = resolver.who_can(verb, resource, path)
+        cold.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        resolver.who_can(verb, resource, path)
+        warm.append(time.perf_counter() - started)
+        grants += len(answer)
+        correct &= resolver.statements_granting(verb, resource, path) == brute_force(index, verb, resource, path)
+
+    def ms(values, fraction):
+        return sorted(values)[int(fraction * (len(values) - 1))] * 1000
+
+    print(f"{len(index)} statements ({len(index.unparsed)} unparsed), {len(tree.parents)} compartments, "
+          f"{len(groups)} groups, {len(users)} users")
+    print(f"parse + index: {index_s:.2f}s   resolver: {resolver_s * 1000:.1f} ms")
+    print(f"{len(queries)} queries, {grants / len(queries):.0f} grants per answer on average")
+    print(f"cold query: median {statistics.median(cold) * 1000:.2f} ms, p95 {ms(cold, 0.95):.2f} ms, "
+          f"max {max(cold) * 1000:.2f} ms")
+    print(f"memoized:   median {statistics.median(warm) * 1000:.4f} ms")
+    print(f"same statements as a full scan: {correct}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: per-pattern substring tests vs the compiled risk pattern matcher.
+
+Generates synthetic policy statements (a mix of safe and risky grants, with
+conditions and compartment paths of realistic length) and scans them with the
+old ``pattern in statement.lower()`` loop and with ``RiskPatternMatcher``.
+Both must report the same hits. ``--extra-patterns`` adds synthetic patterns
+to show how each approach scales with the size of the rules file.
+
+    python3 benchmarks/bench_risk_patterns.py --statements 100000
+    python3 benchmarks/bench_risk_patterns.py --statements 100000 --extra-patterns 200
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.risk_patterns import DEFAULT_RISK_PATTERNS_PATH, RiskPatternMatcher
+
+VERBS = ["inspect", "read", "use", "manage"]
+RESOURCES = ["instance-family", "volume-family", "virtual-network-family", "object-family", "buckets",
+             "all-resources", "database-family", "compute-management-family", "load-balancers", "iam",
+             "authentication-policies", "secret-family", "users", "groups", "policies", "tenancy"]
+SUBJECTS = ["group {name}", "dynamic-group {name}", "any-user", "group 'Default'/'{name}'"]
+
+
+def make_statements(count, seed):
+    rng = random.Random(seed)
+    statements = []
+    for i in range(count):
+        subject = rng.choice(SUBJECTS).format(name=f"Team{rng.randint(0, 399):03d}")
+        location = "tenancy" if rng.random() < 0.2 else \
+            "compartment " + ":".join(f"Comp{rng.randint(0, 99):02d}" for _ in range(rng.randint(1, 3)))
+        statement = f"Allow {subject} to {rng.choice(VERBS)} {rng.choice(RESOURCES)} in {location}"
+        if rng.random() < 0.3:
+            statement += f" where request.region = 'sa-saopaulo-1' and target.bucket.name = 'bucket{i}'"
+        statements.append(statement)
+    return statements
+
+
+def naive(definitions, statements):
+    patterns = [definition["pattern"] for definition in definitions]
+    hits = []
+    for statement in statements:
+        statement_lower = statement.lower()
+        hits.append([position for position, pattern in enumerate(patterns) if pattern in statement_lower])
+    return hits
+
+
+def compiled(definitions, statements):
+    matcher = RiskPatternMatcher(definitions)
+    return [matcher.positions(statement) for statement in statements]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--statements", type=int, default=100000)
+    parser.add_argument("--extra-patterns", type=int, default=0, help="Synthetic patterns added to the rules file.")
+    parser.add_argument("--patterns", default=DEFAULT_RISK_PATTERNS_PATH, help="Risk patterns JSON file.")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with open(args.patterns, encoding="utf-8") as file:
+        definitions = json.load(file)["patterns"]
+    definitions += [{"pattern": f"manage team{i:03d}-family", "severity": "Medium"} for i in range(args.extra_patterns)]
+    statements = make_statements(args.statements, args.seed)
+
+    results = {}
+    print(f"{len(statements)} statements, {len(definitions)} patterns")
+    print(f"{'matcher':<22}{'time (s)':>10}{'µs/statement':>14}{'hits':>9}")
+    for label, scan in (("substring per pattern", naive), ("compiled regex", compiled)):
+        started = time.perf_counter()
+        results[label] = scan(definitions, statements)
+        elapsed = time.perf_counter() - started
+        hits = sum(len(positions) for positions in results[label])
+        print(f"{label:<22}{elapsed:>10.3f}{elapsed / len(statements) * 1e6:>14.2f}{hits:>9}")
+    print(f"same hits: {results['substring per pattern'] == results['compiled regex']}")
+
+
+if __name__ == "__main__":
+    main()
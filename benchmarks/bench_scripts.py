@@ -0,0 +1,199 @@
+"""
+Benchmark: report scripts end to end against synthetic tenancies.
+
+Each script runs in its own process, in an empty working directory, with the
+replay backend answering from a synthetic tenancy (see ``ocitools.synthetic``),
+so the numbers cover the whole script - imports, API calls, processing and
+report writing - without network variance. Recorded per script and size:
+wall time, API calls (from the ``OCITOOLS_PROFILE`` profile), peak RSS and the
+size of the files the script wrote.
+
+    python3 benchmarks/bench_scripts.py run --sizes 10 100 1000 --results bench_results.json
+    python3 benchmarks/bench_scripts.py run --rev HEAD~3 --rev HEAD --results bench_results.json
+    python3 benchmarks/bench_scripts.py compare --results bench_results.json
+
+``--rev`` checks each revision out in a temporary git worktree, so commits can
+be compared without touching the working tree (only revisions that include the
+synthetic tenancy backend can be benchmarked).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ocitools.synthetic import make_spec
+
+SCRIPTS = {
+    "inventory": "inventory/oci-inventory-collector.py",
+    "backup": "backup/oci-backup-policy-validator.py",
+    "finops": "finops/oci-finops-unused-resources.py",
+    "iam": "security/oci-iam-auditor.py",
+}
+METRICS = [("wall_s", "wall (s)", "{:.2f}"), ("api_calls", "API calls", "{:d}"),
+           ("peak_rss_mb", "peak RSS (MB)", "{:.1f}"), ("output_bytes", "output (KB)", "{:.0f}")]
+PROFILE_FILE = "oci_api_profile.json"
+
+
+def git(*args, cwd=ROOT):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def output_size(directory):
+    total = 0
+    for dirpath, _, filenames in os.walk(directory):
+        total += sum(os.path.getsize(os.path.join(dirpath, name)) for name in filenames if name != PROFILE_FILE)
+    return total
+
+
+def run_script(tree, script, spec_path, timeout):
+    """One run of ``script`` from ``tree``; returns its measurements."""
+    workdir = tempfile.mkdtemp(prefix="ocitools-bench-")
+    env = dict(os.environ, OCITOOLS_MODE="replay", OCITOOLS_CASSETTE=spec_path,
+               OCITOOLS_PROFILE=os.path.join(workdir, PROFILE_FILE), OCITOOLS_PROFILE_TOP="0",
+               OCITOOLS_CACHE_DIR=os.path.join(workdir, ".cache"))
+    try:
+        with open(os.path.join(workdir, ".log"), "w") as log:
+            started = time.perf_counter()
+            process = subprocess.Popen([sys.executable, os.path.join(tree, SCRIPTS[script])], cwd=workdir, env=env,
+                                       stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT)
+            deadline = started + timeout
+            while True:
+                pid, status, usage = os.wait4(process.pid, os.WNOHANG)
+                if pid:
+                    break
+                if time.perf_counter() > deadline:
+                    process.kill()
+                    pid, status, usage = os.wait4(process.pid, 0)
+                    break
+                time.sleep(0.01)
+            wall = time.perf_counter() - started
+        process.returncode = os.waitstatus_to_exitcode(status)
+        calls = 0
+        if os.path.exists(env["OCITOOLS_PROFILE"]):
+            with open(env["OCITOOLS_PROFILE"]) as file:
+                calls = json.load(file)["totals"]["calls"]
+        os.remove(os.path.join(workdir, ".log"))
+        shutil.rmtree(env["OCITOOLS_CACHE_DIR"], ignore_errors=True)
+        return {"wall_s": round(wall, 3), "api_calls": calls, "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+                "output_bytes": output_size(workdir), "returncode": process.returncode}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def benchmark(tree, label, commit, args, spec_dir):
+    results = []
+    for size in args.sizes:
+        spec_path = os.path.join(spec_dir, f"tenancy_{size}.json")
+        for script in args.scripts:
+            runs = [run_script(tree, script, spec_path, args.timeout) for _ in range(args.repeat)]
+            result = dict(runs[-1], wall_s=round(statistics.median(run["wall_s"] for run in runs), 3))
+            result.update({"label": label, "commit": commit, "script": script, "size": size})
+            status = "ok" if result["returncode"] == 0 else f"exit {result['returncode']}"
+            print(f"{label:<12} {script:<10} {size:>6} compartments  {result['wall_s']:>8.2f}s  "
+                  f"{result['api_calls']:>7} calls  {result['peak_rss_mb']:>7.1f} MB  "
+                  f"{result['output_bytes'] / 1024:>8.0f} KB  {status}")
+            results.append(result)
+    return results
+
+
+def command_run(args):
+    spec_dir = tempfile.mkdtemp(prefix="ocitools-tenancy-")
+    for size in args.sizes:
+        with open(os.path.join(spec_dir, f"tenancy_{size}.json"), "w") as file:
+            json.dump(make_spec(compartments=size, seed=args.seed), file)
+    results = []
+    try:
+        for rev in args.rev or [None]:
+            if rev is None:
+                results += benchmark(ROOT, "working", git("rev-parse", "--short", "HEAD") + "+", args, spec_dir)
+                continue
+            tree = tempfile.mkdtemp(prefix="ocitools-rev-")
+            git("worktree", "add", "--detach", tree, rev)
+            try:
+                if not os.path.exists(os.path.join(tree, "ocitools", "synthetic.py")):
+                    print(f"Skipping {rev}: it predates the synthetic tenancy backend.", file=sys.stderr)
+                    continue
+                results += benchmark(tree, rev, git("rev-parse", "--short", rev), args, spec_dir)
+            finally:
+                git("worktree", "remove", "--force", tree)
+    finally:
+        shutil.rmtree(spec_dir, ignore_errors=True)
+
+    previous = []
+    if os.path.exists(args.results):
+        with open(args.results) as file:
+            previous = json.load(file)
+    with open(args.results, "w") as file:
+        json.dump(previous + results, file, indent=4)
+    print(f"{len(results)} results appended to '{args.results}'.")
+
+
+def command_compare(args):
+    with open(args.results) as file:
+        results = json.load(file)
+    labels = []
+    for result in results:
+        if result["label"] not in labels:
+            labels.append(result["label"])
+    labels = args.labels or labels
+    # The latest result per (label, script, size) wins
+    table = {(r["label"], r["script"], r["size"]): r for r in results}
+    rows = sorted({(r["script"], r["size"]) for r in results}, key=lambda row: (list(SCRIPTS).index(row[0]), row[1]))
+
+    for metric, title, fmt in METRICS:
+        print(f"\n{title}")
+        print(f"{'script':<10}{'size':>7}" + "".join(f"{label:>22}" for label in labels))
+        for script, size in rows:
+            cells, base = [], None
+            for label in labels:
+                result = table.get((label, script, size))
+                if result is None:
+                    cells.append(f"{'-':>22}")
+                    continue
+                value = result[metric] / 1024 if metric == "output_bytes" else result[metric]
+                cell = fmt.format(value)
+                if base is None:
+                    base = value
+                elif base:
+                    cell += f" ({(value - base) / base * 100:+.0f}%)"
+                if result.get("returncode"):
+                    cell += " !"
+                cells.append(f"{cell:>22}")
+            print(f"{script:<10}{size:>7}" + "".join(cells))
+    print("\nChanges are relative to the first column; '!' marks runs that exited with an error.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Benchmark the scripts and append the results.")
+    run.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Tenancy sizes in compartments.")
+    run.add_argument("--scripts", nargs="+", choices=list(SCRIPTS), default=list(SCRIPTS))
+    run.add_argument("--rev", action="append", help="Git revision to benchmark (repeatable; default: the working tree).")
+    run.add_argument("--repeat", type=int, default=1, help="Runs per script and size; the median wall time is kept.")
+    run.add_argument("--seed", type=int, default=1)
+    run.add_argument("--timeout", type=float, default=1800, help="Seconds before a run is killed.")
+    run.add_argument("--results", default="bench_results.json")
+    run.set_defaults(func=command_run)
+
+    compare = commands.add_parser("compare", help="Print a comparison table of recorded results.")
+    compare.add_argument("--results", default="bench_results.json")
+    compare.add_argument("--labels", nargs="+", help="Revisions to compare, in column order (default: all).")
+    compare.set_defaults(func=command_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Check: policy statements parsed by ``ocitools.iam_policies`` against a table.
+
+Each row is a statement, the compartment its policy is attached to and the
+record ``PolicyIndex`` should keep for it (subjects, verb, resource or
+permissions, location, resolved compartment path and OCID, conditions), or
+None when the statement must end up in ``PolicyIndex.unparsed``. Covers
+quoted identity domain groups, ``group id``, ``compartment id``, paths
+relative to the policy's compartment, ``where`` clauses, Endorse/Admit and
+``Define`` statements. Exits with status 1 on any mismatch.
+
+    python3 benchmarks/check_iam_policies.py
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.iam_policies import PolicyIndex, Subject
+
+ROOT = "ocid1.tenancy.oc1..root"
+PROD = "ocid1.compartment.oc1..prod"
+NETWORK = "ocid1.compartment.oc1..network"
+DB = "ocid1.compartment.oc1..db"
+PROD_PROD = "ocid1.compartment.oc1..prodprod"
+PROD_PROD_NETWORK = "ocid1.compartment.oc1..prodprodnetwork"
+UNKNOWN = "ocid1.compartment.oc1..unknown"
+GROUP_ID = "ocid1.group.oc1..admins"
+
+
+class TableTree:
+    """The parts of ``CompartmentTree`` the policy index uses, for a fixed tree."""
+
+    def __init__(self, names, parents):
+        self.tenancy_id = ROOT
+        self.names = names
+        self.parents = parents
+        self.children = {}
+        for compartment_id, parent in parents.items():
+            self.children.setdefault(parent, []).append(compartment_id)
+
+    def __contains__(self, compartment_id):
+        return compartment_id in self.parents
+
+    def path_of(self, compartment_id, separator="/"):
+        names = []
+        while compartment_id is not None:
+            names.append(self.names[compartment_id])
+            compartment_id = self.parents[compartment_id]
+        return separator.join(reversed(names))
+
+    def walk(self, compartment_id):
+        stack = [compartment_id]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(self.children.get(current, []))
+
+
+TREE = TableTree(
+    names={ROOT: "acme", PROD: "Prod", NETWORK: "Network", DB: "DB", PROD_PROD: "Prod",
+           PROD_PROD_NETWORK: "Network"},
+    parents={ROOT: None, PROD: ROOT, NETWORK: PROD, DB: PROD, PROD_PROD: PROD, PROD_PROD_NETWORK: PROD_PROD},
+)
+
+
+def record(subjects, verb=None, resource=None, permissions=(), location="compartment", compartment=None,
+           compartment_id=None, conditions=None, action="allow"):
+    return dict(action=action, subjects=tuple(Subject(kind, name) for kind, name in subjects), verb=verb,
+                resource=resource, permissions=tuple(permissions), location=location, compartment=compartment,
+                compartment_id=compartment_id, conditions=conditions)
+
+
+# (policy compartment, statement, expected record or None when unparsed)
+TABLE = [
+    (ROOT, "Allow group NetAdmins to manage virtual-network-family in compartment Prod:Network",
+     record([("group", "NetAdmins")], "manage", "virtual-network-family",
+            compartment="Prod/Network", compartment_id=NETWORK)),
+    (ROOT, "allow GROUP NetAdmins to MANAGE Instances IN TENANCY",
+     record([("group", "NetAdmins")], "manage", "instances", location="tenancy", compartment="", compartment_id=ROOT)),
+    (ROOT, "Allow group 'Default'/'Functions' to read secret-family in tenancy",
+     record([("group", "Default/Functions")], "read", "secret-family", location="tenancy", compartment="",
+            compartment_id=ROOT)),
+    (ROOT, "Allow dynamic-group \"Default\"/\"Fn Apps\" to use keys in compartment Prod",
+     record([("dynamic-group", "Default/Fn Apps")], "use", "keys", compartment="Prod", compartment_id=PROD)),
+    (ROOT, f"Allow group id {GROUP_ID} to inspect volumes in compartment Prod:DB",
+     record([("group", GROUP_ID)], "inspect", "volumes", compartment="Prod/DB", compartment_id=DB)),
+    (ROOT, "Allow group Auditors, group Ops, dynamic-group Runners to read all-resources in tenancy",
+     record([("group", "Auditors"), ("group", "Ops"), ("dynamic-group", "Runners")], "read", "all-resources",
+            location="tenancy", compartment="", compartment_id=ROOT)),
+    (ROOT, "Allow group Auditors, Ops to read buckets in compartment /Prod/DB/",
+     record([("group", "Auditors"), ("group", "Ops")], "read", "buckets", compartment="Prod/DB", compartment_id=DB)),
+    (ROOT, "Allow any-user to inspect instances in tenancy",
+     record([("any-user", None)], "inspect", "instances", location="tenancy", compartment="", compartment_id=ROOT)),
+    (ROOT, f"Allow group Ops to {{INSTANCE_READ, volume_inspect}} in compartment id {DB}",
+     record([("group", "Ops")], permissions=("INSTANCE_READ", "VOLUME_INSPECT"), compartment="Prod/DB",
+            compartment_id=DB)),
+    (ROOT, f"Allow group Ops to manage volumes in compartment id {UNKNOWN}",
+     record([("group", "Ops")], "manage", "volumes", compartment=None, compartment_id=UNKNOWN)),
+    (ROOT, "Allow group Ops to manage objects in compartment Prod where target.bucket.name = 'logs'",
+     record([("group", "Ops")], "manage", "objects", compartment="Prod", compartment_id=PROD,
+            conditions="target.bucket.name = 'logs'")),
+    (ROOT, "Allow group Ops to use instances in tenancy where any {request.region = 'sa-saopaulo-1', "
+           "request.region = 'us-ashburn-1'}",
+     record([("group", "Ops")], "use", "instances", location="tenancy", compartment="", compartment_id=ROOT,
+            conditions="any {request.region = 'sa-saopaulo-1', request.region = 'us-ashburn-1'}")),
+    # Paths are relative to the compartment the policy is attached to
+    (PROD, "Allow group DBAdmins to manage database-family in compartment DB",
+     record([("group", "DBAdmins")], "manage", "database-family", compartment="Prod/DB", compartment_id=DB)),
+    (PROD, "Allow group NetAdmins to read vcns in compartment Prod:Network",
+     record([("group", "NetAdmins")], "read", "vcns", compartment="Prod/Prod/Network",
+            compartment_id=PROD_PROD_NETWORK)),
+    (PROD, "Allow group NetAdmins to read vcns in compartment Staging",
+     record([("group", "NetAdmins")], "read", "vcns", compartment="Prod/Staging", compartment_id=None)),
+    (PROD, "Allow group Ops to read instances in tenancy",
+     record([("group", "Ops")], "read", "instances", location="tenancy", compartment="", compartment_id=ROOT)),
+    # Endorse locations are in the other tenancy; Admit names the foreign group
+    (ROOT, "Endorse group Replicators to manage object-family in tenancy Acceptor",
+     record([("group", "Replicators")], "manage", "object-family", location="tenancy", compartment=None,
+            action="endorse")),
+    (ROOT, "Endorse group Replicators to read buckets in any-tenancy",
+     record([("group", "Replicators")], "read", "buckets", location="any-tenancy", compartment=None,
+            action="endorse")),
+    (ROOT, "Admit group Readers of tenancy Requestor to read objects in compartment Prod",
+     record([("group", "Readers")], "read", "objects", compartment="Prod", compartment_id=PROD, action="admit")),
+    # Not in the grammar
+    (ROOT, "Define tenancy Acceptor as ocid1.tenancy.oc1..acceptor", None),
+    (ROOT, "Define group Readers as ocid1.group.oc1..readers", None),
+    (ROOT, "Allow group Ops to destroy instances in tenancy", None),
+    (ROOT, "Allow group Ops to manage instances", None),
+    (ROOT, "Allow Ops to manage instances in tenancy", None),
+    (ROOT, "Allow group Ops to manage instances in region sa-saopaulo-1", None),
+]
+
+
+def actual(statement):
+    return {field: getattr(statement, field) for field in
+            ("action", "subjects", "verb", "resource", "permissions", "location", "compartment",
+             "compartment_id", "conditions")}
+
+
+def main():
+    failures = 0
+    for row, (compartment_id, text, expected) in enumerate(TABLE, 1):
+        index = PolicyIndex([SimpleNamespace(name=f"policy{row}", compartment_id=compartment_id, statements=[text])],
+                            TREE)
+        if expected is None:
+            ok = not index.statements and len(index.unparsed) == 1
+            got = index.unparsed[0][2] if index.unparsed else actual(index.statements[0])
+        else:
+            got = actual(index.statements[0]) if index.statements else f"unparsed: {index.unparsed[0][2]}"
+            ok = got == expected
+        print(f"{'ok  ' if ok else 'FAIL'} {text}")
+        if not ok:
+            failures += 1
+            print(f"     expected: {expected if expected is not None else 'unparsed'}")
+            print(f"     got:      {got}")
+    print(f"{len(TABLE) - failures}/{len(TABLE)} statements as expected")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Write synthetic tenancy specs for the script benchmarks.
+
+A spec is a few lines of JSON (sizes and a seed); the resources themselves are
+generated deterministically when a script replays it, see ``ocitools.synthetic``.
+
+    python3 benchmarks/generate_tenancy.py --compartments 1000 --output tenancy_1000.json
+    OCITOOLS_MODE=replay OCITOOLS_CASSETTE=tenancy_1000.json python3 security/oci-iam-auditor.py
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.synthetic import DEFAULT_SPEC, make_spec
+
+
+def write_spec(path, **sizes):
+    spec = make_spec(**sizes)
+    with open(path, "w") as file:
+        json.dump(spec, file, indent=4)
+    return spec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", default=None, help="Spec file (default tenancy_<compartments>.json).")
+    for key, default in DEFAULT_SPEC.items():
+        if isinstance(default, list):
+            parser.add_argument(f"--{key.replace('_', '-')}", nargs="+", default=None, help=f"Default: {' '.join(default)}.")
+        elif key != "latency_ms":
+            parser.add_argument(f"--{key.replace('_', '-')}", type=int, default=None,
+                                help="Default: derived from --compartments." if default is None else f"Default: {default}.")
+    parser.add_argument("--latency-ms", type=float, default=None, help="Latency added to every call (default 0).")
+    args = parser.parse_args()
+
+    sizes = {key: getattr(args, key) for key in DEFAULT_SPEC}
+    path = args.output or f"tenancy_{args.compartments or DEFAULT_SPEC['compartments']}.json"
+    spec = write_spec(path, **sizes)
+    per_compartment = spec["instances"] + spec["volumes"] + spec["buckets"] + spec["policies"]
+    print(f"Spec written to '{path}': {spec['compartments']} compartments x {len(spec['regions'])} regions, "
+          f"~{spec['compartments'] * per_compartment} instances/volumes/buckets/policies, "
+          f"{spec['users']} users, {spec['groups']} groups.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
 import oci
-import time
-import random
 from datetime import datetime, timezone
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
+from ocitools.paging import paginate
 
 COMPARTMENT_NAME = "LinuxBancoDados"
 KEYWORD = "BKPAUTCITEL-"
@@ -9,42 +15,31 @@ RETENTION_COUNT = 5
 LOG_FILE = 'exclusao_backups_blockvolume.log'
 CONFIRMAR_EXCLUSAO = False  # Altere para False para desabilitar a confirmação manual
 
-config = oci.config.from_file()
+config = load_config()
 config['region'] = 'sa-saopaulo-1'
 
-block_storage = oci.core.BlockstorageClient(config)
-identity = oci.identity.IdentityClient(config)
+block_storage = create_client(oci.core.BlockstorageClient, config, rate_limit=True)
+identity = create_client(oci.identity.IdentityClient, config, rate_limit=True)
 
 def get_compartment_id():
-    compartments = oci.pagination.list_call_get_all_results(
-        identity.list_compartments,
-        config['tenancy'],
-        compartment_id_in_subtree=True
-    ).data
-    for comp in compartments:
-        if comp.name == COMPARTMENT_NAME:
-            return comp.id
-    raise ValueError(f"Compartment {COMPARTMENT_NAME} não encontrado")
-
-def list_backup_with_backoff(backup_id, backup_name, max_retentativas=5):
-    espera = 5
-    for tentativa in range(max_retentativas):
-        try:
-            print(f"🚨 Este Backup do Disco SERÁ EXCLUÍDO: {backup_name}")
-            block_storage.delete_volume_backup(backup_id)
-            return True
-        except oci.exceptions.ServiceError as e:
-            if e.status == 429 and "TooManyRequests" in str(e):
-                print(f"⚠️ Tentativa {tentativa+1}: Limite de requisições (429). Aguardando {espera}s...")
-                time.sleep(espera + random.uniform(0, 5))
-                espera *= 2
-            else:
-                print(f"❌ Erro ao excluir {backup_name}: {str(e)}")
-                return False
-        except Exception as e:
-            print(f"❌ Erro inesperado: {str(e)}")
-            return False
-    return False
+    try:
+        # Sem o cache de compartimentos: este script altera recursos
+        return CompartmentTree.load(identity, config['tenancy'], refresh=True).id_of(COMPARTMENT_NAME, lifecycle_state=None)
+    except KeyError:
+        raise ValueError(f"Compartment {COMPARTMENT_NAME} não encontrado")
+
+def excluir_backup(backup_id, backup_name):
+    # Limites de requisições (429) são tratados pelo rate limiter compartilhado do cliente
+    try:
+        print(f"🚨 Este Backup do Disco SERÁ EXCLUÍDO: {backup_name}")
+        block_storage.delete_volume_backup(backup_id)
+        return True
+    except oci.exceptions.ServiceError as e:
+        print(f"❌ Erro ao excluir {backup_name}: {str(e)}")
+        return False
+    except Exception as e:
+        print(f"❌ Erro inesperado: {str(e)}")
+        return False
 
 def get_volume_name(volume_id):
     try:
@@ -61,10 +56,10 @@ def log_exclusion(volume_id, volume_name, backups):
 
 def delete_old_block_volume_backups():
     compartment_id = get_compartment_id()
-    backups = oci.pagination.list_call_get_all_results(
+    backups = paginate(
         block_storage.list_volume_backups,
         compartment_id=compartment_id
-    ).data
+    )
 
     backups_filtered = [
         b for b in backups
@@ -88,7 +83,7 @@ def delete_old_block_volume_backups():
 
             if not CONFIRMAR_EXCLUSAO or input("Deseja continuar com a exclusão? (s/N): ").lower() == 's':
                 for backup in backups_to_delete:
-                    if list_backup_with_backoff(backup.id, backup.display_name):
+                    if excluir_backup(backup.id, backup.display_name):
                         log_exclusion(volume_id, volume_name, backups_to_delete)
             else:
                 print("❌ Exclusão cancelada pelo analista.")
@@ -2,6 +2,12 @@ import oci
 import csv
 import logging
 import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import load_config
+from ocitools.regions import RegionFanout
 
 # --- Configuração de Logs ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[
@@ -15,35 +21,18 @@ def run_database_inventory():
     de todas as regiões e compartimentos da tenancy.
     """
     try:
-        config = oci.config.from_file()
-        identity_client = oci.identity.IdentityClient(config)
-        
-        tenancy_id = config["tenancy"]
-        report_data = []
+        config = load_config()
+        fanout = RegionFanout(config)
+        compartments = fanout.compartments(include_root=True, lifecycle_state="ACTIVE")
 
-        logging.info("Buscando todas as regiões ativas na tenancy...")
-        regions = [r.region_name for r in identity_client.list_region_subscriptions(tenancy_id).data]
-        logging.info(f"Regiões encontradas: {', '.join(regions)}")
-
-        for region in regions:
+        # Cada região é processada em paralelo; as linhas são unidas na ordem das regiões
+        def processar_regiao(region):
             logging.info(f"\n--- Processando região: {region} ---")
-            config['region'] = region
-
-            database_client = oci.database.DatabaseClient(config)
-            
-            logging.info(f"Buscando todos os compartimentos na região {region}...")
-            compartments = oci.pagination.list_call_get_all_results(
-                identity_client.list_compartments,
-                tenancy_id,
-                compartment_id_in_subtree=True
-            ).data
-            compartments.append(identity_client.get_compartment(tenancy_id).data)
+            region_rows = []
+            database_client = fanout.client(oci.database.DatabaseClient, region)
 
             for compartment in compartments:
-                if compartment.lifecycle_state != "ACTIVE":
-                    continue
-                
-                logging.info(f"  Processando compartimento: {compartment.name}")
+                logging.info(f"  [{region}] Processando compartimento: {compartment.name}")
                 
                 try:
                     # Coleta de DB Systems
@@ -52,7 +41,7 @@ def run_database_inventory():
                         compartment_id=compartment.id
                     ).data
                     for db_system in db_systems:
-                        report_data.append({
+                        region_rows.append({
                             "Region": region,
                             "Compartment": compartment.name,
                             "Resource Type": "DB System",
@@ -71,7 +60,7 @@ def run_database_inventory():
                         compartment_id=compartment.id
                     ).data
                     for adb in autonomous_dbs:
-                        report_data.append({
+                        region_rows.append({
                             "Region": region,
                             "Compartment": compartment.name,
                             "Resource Type": "Autonomous Database",
@@ -85,8 +74,11 @@ def run_database_inventory():
                         })
 
                 except Exception as e:
-                    logging.error(f"  Erro ao listar databases no compartimento {compartment.name}: {e}")
+                    logging.error(f"  [{region}] Erro ao listar databases no compartimento {compartment.name}: {e}")
                     continue
+            return region_rows
+
+        report_data = fanout.rows(processar_regiao)
 
         # Exporta para CSV
         csv_file = "oci_database_inventory.csv"
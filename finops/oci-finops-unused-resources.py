@@ -1,16 +1,23 @@
 import oci
-import openpyxl
-from openpyxl.styles import Font
 from datetime import datetime, timezone
 import logging
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import load_config
+from ocitools.paging import paginate
+from ocitools.regions import RegionFanout
+from ocitools.report_writer import ReportWriter
+
 class OCI_FinOps_Report:
     def __init__(self):
-        self.config = oci.config.from_file()
-        self.identity_client = oci.identity.IdentityClient(self.config)
+        self.config = load_config()
+        self.fanout = RegionFanout(self.config)
+        self.identity_client = self.fanout.identity_client
         self.tenancy_id = self.config["tenancy"]
-        self.workbook = openpyxl.Workbook()
+        self.report = ReportWriter()
 
         self.sheets = {
             "Stopped Instances": ["Region", "Compartment", "Instance Name", "Instance OCID", "State", "Shape", "Created Time"],
@@ -23,149 +30,135 @@ class OCI_FinOps_Report:
         self._setup_sheets()
 
     def _setup_sheets(self):
+        # Write-only sheets: rows go to disk as they are appended during collection
         for sheet_name, headers in self.sheets.items():
-            if sheet_name in self.workbook.sheetnames:
-                sheet = self.workbook[sheet_name]
-            else:
-                sheet = self.workbook.create_sheet(title=sheet_name)
-            sheet.append(headers)
-            for cell in sheet[1]:
-                cell.font = Font(bold=True)
-            self.sheets[sheet_name] = sheet
-
-        if "Sheet" in self.workbook.sheetnames:
-            self.workbook.remove(self.workbook["Sheet"])
-
-    def _get_regions(self):
-        logging.info("Buscando regiões ativas na tenancy...")
-        regions = [r.region_name for r in self.identity_client.list_region_subscriptions(self.tenancy_id).data]
-        logging.info(f"Regiões encontradas: {', '.join(regions)}")
-        return regions
-
-    def _get_compartments(self, tenancy_id):
+            self.sheets[sheet_name] = self.report.add_sheet(sheet_name, headers)
+
+    def _get_compartments(self):
         logging.info("Buscando compartimentos...")
-        compartments = self.identity_client.list_compartments(
-            tenancy_id, compartment_id_in_subtree=True
-        ).data
-        compartments.append(self.identity_client.get_compartment(tenancy_id).data)
-        return compartments
+        return self.fanout.compartments(include_root=True, lifecycle_state="ACTIVE")
 
     def collect_resources(self):
-        regions = self._get_regions()
-        
-        for region in regions:
-            logging.info(f"\n--- Coletando dados na região: {region} ---")
-            self.config['region'] = region
+        compartments = self._get_compartments()
+
+        # As regiões rodam em paralelo; as linhas de cada uma vão para as planilhas na ordem das regiões
+        for region, rows in self.fanout.map(lambda region: self._collect_region(region, compartments)):
+            for sheet_name, sheet_rows in rows.items():
+                for row in sheet_rows:
+                    self.sheets[sheet_name].append(row)
+
+    def _collect_region(self, region, compartments):
+        """Linhas de cada planilha encontradas em uma região."""
+        logging.info(f"\n--- Coletando dados na região: {region} ---")
+        rows = {sheet_name: [] for sheet_name in self.sheets}
+
+        try:
+            compute_client = self.fanout.client(oci.core.ComputeClient, region)
+            blockstorage_client = self.fanout.client(oci.core.BlockstorageClient, region)
+            network_client = self.fanout.client(oci.core.VirtualNetworkClient, region)
+            object_storage_client = self.fanout.client(oci.object_storage.ObjectStorageClient, region)
+            file_storage_client = self.fanout.client(oci.file_storage.FileStorageClient, region)
+            identity_client = self.fanout.client(oci.identity.IdentityClient, region)
+        except Exception as e:
+            logging.error(f"Erro ao inicializar clientes OCI na região {region}: {e}")
+            return rows
+
+        # Obtém os domínios de disponibilidade específicos para a região atual
+        try:
+            availability_domains = identity_client.list_availability_domains(self.tenancy_id).data
+        except Exception as e:
+            logging.error(f"Erro ao buscar Domínios de Disponibilidade na região {region}: {e}")
+            return rows
+
+        for compartment in compartments:
+            logging.info(f"  [{region}] Verificando compartimento: {compartment.name}")
+
+            # Stopped Instances
+            try:
+                instances = paginate(compute_client.list_instances, compartment_id=compartment.id, lifecycle_state="STOPPED")
+                for instance in instances:
+                    rows["Stopped Instances"].append([
+                        region, compartment.name, instance.display_name, instance.id,
+                        instance.lifecycle_state, instance.shape, instance.time_created.strftime('%Y-%m-%d %H:%M:%S')
+                    ])
+            except Exception as e:
+                logging.error(f"  Erro ao listar instâncias paradas em {compartment.name}: {e}")
             
+            # Unattached Volumes
             try:
-                compute_client = oci.core.ComputeClient(self.config)
-                blockstorage_client = oci.core.BlockstorageClient(self.config)
-                network_client = oci.core.VirtualNetworkClient(self.config)
-                object_storage_client = oci.object_storage.ObjectStorageClient(self.config)
-                file_storage_client = oci.file_storage.FileStorageClient(self.config)
-                load_balancer_client = oci.load_balancer.LoadBalancerClient(self.config)
+                volumes = blockstorage_client.list_volumes(compartment_id=compartment.id).data
+                for volume in volumes:
+                    attachments = compute_client.list_volume_attachments(compartment_id=compartment.id, volume_id=volume.id).data
+                    if not attachments and volume.lifecycle_state == "AVAILABLE":
+                         rows["Unattached Volumes"].append([
+                            region, compartment.name, volume.display_name, volume.id, volume.size_in_gbs,
+                            volume.lifecycle_state, volume.time_created.strftime('%Y-%m-%d %H:%M:%S'), "N/A"
+                        ])
             except Exception as e:
-                logging.error(f"Erro ao inicializar clientes OCI na região {region}: {e}")
-                continue
-
-            # Obtém os domínios de disponibilidade específicos para a região atual
+                logging.error(f"  Erro ao listar volumes em {compartment.name}: {e}")
+            
+            # Unused Public IPs
             try:
-                availability_domains = self.identity_client.list_availability_domains(self.tenancy_id).data
+                public_ips = network_client.list_public_ips(scope="REGION", compartment_id=compartment.id).data
+                for ip in public_ips:
+                    if ip.assigned_entity_id is None:
+                        rows["Unused Public IPs"].append([
+                            region, compartment.name, ip.ip_address, ip.id, "Unassigned",
+                            ip.lifecycle_state, ip.time_created.strftime('%Y-%m-%d %H:%M:%S')
+                        ])
             except Exception as e:
-                logging.error(f"Erro ao buscar Domínios de Disponibilidade na região {region}: {e}")
-                continue
-
-            compartments = self._get_compartments(self.tenancy_id)
-            for compartment in compartments:
-                if compartment.lifecycle_state != "ACTIVE":
-                    continue
-                logging.info(f"  Verificando compartimento: {compartment.name}")
-
-                # Stopped Instances
-                try:
-                    instances = compute_client.list_instances(compartment_id=compartment.id, lifecycle_state="STOPPED").data
-                    for instance in instances:
-                        self.sheets["Stopped Instances"].append([
-                            region, compartment.name, instance.display_name, instance.id,
-                            instance.lifecycle_state, instance.shape, instance.time_created.strftime('%Y-%m-%d %H:%M:%S')
+                logging.error(f"  Erro ao listar IPs públicos em {compartment.name}: {e}")
+
+            # Inactive DRGs & VPNs
+            try:
+                drgs = network_client.list_drgs(compartment_id=compartment.id).data
+                for drg in drgs:
+                    if drg.lifecycle_state != "AVAILABLE":
+                        rows["Inactive DRGs & VPNs"].append([
+                            region, compartment.name, drg.display_name, "DRG", drg.lifecycle_state, drg.time_created.strftime('%Y-%m-%d %H:%M:%S')
                         ])
-                except Exception as e:
-                    logging.error(f"  Erro ao listar instâncias paradas em {compartment.name}: {e}")
                 
-                # Unattached Volumes
-                try:
-                    volumes = blockstorage_client.list_volumes(compartment_id=compartment.id).data
-                    for volume in volumes:
-                        attachments = compute_client.list_volume_attachments(compartment_id=compartment.id, volume_id=volume.id).data
-                        if not attachments and volume.lifecycle_state == "AVAILABLE":
-                             self.sheets["Unattached Volumes"].append([
-                                region, compartment.name, volume.display_name, volume.id, volume.size_in_gbs,
-                                volume.lifecycle_state, volume.time_created.strftime('%Y-%m-%d %H:%M:%S'), "N/A"
-                            ])
-                except Exception as e:
-                    logging.error(f"  Erro ao listar volumes em {compartment.name}: {e}")
-                
-                # Unused Public IPs
-                try:
-                    public_ips = network_client.list_public_ips(scope="REGION", compartment_id=compartment.id).data
-                    for ip in public_ips:
-                        if ip.assigned_entity_id is None:
-                            self.sheets["Unused Public IPs"].append([
-                                region, compartment.name, ip.ip_address, ip.id, "Unassigned",
-                                ip.lifecycle_state, ip.time_created.strftime('%Y-%m-%d %H:%M:%S')
-                            ])
-                except Exception as e:
-                    logging.error(f"  Erro ao listar IPs públicos em {compartment.name}: {e}")
-
-                # Inactive DRGs & VPNs
-                try:
-                    drgs = network_client.list_drgs(compartment_id=compartment.id).data
-                    for drg in drgs:
-                        if drg.lifecycle_state != "AVAILABLE":
-                            self.sheets["Inactive DRGs & VPNs"].append([
-                                region, compartment.name, drg.display_name, "DRG", drg.lifecycle_state, drg.time_created.strftime('%Y-%m-%d %H:%M:%S')
-                            ])
-                    
-                    vpn_connections = network_client.list_ipsec_connections(compartment_id=compartment.id).data
-                    for vpn in vpn_connections:
-                        if vpn.lifecycle_state != "AVAILABLE":
-                             self.sheets["Inactive DRGs & VPNs"].append([
-                                region, compartment.name, vpn.display_name, "IPSec VPN", vpn.lifecycle_state, vpn.time_created.strftime('%Y-%m-%d %H:%M:%S')
-                            ])
-                except Exception as e:
-                    logging.error(f"  Erro ao listar DRGs/VPNs em {compartment.name}: {e}")
-
-                # Unused Object Storage Buckets
-                try:
-                    namespace = object_storage_client.get_namespace().data
-                    buckets = object_storage_client.list_buckets(namespace, compartment_id=compartment.id).data
-                    for bucket in buckets:
-                        bucket_details = object_storage_client.get_bucket(namespace, bucket.name).data
-                        if bucket_details.approximate_count == 0:
-                            self.sheets["Unused Buckets"].append([
-                                region, compartment.name, bucket.name, "Unused", bucket_details.approximate_size if bucket_details.approximate_size else 0,
-                                bucket_details.approximate_count
+                vpn_connections = network_client.list_ipsec_connections(compartment_id=compartment.id).data
+                for vpn in vpn_connections:
+                    if vpn.lifecycle_state != "AVAILABLE":
+                         rows["Inactive DRGs & VPNs"].append([
+                            region, compartment.name, vpn.display_name, "IPSec VPN", vpn.lifecycle_state, vpn.time_created.strftime('%Y-%m-%d %H:%M:%S')
+                        ])
+            except Exception as e:
+                logging.error(f"  Erro ao listar DRGs/VPNs em {compartment.name}: {e}")
+
+            # Unused Object Storage Buckets
+            try:
+                namespace = object_storage_client.get_namespace().data
+                buckets = object_storage_client.list_buckets(namespace, compartment_id=compartment.id).data
+                for bucket in buckets:
+                    bucket_details = object_storage_client.get_bucket(namespace, bucket.name).data
+                    if bucket_details.approximate_count == 0:
+                        rows["Unused Buckets"].append([
+                            region, compartment.name, bucket.name, "Unused", bucket_details.approximate_size if bucket_details.approximate_size else 0,
+                            bucket_details.approximate_count
+                        ])
+            except Exception as e:
+                logging.error(f"  Erro ao listar buckets em {compartment.name}: {e}")
+            
+            # Unused File Systems
+            try:
+                for ad in availability_domains:
+                    file_systems = file_storage_client.list_file_systems(compartment_id=compartment.id, availability_domain=ad.name).data
+                    for fs in file_systems:
+                        if fs.lifecycle_state != "AVAILABLE":
+                            rows["Unused File Systems"].append([
+                                region, compartment.name, fs.display_name, fs.lifecycle_state, fs.time_created.strftime('%Y-%m-%d %H:%M:%S')
                             ])
-                except Exception as e:
-                    logging.error(f"  Erro ao listar buckets em {compartment.name}: {e}")
-                
-                # Unused File Systems
-                try:
-                    for ad in availability_domains:
-                        file_systems = file_storage_client.list_file_systems(compartment_id=compartment.id, availability_domain=ad.name).data
-                        for fs in file_systems:
-                            if fs.lifecycle_state != "AVAILABLE":
-                                self.sheets["Unused File Systems"].append([
-                                    region, compartment.name, fs.display_name, fs.lifecycle_state, fs.time_created.strftime('%Y-%m-%d %H:%M:%S')
-                                ])
-                except Exception as e:
-                    logging.error(f"  Erro ao listar File Systems em {compartment.name}: {e}")
-        
+            except Exception as e:
+                logging.error(f"  Erro ao listar File Systems em {compartment.name}: {e}")
+        return rows
+
     def save_report(self):
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             file_name = f"oci_finops_report_{timestamp}.xlsx"
-            self.workbook.save(file_name)
+            self.report.save(file_name)
             logging.info(f"\n✅ Relatório de otimização de custos salvo com sucesso: '{file_name}'")
         except Exception as e:
             logging.error(f"Erro ao salvar o relatório em Excel: {e}")
@@ -74,6 +74,11 @@ else
     print_warning "Aliases já existem no ~/.bashrc"
 fi
 
+if ! grep -q "alias ocitools=" ~/.bashrc; then
+    echo "alias ocitools='PYTHONPATH=~/Python-scripts-for-OCI python3 -m ocitools'" >> ~/.bashrc
+    print_success "Alias ocitools criado!"
+fi
+
 echo ""
 
 # 5. Criar diretório de logs se não existir
@@ -92,6 +97,7 @@ echo "  ${GREEN}oci-list${NC}     - Gerar relatório completo de instâncias"
 echo "  ${GREEN}oci-backup${NC}   - Validar políticas de backup"
 echo "  ${GREEN}oci-regions${NC}  - Análise multi-região com backups"
 echo "  ${GREEN}oci-help${NC}     - Ver documentação completa"
+echo "  ${GREEN}ocitools${NC}     - Executar qualquer script (ocitools --list)"
 echo ""
 echo "🎯 Para ativar os aliases agora, execute:"
 echo "  ${YELLOW}source ~/.bashrc${NC}"
@@ -1,11 +1,18 @@
 import oci
 import csv
 import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
+from ocitools.paging import paginate
 
 # Carrega configuração do OCI
 # Funciona tanto localmente (~/.oci/config) quanto no Cloud Shell (autenticação automática)
 try:
-    config = oci.config.from_file()
+    config = load_config()
     print("✓ Usando configuração de ~/.oci/config")
 except Exception as e:
     print(f"⚠ Arquivo de config não encontrado, tentando autenticação de instância...")
@@ -26,10 +33,10 @@ except Exception as e:
 
 print(f"✓ Região: {config.get('region', 'padrão')}")
 
-compute_client = oci.core.ComputeClient(config)
-block_storage_client = oci.core.BlockstorageClient(config)
-network_client = oci.core.VirtualNetworkClient(config)
-identity_client = oci.identity.IdentityClient(config)
+compute_client = create_client(oci.core.ComputeClient, config)
+block_storage_client = create_client(oci.core.BlockstorageClient, config)
+network_client = create_client(oci.core.VirtualNetworkClient, config)
+identity_client = create_client(oci.identity.IdentityClient, config)
 
 # Obtém tenancy ID
 try:
@@ -45,12 +52,7 @@ print("\n🔍 Listando compartimentos...")
 domains = identity_client.list_availability_domains(tenancy_id).data
 
 # Lista todos os compartimentos (inclusive o root)
-compartments = oci.pagination.list_call_get_all_results(
-    identity_client.list_compartments,
-    tenancy_id,
-    compartment_id_in_subtree=True
-).data
-compartments.append(identity_client.get_compartment(tenancy_id).data)
+compartments = CompartmentTree.load(identity_client, tenancy_id).compartments(include_root=True)
 
 def get_backup_policy_name(volume_id):
     policies = oci.pagination.list_call_get_all_results(
@@ -73,10 +75,10 @@ output = []
 # Para cada compartimento
 for compartment in compartments:
     try:
-        instances = oci.pagination.list_call_get_all_results(
+        instances = list(paginate(
             compute_client.list_instances,
             compartment.id
-        ).data
+        ))
         if instances:
             print(f"  ✓ {compartment.name}: {len(instances)} instância(s)")
     except Exception as e:
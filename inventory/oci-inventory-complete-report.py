@@ -1,12 +1,20 @@
 import oci
 import csv
 import json
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
+from ocitools.image_cache import ImageCache
+from ocitools.paging import paginate
+
 # Carrega configuração do OCI
 # Funciona tanto localmente (~/.oci/config) quanto no Cloud Shell (autenticação automática)
 try:
-    config = oci.config.from_file()
+    config = load_config()
     print("✓ Usando configuração de ~/.oci/config")
 except Exception as e:
     print(f"⚠ Arquivo de config não encontrado, tentando autenticação de instância...")
@@ -26,10 +34,11 @@ except Exception as e:
 print(f"✓ Região: {config.get('region', 'padrão')}")
 
 # Clientes de serviço
-compute_client = oci.core.ComputeClient(config)
-block_storage_client = oci.core.BlockstorageClient(config)
-network_client = oci.core.VirtualNetworkClient(config)
-identity_client = oci.identity.IdentityClient(config)
+compute_client = create_client(oci.core.ComputeClient, config)
+block_storage_client = create_client(oci.core.BlockstorageClient, config)
+network_client = create_client(oci.core.VirtualNetworkClient, config)
+identity_client = create_client(oci.identity.IdentityClient, config)
+image_cache = ImageCache(compute_client)
 
 # Obtém tenancy ID
 try:
@@ -42,12 +51,7 @@ print(f"✓ Tenancy ID: {tenancy_id[:20]}...")
 print("\n🔍 Listando compartimentos...")
 
 # Lista todos os compartimentos (inclusive o root)
-compartments = oci.pagination.list_call_get_all_results(
-    identity_client.list_compartments,
-    tenancy_id,
-    compartment_id_in_subtree=True
-).data
-compartments.append(identity_client.get_compartment(tenancy_id).data)
+compartments = CompartmentTree.load(identity_client, tenancy_id).compartments(include_root=True)
 
 def get_backup_policy_name(volume_id):
     """
@@ -89,10 +93,10 @@ def listar_instancias():
     # Para cada compartimento
     for compartment in compartments:
         try:
-            instances = oci.pagination.list_call_get_all_results(
+            instances = list(paginate(
                 compute_client.list_instances,
                 compartment.id
-            ).data
+            ))
         except Exception as e:
             print(f"Erro ao listar instâncias no compartimento {compartment.name}: {e}")
             continue
@@ -185,7 +189,7 @@ def listar_instancias():
             # Obter informações de Sistema Operacional
             try:
                 if instance.source_details.source_type == "image":
-                    image = compute_client.get_image(instance.source_details.image_id).data
+                    image = image_cache.get(instance.source_details.image_id)
                     inst_data["Operating System"] = image.operating_system
                     inst_data["Version"] = image.operating_system_version
             except:
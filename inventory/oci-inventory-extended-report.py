@@ -1,25 +1,28 @@
 import oci
 import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
+from ocitools.paging import paginate
 
 CSV_FILE = "instances_region_os_tags.csv"
 
-config = oci.config.from_file()
+config = load_config()
 config['region'] = 'sa-saopaulo-1'  # Região Brazil East
 config['region'] = 'sa-vinhedo-1'  # Região Vinhedo
 config['region'] = 'us-ashburn-1'  # Região Ashburn
 
-compute_client = oci.core.ComputeClient(config)
-identity_client = oci.identity.IdentityClient(config)
+compute_client = create_client(oci.core.ComputeClient, config)
+identity_client = create_client(oci.identity.IdentityClient, config)
 
 tenancy_id = config['tenancy']
 
 # Lista todos os compartimentos na tenancy
-compartments = oci.pagination.list_call_get_all_results(
-    identity_client.list_compartments,
-    tenancy_id,
-    compartment_id_in_subtree=True
-).data
-compartments.append(identity_client.get_compartment(tenancy_id).data)  # Adiciona o compartimento root
+compartments = CompartmentTree.load(identity_client, tenancy_id).compartments(include_root=True)
 
 def get_instance_os_info(instance):
     try:
@@ -41,10 +44,10 @@ def listar_instancias():
 
     for compartment in compartments:
         try:
-            instances = oci.pagination.list_call_get_all_results(
+            instances = list(paginate(
                 compute_client.list_instances,
                 compartment.id
-            ).data
+            ))
         except Exception as e:
             print(f"Erro ao listar instâncias no compartimento {compartment.name}: {e}")
             continue
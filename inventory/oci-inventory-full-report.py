@@ -1,25 +1,29 @@
 import oci
 import csv
 import logging
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import load_config
+from ocitools.image_cache import ImageCache
+from ocitools.paging import paginate
+from ocitools.regions import RegionFanout
+
 # Configuração de Logs para exibir progresso
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[
     logging.StreamHandler(sys.stdout)
 ])
 
 # Carrega configuração padrão do OCI (~/.oci/config)
-config = oci.config.from_file()
-
-# Inicializa clientes OCI para Identity
-identity_client = oci.identity.IdentityClient(config)
-tenancy_id = config['tenancy']
+config = load_config()
 
 # --- Funções Auxiliares ---
-def get_instance_os_info(compute_client, instance):
+def get_instance_os_info(image_cache, instance):
     """Obtém o nome e a versão do sistema operacional de uma instância."""
     try:
-        image = compute_client.get_image(instance.image_id).data
+        image = image_cache.get(instance.image_id)
         if image:
             return image.operating_system, image.operating_system_version
         return "Desconhecido", "Desconhecido"
@@ -55,41 +59,32 @@ def get_backup_policy_name(block_storage_client, volume_id):
 
 # --- Lógica Principal ---
 def run_inventory_report():
-    output = []
-    
-    # Lista todas as regiões inscritas na tenancy
-    logging.info("Buscando regiões ativas...")
-    regions = [r.region_name for r in identity_client.list_region_subscriptions(tenancy_id).data]
-    logging.info(f"Regiões encontradas: {', '.join(regions)}")
-
-    for region in regions:
+    # Regiões e compartimentos são listados uma única vez para todas as regiões
+    fanout = RegionFanout(config)
+    try:
+        compartments = fanout.compartments(include_root=True)
+    except Exception as e:
+        logging.error(f"Erro ao listar compartimentos: {e}")
+        return
+
+    # Cada região é processada em paralelo; as linhas são unidas na ordem das regiões
+    def processar_regiao(region):
         logging.info(f"\nIniciando coleta de dados na região: {region}")
-        config['region'] = region
-
-        # Inicializa clientes de serviço para a região atual
-        compute_client = oci.core.ComputeClient(config)
-        block_storage_client = oci.core.BlockstorageClient(config)
-        network_client = oci.core.VirtualNetworkClient(config)
-
-        # Lista todos os compartimentos (inclusive o root)
-        try:
-            compartments = oci.pagination.list_call_get_all_results(
-                identity_client.list_compartments,
-                tenancy_id,
-                compartment_id_in_subtree=True
-            ).data
-            compartments.append(identity_client.get_compartment(tenancy_id).data)
-        except Exception as e:
-            logging.error(f"Erro ao listar compartimentos na região {region}: {e}")
-            continue
+        region_output = []
+
+        # Clientes de serviço da região
+        compute_client = fanout.client(oci.core.ComputeClient, region)
+        block_storage_client = fanout.client(oci.core.BlockstorageClient, region)
+        network_client = fanout.client(oci.core.VirtualNetworkClient, region)
+        image_cache = ImageCache(compute_client)
 
         for compartment in compartments:
-            logging.info(f"  Processando compartimento: {compartment.name}")
+            logging.info(f"  [{region}] Processando compartimento: {compartment.name}")
             try:
-                instances = oci.pagination.list_call_get_all_results(
+                instances = list(paginate(
                     compute_client.list_instances,
                     compartment.id
-                ).data
+                ))
             except Exception as e:
                 logging.error(f"  Erro ao listar instâncias no compartimento {compartment.name}: {e}")
                 continue
@@ -147,7 +142,7 @@ def run_inventory_report():
                     inst_data["Public IP"] = "Erro ao obter"
                 
                 # Coleta de informações do SO
-                os_name, os_version = get_instance_os_info(compute_client, instance)
+                os_name, os_version = get_instance_os_info(image_cache, instance)
                 inst_data["Operating System"] = os_name
                 inst_data["OS Version"] = os_version
 
@@ -193,7 +188,10 @@ def run_inventory_report():
                 inst_data["Freeform Tags"] = str(tags["Freeform Tags"])
                 inst_data["Defined Tags"] = str(tags["Defined Tags"])
                 
-                output.append(inst_data)
+                region_output.append(inst_data)
+        return region_output
+
+    output = fanout.rows(processar_regiao)
 
     # Exporta para CSV
     csv_file = "oci_inventory_full_report_multi_region.csv"
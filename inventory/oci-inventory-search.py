@@ -0,0 +1,98 @@
+import oci
+import argparse
+import csv
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import load_config
+from ocitools.regions import RegionFanout
+from ocitools.search import (DEFAULT_SEARCH_TYPES, SEARCH_TYPES, ResourceSearch, detail_columns, fetch_details,
+                             summary_key, verify)
+
+# Command line arguments
+parser = argparse.ArgumentParser(
+    description="First-level inventory of every subscribed region from Resource Search queries "
+                "(a few paginated calls per region instead of one list call per compartment and service).")
+parser.add_argument("--types", nargs="+", default=DEFAULT_SEARCH_TYPES, choices=sorted(SEARCH_TYPES), metavar="TYPE",
+                    help=f"Resource Search types to inventory (default: {' '.join(DEFAULT_SEARCH_TYPES)}).")
+parser.add_argument("--no-details", action="store_true",
+                    help="Only the fields Search returns. By default shape, size and CIDR come from one list call "
+                         "per type in each compartment where Search found that type.")
+parser.add_argument("--verify", action="store_true",
+                    help="Cross-check Search against the list APIs of every active compartment and write the "
+                         "differences to oci_inventory_search_verification.csv.")
+parser.add_argument("--output", default="oci_inventory_search.csv", metavar="PATH",
+                    help="CSV file of the inventory (default: oci_inventory_search.csv).")
+args = parser.parse_args()
+
+VERIFICATION_FILE = "oci_inventory_search_verification.csv"
+
+# Configuração de Logs
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[
+    logging.StreamHandler(sys.stdout)
+])
+
+config = load_config()
+fanout = RegionFanout(config)
+tree = fanout.compartment_tree
+columns = [] if args.no_details else detail_columns(args.types)
+
+
+def processar_regiao(region):
+    """Linhas do inventário e diferenças da verificação de uma região."""
+    search = ResourceSearch(fanout.client(oci.resource_search.ResourceSearchClient, region))
+    index = search.index(args.types)
+    logging.info(f"[{region}] {len(index.summaries)} recursos encontrados pelo Resource Search")
+
+    clients = {}
+    namespace = None
+    if columns or args.verify:
+        clients = {spec.client_class: fanout.client(spec.client_class, region)
+                   for spec in (SEARCH_TYPES[search_type] for search_type in args.types)}
+    if args.verify and "bucket" in args.types:
+        namespace = clients[oci.object_storage.ObjectStorageClient].get_namespace().data
+
+    details = fetch_details(index, clients, namespace) if columns else {}
+
+    rows = []
+    for search_type in args.types:
+        for summary in index.of_type(search_type):
+            row = [region, SEARCH_TYPES[search_type].label, tree.name_of(summary.compartment_id, summary.compartment_id),
+                   summary.display_name, summary.identifier, summary.lifecycle_state, summary.availability_domain or "",
+                   summary.time_created]
+            extra = details.get(summary_key(search_type, summary), {})
+            rows.append(row + [extra.get(column, "") for column in columns])
+
+    differences = []
+    if args.verify:
+        active = [c.id for c in fanout.compartments(include_root=True, lifecycle_state="ACTIVE")]
+        differences = verify(index, clients, active, namespace)
+        logging.info(f"[{region}] Verificação: {len(differences)} diferença(s) entre Search e as APIs de listagem")
+    return rows, differences
+
+
+inventory_rows, verification_rows = [], []
+for region, (rows, differences) in fanout.map(processar_regiao):
+    inventory_rows.extend(rows)
+    verification_rows.extend([region, SEARCH_TYPES[d["type"]].label, tree.name_of(d["compartment_id"], d["compartment_id"]),
+                              d["key"], d["name"], d["issue"]] for d in differences)
+
+with open(args.output, mode="w", newline="", encoding="utf-8") as file:
+    writer = csv.writer(file)
+    writer.writerow(["Region", "Resource Type", "Compartment", "Name", "OCID", "State", "Availability Domain",
+                     "Created"] + columns)
+    writer.writerows(inventory_rows)
+logging.info(f"✅ Inventário gerado: '{args.output}' ({len(inventory_rows)} recursos)")
+
+if args.verify:
+    with open(VERIFICATION_FILE, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Region", "Resource Type", "Compartment", "Key", "Name", "Issue"])
+        writer.writerows(verification_rows)
+    if verification_rows:
+        logging.warning(f"⚠️ {len(verification_rows)} diferença(s) entre Search e as APIs de listagem: '{VERIFICATION_FILE}'")
+    else:
+        logging.info(f"✅ Search e APIs de listagem conferem: '{VERIFICATION_FILE}'")
@@ -0,0 +1,60 @@
+import oci
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import load_config
+from ocitools.checkpoint import CheckpointMismatch, CheckpointStore
+from ocitools.discovery import TenancyDiscovery
+from ocitools.object_listing import DEFAULT_SHARD_WORKERS
+from ocitools.resource_stream import ResourceStream
+
+# Command line arguments
+parser = argparse.ArgumentParser(
+    description="Discover OCI resources once and save them as a snapshot that the inventory collector "
+                "and the security audit report can read with --snapshot."
+)
+parser.add_argument("--output", default="oci_snapshot.ndjson.gz", metavar="PATH",
+                    help="Snapshot file (default: oci_snapshot.ndjson.gz; gzip-compressed when the name ends in .gz).")
+parser.add_argument("--workers", type=int, default=1,
+                    help="Number of concurrent discovery workers. 1 (default) runs compartments serially; "
+                         "each OCI service is additionally capped by its own concurrency limit.")
+parser.add_argument("--bucket-objects", action="store_true",
+                    help="List every object of every bucket instead of summarizing buckets per top-level prefix.")
+parser.add_argument("--bucket-shards", type=int, default=DEFAULT_SHARD_WORKERS,
+                    help=f"Concurrent list_objects cursors per bucket (default: {DEFAULT_SHARD_WORKERS}).")
+parser.add_argument("--checkpoint", metavar="PATH",
+                    help="Save each finished (compartment, service) unit to this SQLite file so an interrupted run "
+                         "can be resumed. Off by default.")
+parser.add_argument("--resume", action="store_true",
+                    help="Reuse the units already saved in the checkpoint file and only discover the missing ones "
+                         "(default file: oci_snapshot.checkpoint.db).")
+args = parser.parse_args()
+
+try:
+    # Load OCI configuration
+    config = load_config("~/.oci/config")
+
+    checkpoint = None
+    if args.checkpoint or args.resume:
+        try:
+            checkpoint = CheckpointStore(args.checkpoint or "oci_snapshot.checkpoint.db",
+                                         {"tenancy": config["tenancy"], "bucket_objects": args.bucket_objects},
+                                         resume=args.resume)
+        except CheckpointMismatch as e:
+            parser.error(str(e))
+
+    discovery = TenancyDiscovery(config, workers=args.workers, bucket_objects=args.bucket_objects,
+                                 bucket_shards=args.bucket_shards, checkpoint=checkpoint)
+    discovery.run(ResourceStream(args.output))
+
+    print(f"Snapshot saved to '{args.output}'.")
+    for line in discovery.summaries():
+        print(line)
+
+except oci.exceptions.ServiceError as e:
+    print(f"Service Error: {e}")
+except Exception as e:
+    print(f"Unexpected Error: {e}")
@@ -3,6 +3,13 @@ import csv
 import logging
 from datetime import datetime
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import load_config
+from ocitools.paging import paginate
+from ocitools.regions import RegionFanout
 
 # Configurações de saída
 LOG_DIR = "./logs"
@@ -19,82 +26,80 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 ])
 
 # Carrega configuração OCI
-config = oci.config.from_file()
-identity_client = oci.identity.IdentityClient(config)
+config = load_config()
+fanout = RegionFanout(config)
+
+# Lista todos os compartments ativos (inclusive sub-compartments), uma vez para todas as regiões
+compartments = fanout.compartments(include_root=False, lifecycle_state="ACTIVE")
+
+
+def processar_regiao(region):
+    """Linhas do relatório de uma região; as regiões rodam em paralelo."""
+    logging.info(f"Processando região: {region}")
+    linhas = []
+    compute_client = fanout.client(oci.core.ComputeClient, region)
+    block_storage_client = fanout.client(oci.core.BlockstorageClient, region)
+
+    # Loop por compartment
+    for comp in compartments:
+        logging.info(f"  [{region}] Compartment: {comp.name} ({comp.id})")
 
-# Lista todas as regiões ativas
-regions = [r.region_name for r in identity_client.list_region_subscriptions(config['tenancy']).data]
+        try:
+            instancias = list(paginate(
+                compute_client.list_instances,
+                compartment_id=comp.id
+            ))
+        except Exception as e:
+            logging.error(f"Erro ao listar instâncias no compartment {comp.name}: {e}")
+            continue
+
+        for instancia in instancias:
+            # Boot Volumes
+            boot_attachments = oci.pagination.list_call_get_all_results(
+                compute_client.list_boot_volume_attachments,
+                availability_domain=instancia.availability_domain,
+                compartment_id=comp.id,
+                instance_id=instancia.id
+            ).data
+            for bva in boot_attachments:
+                boot_volume = block_storage_client.get_boot_volume(bva.boot_volume_id).data
+                backups = paginate(
+                    block_storage_client.list_boot_volume_backups,
+                    compartment_id=comp.id,
+                    boot_volume_id=boot_volume.id
+                )
+                for bvb in backups:
+                    linhas.append([region, comp.name, instancia.display_name, instancia.id,
+                                   "BootVolume", boot_volume.display_name, boot_volume.id,
+                                   bvb.display_name, bvb.source_type, bvb.time_created])
+
+            # Block Volumes
+            attachments = oci.pagination.list_call_get_all_results(
+                compute_client.list_volume_attachments,
+                compartment_id=comp.id,
+                instance_id=instancia.id
+            ).data
+            for va in attachments:
+                block_volume = block_storage_client.get_volume(va.volume_id).data
+                backups = paginate(
+                    block_storage_client.list_volume_backups,
+                    compartment_id=comp.id,
+                    volume_id=block_volume.id
+                )
+                for bvb in backups:
+                    linhas.append([region, comp.name, instancia.display_name, instancia.id,
+                                   "BlockVolume", block_volume.display_name, block_volume.id,
+                                   bvb.display_name, bvb.source_type, bvb.time_created])
+    return linhas
 
-# Lista todos os compartments (inclusive sub-compartments)
-compartments = oci.pagination.list_call_get_all_results(
-    identity_client.list_compartments,
-    config['tenancy'],
-    compartment_id_in_subtree=True
-).data
 
 with open(CSV_FILE, mode='w', newline='') as file:
     writer = csv.writer(file)
     writer.writerow(["Region", "Compartment", "Instance Name", "Instance ID", "Volume Type", 
                      "Volume Name", "Volume ID", "Backup Name", "Source Type", "Created At"])
 
-    # Loop por região
-    for region in regions:
-        logging.info(f"Processando região: {region}")
-        config["region"] = region
-        compute_client = oci.core.ComputeClient(config)
-        block_storage_client = oci.core.BlockstorageClient(config)
-
-        # Loop por compartment
-        for comp in compartments:
-            if comp.lifecycle_state != "ACTIVE":
-                continue
-            logging.info(f"  Compartment: {comp.name} ({comp.id})")
-
-            try:
-                instancias = oci.pagination.list_call_get_all_results(
-                    compute_client.list_instances,
-                    compartment_id=comp.id
-                ).data
-            except Exception as e:
-                logging.error(f"Erro ao listar instâncias no compartment {comp.name}: {e}")
-                continue
-
-            for instancia in instancias:
-                # Boot Volumes
-                boot_attachments = oci.pagination.list_call_get_all_results(
-                    compute_client.list_boot_volume_attachments,
-                    availability_domain=instancia.availability_domain,
-                    compartment_id=comp.id,
-                    instance_id=instancia.id
-                ).data
-                for bva in boot_attachments:
-                    boot_volume = block_storage_client.get_boot_volume(bva.boot_volume_id).data
-                    backups = oci.pagination.list_call_get_all_results(
-                        block_storage_client.list_boot_volume_backups,
-                        compartment_id=comp.id,
-                        boot_volume_id=boot_volume.id
-                    ).data
-                    for bvb in backups:
-                        writer.writerow([region, comp.name, instancia.display_name, instancia.id,
-                                         "BootVolume", boot_volume.display_name, boot_volume.id,
-                                         bvb.display_name, bvb.source_type, bvb.time_created])
-
-                # Block Volumes
-                attachments = oci.pagination.list_call_get_all_results(
-                    compute_client.list_volume_attachments,
-                    compartment_id=comp.id,
-                    instance_id=instancia.id
-                ).data
-                for va in attachments:
-                    block_volume = block_storage_client.get_volume(va.volume_id).data
-                    backups = oci.pagination.list_call_get_all_results(
-                        block_storage_client.list_volume_backups,
-                        compartment_id=comp.id,
-                        volume_id=block_volume.id
-                    ).data
-                    for bvb in backups:
-                        writer.writerow([region, comp.name, instancia.display_name, instancia.id,
-                                         "BlockVolume", block_volume.display_name, block_volume.id,
-                                         bvb.display_name, bvb.source_type, bvb.time_created])
+    # Cada região é gravada assim que ela e as anteriores terminam, na ordem das regiões
+    for region, linhas in fanout.map(processar_regiao):
+        writer.writerows(linhas)
 
 logging.info(f"✅ Relatório gerado: {CSV_FILE}")
@@ -2,6 +2,13 @@ import oci
 import csv
 import logging
 import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import load_config
+from ocitools.paging import paginate
+from ocitools.regions import RegionFanout
 
 # --- Configuração de Logs ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[
@@ -15,45 +22,27 @@ def get_instance_nsgs():
     analisando todas as regiões da tenancy. O resultado é exportado para um arquivo CSV.
     """
     try:
-        config = oci.config.from_file()
-        identity_client = oci.identity.IdentityClient(config)
-        
-        tenancy_id = config["tenancy"]
-        report_data = []
+        config = load_config()
+        fanout = RegionFanout(config)
+        compartments = fanout.compartments(include_root=True, lifecycle_state="ACTIVE")
 
-        logging.info("Buscando todas as regiões ativas na tenancy...")
-        regions = [r.region_name for r in identity_client.list_region_subscriptions(tenancy_id).data]
-        logging.info(f"Regiões encontradas: {', '.join(regions)}")
-
-        # Loop por cada região ativa
-        for region in regions:
+        # Cada região é processada em paralelo; as linhas são unidas na ordem das regiões
+        def processar_regiao(region):
             logging.info(f"\n--- Processando região: {region} ---")
-            config['region'] = region
-
-            compute_client = oci.core.ComputeClient(config)
-            network_client = oci.core.VirtualNetworkClient(config)
-
-            logging.info(f"Buscando todos os compartimentos na região {region}...")
-            compartments = oci.pagination.list_call_get_all_results(
-                identity_client.list_compartments,
-                tenancy_id,
-                compartment_id_in_subtree=True
-            ).data
-            compartments.append(identity_client.get_compartment(tenancy_id).data)
+            region_rows = []
+            compute_client = fanout.client(oci.core.ComputeClient, region)
+            network_client = fanout.client(oci.core.VirtualNetworkClient, region)
 
             for compartment in compartments:
-                if compartment.lifecycle_state != "ACTIVE":
-                    continue
-                
-                logging.info(f"  Processando compartimento: {compartment.name}")
+                logging.info(f"  [{region}] Processando compartimento: {compartment.name}")
                 
                 try:
-                    instances = oci.pagination.list_call_get_all_results(
+                    instances = list(paginate(
                         compute_client.list_instances,
                         compartment_id=compartment.id
-                    ).data
+                    ))
                 except Exception as e:
-                    logging.error(f"  Erro ao listar instâncias no compartimento {compartment.name}: {e}")
+                    logging.error(f"  [{region}] Erro ao listar instâncias no compartimento {compartment.name}: {e}")
                     continue
 
                 for instance in instances:
@@ -75,7 +64,7 @@ def get_instance_nsgs():
                                     nsg = network_client.get_network_security_group(nsg_id).data
                                     nsg_names.append(nsg.display_name)
                             
-                        report_data.append({
+                        region_rows.append({
                             "Region": region,
                             "Instance Name": instance.display_name,
                             "Compartment": compartment.name,
@@ -85,7 +74,7 @@ def get_instance_nsgs():
                         })
                     except Exception as e:
                         logging.error(f"    Erro ao obter NSGs para a instância {instance.display_name}: {e}")
-                        report_data.append({
+                        region_rows.append({
                             "Region": region,
                             "Instance Name": instance.display_name,
                             "Compartment": compartment.name,
@@ -93,6 +82,9 @@ def get_instance_nsgs():
                             "Lifecycle State": instance.lifecycle_state,
                             "NSGs": "Erro ao obter"
                         })
+            return region_rows
+
+        report_data = fanout.rows(processar_regiao)
 
         csv_file = "oci_instance_nsg_report_all_regions.csv"
         if report_data:
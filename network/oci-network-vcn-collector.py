@@ -2,6 +2,12 @@ import oci
 import json
 import logging
 import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import load_config
+from ocitools.regions import RegionFanout
 
 # --- Padrões de Nomenclatura ---
 # oci-<serviço>-<ação>
@@ -19,59 +25,46 @@ def run_vcn_collector():
     """
     try:
         # Carrega a configuração do arquivo padrão
-        config = oci.config.from_file("~/.oci/config")
-        identity_client = oci.identity.IdentityClient(config)
-        
-        tenancy_id = config["tenancy"]
+        config = load_config("~/.oci/config")
+        fanout = RegionFanout(config)
 
-        # Lista para armazenar os detalhes das VCNs
-        all_vcn_details = []
+        logging.info("Buscando todos os compartimentos na tenancy...")
+        # Lista todos os compartimentos, incluindo sub-compartimentos (uma vez para todas as regiões)
+        compartments = fanout.compartments(include_root=True, lifecycle_state="ACTIVE")
 
-        logging.info("Buscando todas as regiões ativas na tenancy...")
-        regions = [r.region_name for r in identity_client.list_region_subscriptions(tenancy_id).data]
-        logging.info(f"Regiões encontradas: {', '.join(regions)}")
-
-        # Itera sobre cada região
-        for region in regions:
+        # Processa as regiões em paralelo; os resultados são unidos na ordem das regiões
+        def processar_regiao(region):
             logging.info(f"\n--- Processando região: {region} ---")
-            config['region'] = region
-
-            # Inicializa os clientes da OCI para a região atual
-            virtual_network_client = oci.core.VirtualNetworkClient(config)
+            vcn_details = []
 
-            logging.info("Buscando todos os compartimentos na tenancy...")
-            # Lista todos os compartimentos, incluindo sub-compartimentos
-            compartments = oci.pagination.list_call_get_all_results(
-                identity_client.list_compartments,
-                tenancy_id,
-                compartment_id_in_subtree=True
-            ).data
-
-            # Adiciona o compartimento raiz à lista
-            compartments.append(identity_client.get_compartment(tenancy_id).data)
+            # Cliente da OCI para a região
+            virtual_network_client = fanout.client(oci.core.VirtualNetworkClient, region)
 
             # Itera sobre os compartimentos e busca as VCNs
             for compartment in compartments:
-                if compartment.lifecycle_state == "ACTIVE":
-                    logging.info(f"  Listando VCNs no compartimento: {compartment.name}")
-                    
-                    try:
-                        vcn_response = oci.pagination.list_call_get_all_results(
-                            virtual_network_client.list_vcns,
-                            compartment_id=compartment.id
-                        )
-                        
-                        for vcn in vcn_response.data:
-                            logging.info(f"    VCN encontrada: {vcn.display_name}")
-                            all_vcn_details.append({
-                                "compartment": compartment.name,
-                                "vcn_name": vcn.display_name,
-                                "vcn_id": vcn.id,
-                                "region": region
-                            })
-                    except oci.exceptions.ServiceError as e:
-                        logging.error(f"  Erro ao listar VCNs no compartimento {compartment.name}: {e.message}")
-                        continue
+                logging.info(f"  [{region}] Listando VCNs no compartimento: {compartment.name}")
+
+                try:
+                    vcn_response = oci.pagination.list_call_get_all_results(
+                        virtual_network_client.list_vcns,
+                        compartment_id=compartment.id
+                    )
+
+                    for vcn in vcn_response.data:
+                        logging.info(f"    VCN encontrada: {vcn.display_name}")
+                        vcn_details.append({
+                            "compartment": compartment.name,
+                            "vcn_name": vcn.display_name,
+                            "vcn_id": vcn.id,
+                            "region": region
+                        })
+                except oci.exceptions.ServiceError as e:
+                    logging.error(f"  [{region}] Erro ao listar VCNs no compartimento {compartment.name}: {e.message}")
+                    continue
+            return vcn_details
+
+        # Lista com os detalhes das VCNs de todas as regiões
+        all_vcn_details = fanout.rows(processar_regiao)
         
         # Exporta os detalhes das VCNs para um arquivo JSON
         output_file = "vcn_details_all_regions.json"
@@ -0,0 +1,7 @@
+"""
+Shared helpers for the OCI scripts in this repository.
+
+The scripts live in per-category folders with hyphenated file names, so
+anything reused between them is kept in this package. Each script adds the
+repository root to ``sys.path`` before importing from ``ocitools``.
+"""
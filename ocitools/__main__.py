@@ -0,0 +1,3 @@
+from ocitools.cli import main
+
+main()
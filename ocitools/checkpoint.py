@@ -0,0 +1,184 @@
+"""
+SQLite checkpoints for long discovery runs.
+
+Each finished unit of work, identified by ``(scope, service)`` (for the
+collector: compartment OCID and OCI service), is committed immediately, so a
+run that dies halfway can be resumed and only repeats the units that had not
+finished. Compartment units are saved record by record through ``recorder``
+while they stream to their real sink, and restored by ``restore`` with a
+cursor, so neither side holds a whole unit in memory; small tenancy-wide
+results are stored as one JSON payload (``get``/``put``). The store also
+records the options the run was started with, so a resume cannot silently mix
+results produced with different settings, and whether the run finished, so a
+finished run is not "resumed" into a copy of itself.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    scope TEXT NOT NULL,
+    service TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (scope, service)
+);
+CREATE TABLE IF NOT EXISTS records (
+    scope TEXT NOT NULL,
+    service TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    resource_type TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (scope, service, seq)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class CheckpointMismatch(Exception):
+    """The checkpoint file was written by a run with different options."""
+
+
+class CheckpointComplete(CheckpointMismatch):
+    """``resume`` was asked for a checkpoint whose run already finished."""
+
+
+class CheckpointRecorder:
+    """Sink that forwards a unit's records to another sink and saves them in the checkpoint."""
+
+    def __init__(self, store: "CheckpointStore", scope: str, service: str, sink):
+        self.store = store
+        self.scope = scope
+        self.service = service
+        self.sink = sink
+        self.compartment_name = getattr(sink, "compartment_name", None)
+        self._seq = 0
+
+    def _save(self, resource_type, data) -> None:
+        encoded = json.dumps(data, default=str)
+        with self.store._lock:
+            self.store._conn.execute("INSERT INTO records (scope, service, seq, resource_type, data) VALUES (?, ?, ?, ?, ?)",
+                                     (self.scope, self.service, self._seq, resource_type, encoded))
+        self._seq += 1
+
+    def resource(self, resource_type: str, data: Dict) -> None:
+        self.sink.resource(resource_type, data)
+        self._save(resource_type, data)
+
+    def finding(self, message: str) -> None:
+        self.sink.finding(message)
+        self._save(None, message)
+
+
+class CheckpointStore:
+    """Thread-safe store of completed units."""
+
+    def __init__(self, path: str, options: Dict, resume: bool = False):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # Restores read with their own connection while units keep writing
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self.resumed = 0
+        self.saved = 0
+
+        stored = self._conn.execute("SELECT value FROM meta WHERE key = 'options'").fetchone()
+        if resume and stored and json.loads(stored[0]) != options:
+            self._conn.close()
+            raise CheckpointMismatch(
+                f"Checkpoint '{path}' was created with options {stored[0]}, not {json.dumps(options, sort_keys=True)}."
+            )
+        if resume and self._conn.execute("SELECT 1 FROM meta WHERE key = 'completed'").fetchone():
+            self._conn.close()
+            raise CheckpointComplete(f"Checkpoint '{path}' belongs to a run that already finished; "
+                                     f"run without --resume to start a new one.")
+        if not resume:
+            self._conn.execute("DELETE FROM units")
+            self._conn.execute("DELETE FROM records")
+        self._conn.execute("DELETE FROM meta WHERE key = 'completed'")
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('options', ?)",
+                           (json.dumps(options, sort_keys=True),))
+        self._conn.commit()
+
+    def get(self, scope: str, service: str):
+        """Payload of a completed unit, or None if it still has to run."""
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM units WHERE scope = ? AND service = ?",
+                                     (scope, service)).fetchone()
+            if row is None:
+                return None
+            self.resumed += 1
+        return json.loads(row[0])
+
+    def put(self, scope: str, service: str, payload) -> None:
+        """Mark a unit as done; the row is committed before returning."""
+        encoded = json.dumps(payload)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO units (scope, service, payload, completed_at) VALUES (?, ?, ?, ?)",
+                               (scope, service, encoded, time.time()))
+            self._conn.commit()
+            self.saved += 1
+
+    def restore(self, scope: str, service: str, sink) -> bool:
+        """Replay a completed unit's records into ``sink``; False if the unit still has to run."""
+        with self._lock:
+            done = self._conn.execute("SELECT 1 FROM units WHERE scope = ? AND service = ?",
+                                      (scope, service)).fetchone()
+        if done is None:
+            return False
+        # A separate cursor streams the rows while other units keep writing
+        reader = sqlite3.connect(self.path)
+        try:
+            rows = reader.execute("SELECT resource_type, data FROM records WHERE scope = ? AND service = ? ORDER BY seq",
+                                  (scope, service))
+            for resource_type, data in rows:
+                if resource_type is None:
+                    sink.finding(json.loads(data))
+                else:
+                    sink.resource(resource_type, json.loads(data))
+        finally:
+            reader.close()
+        with self._lock:
+            self.resumed += 1
+        return True
+
+    def recorder(self, scope: str, service: str, sink) -> CheckpointRecorder:
+        """Sink saving a unit's records as they are written to ``sink``; ``finish`` marks the unit done."""
+        with self._lock:
+            # Rows left by an attempt that died before finishing
+            self._conn.execute("DELETE FROM records WHERE scope = ? AND service = ?", (scope, service))
+        return CheckpointRecorder(self, scope, service, sink)
+
+    def finish(self, recorder: CheckpointRecorder) -> None:
+        """Mark a recorded unit as done; its rows are committed before returning."""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO units (scope, service, payload, completed_at) VALUES (?, ?, ?, ?)",
+                               (recorder.scope, recorder.service, json.dumps(recorder._seq), time.time()))
+            self._conn.commit()
+            self.saved += 1
+
+    def mark_complete(self) -> None:
+        """Record that the run finished, so it cannot be resumed."""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('completed', ?)", (str(time.time()),))
+            self._conn.commit()
+
+    def completed_units(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM units").fetchone()[0]
+
+    def summary(self) -> str:
+        return (f"Checkpoint '{self.path}': {self.resumed} units restored, "
+                f"{self.saved} units discovered and saved.")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
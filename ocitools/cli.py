@@ -0,0 +1,161 @@
+"""
+Single entry point for the scripts: ``ocitools <group> <command> [args]``.
+
+    python3 -m ocitools inventory collector --workers 8
+    python3 -m ocitools backup validate
+    python3 -m ocitools --list
+
+The dispatcher itself only imports the standard library. It resolves the
+subcommand to its script (``COMMANDS``) and runs it as ``__main__`` with the
+remaining arguments, so every script behaves exactly as when started with
+``python3 <folder>/<script>.py`` and pays only for its own imports.
+
+``--import-time`` runs only the top-level imports of the script and prints
+how long they took and which heavy packages they loaded;
+``benchmarks/bench_imports.py`` uses it to track import time per subcommand
+against ``benchmarks/import_baseline.json``.
+"""
+
+import argparse
+import ast
+import json
+import os
+import runpy
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# group -> command -> script, relative to the repository root
+COMMANDS: Dict[str, Dict[str, str]] = {
+    "inventory": {
+        "collector": "inventory/oci-inventory-collector.py",
+        "snapshot": "inventory/oci-inventory-snapshot.py",
+        "search": "inventory/oci-inventory-search.py",
+        "complete": "inventory/oci-inventory-complete-report.py",
+        "basic": "inventory/oci-inventory-basic-report.py",
+        "extended": "inventory/oci-inventory-extended-report.py",
+        "full": "inventory/oci-inventory-full-report.py",
+        "backups": "inventory/oci-inventory-with-backups-all-regions.py",
+    },
+    "volumes": {
+        "block": "volumes/oci-volume-block-list.py",
+        "block-backups": "volumes/oci-volume-block-backup-list.py",
+        "boot": "volumes/oci-volume-boot-list.py",
+        "boot-backups": "volumes/oci-volume-boot-backup-list.py",
+        "iops": "volumes/oci-volume-iops-analyzer.py",
+    },
+    "backup": {
+        "analyze": "backup/oci-backup-analyzer.py",
+        "validate": "backup/oci-backup-policy-validator.py",
+        "create-boot": "backup/oci-backup-boot-volume-create.py",
+        "create-block": "backup/oci-backup-block-volume-create.py",
+        "update-policy": "backup/oci-backup-policy-update.py",
+        "update-linux": "backup/oci-backup-policy-update-linux-instances.py",
+        "associate-block": "backup/oci-backup-policy-associate-block-volumes.py",
+        "compute-policy": "backup/oci-compute-backup-policy.py",
+        "storage-audit": "backup/oci-storage-backup-policy-auditor.py",
+        "windows-snapshot": "backup/oci-snapshot-windows.py",
+    },
+    "cleanup": {
+        "boot-backups": "cleanup/oci-cleanup-boot-volume-backups.py",
+        "block-backups": "cleanup/oci-cleanup-block-volume-backups.py",
+    },
+    "security": {
+        "iam-audit": "security/oci-iam-auditor.py",
+        "iam-report": "security/oci-iam-audit-report.py",
+        "policy-export": "security/oci-iam-policy-exporter.py",
+        "network-audit": "security/oci-network-security-auditor.py",
+        "audit-report": "security/oci-audit-security-report.py",
+    },
+    "network": {
+        "vcn": "network/oci-network-vcn-collector.py",
+        "nsg": "network/oci-compute-nsg-report.py",
+    },
+    "finops": {
+        "unused": "finops/oci-finops-unused-resources.py",
+    },
+    "database": {
+        "inventory": "database/oci-database-inventory.py",
+    },
+    "os": {
+        "versions": "os-reports/oci-os-version-report.py",
+        "versions-tags": "os-reports/oci-os-version-with-tags-report.py",
+    },
+}
+
+# Packages reported by --import-time when a subcommand loads them
+HEAVY_PACKAGES = ("oci", "openpyxl", "pandas", "numpy")
+
+
+def resolve(group: str, command: str) -> str:
+    """Absolute path of the script behind ``group command``."""
+    try:
+        return os.path.join(ROOT, COMMANDS[group][command])
+    except KeyError:
+        raise SystemExit(f"ocitools: unknown command '{group} {command}' (see 'ocitools --list')")
+
+
+def command_list() -> List[Tuple[str, str]]:
+    return [(f"{group} {command}", script) for group, commands in COMMANDS.items()
+            for command, script in commands.items()]
+
+
+def _top_level_imports(path: str) -> ast.Module:
+    with open(path) as file:
+        tree = ast.parse(file.read(), path)
+    return ast.Module(body=[node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))],
+                      type_ignores=[])
+
+
+def measure_imports(path: str) -> Dict:
+    """Run only the top-level imports of a script and report what they cost."""
+    code = compile(_top_level_imports(path), path, "exec")
+    sys.path[:0] = [os.path.dirname(path), ROOT]
+    before = set(sys.modules)
+    started = time.perf_counter()
+    exec(code, {"__name__": "__ocitools_imports__", "__file__": path})
+    elapsed = time.perf_counter() - started
+    loaded = set(sys.modules) - before
+    return {
+        "script": os.path.relpath(path, ROOT),
+        "import_ms": round(elapsed * 1000, 1),
+        "modules": len(loaded),
+        "packages": sorted(name for name in HEAVY_PACKAGES if name in loaded),
+        "oci_services": sorted(name[4:] for name in loaded if name.startswith("oci.") and name.count(".") == 1
+                               and not name.startswith("oci._") and hasattr(sys.modules[name], "__path__")),
+    }
+
+
+def run_script(path: str, args: List[str]) -> None:
+    sys.argv = [path, *args]
+    sys.path[0] = os.path.dirname(path)
+    runpy.run_path(path, run_name="__main__")
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="ocitools",
+        description="Run one of the OCI scripts: ocitools <group> <command> [script arguments].",
+        epilog="Groups: " + ", ".join(COMMANDS) + ". Use --list to see every command.")
+    parser.add_argument("--list", action="store_true", help="List the commands and the script each one runs.")
+    parser.add_argument("--import-time", action="store_true",
+                        help="Only run the script's imports and print how long they took (JSON).")
+    parser.add_argument("group", nargs="?")
+    parser.add_argument("command", nargs="?")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments passed to the script.")
+    args = parser.parse_args(argv)
+
+    if args.list or not args.group:
+        for name, script in command_list():
+            print(f"  {name:<28} {script}")
+        return
+    if not args.command:
+        parser.error(f"missing command for '{args.group}': " + ", ".join(COMMANDS.get(args.group, {})))
+    path = resolve(args.group, args.command)
+
+    if args.import_time:
+        print(json.dumps({"command": f"{args.group} {args.command}", **measure_imports(path)}))
+        return
+    run_script(path, args.args)
@@ -0,0 +1,304 @@
+"""
+OCI client factory with optional per-operation API profiling.
+
+Scripts create their clients with ``create_client`` instead of calling
+``oci.core.ComputeClient(config)`` and friends directly::
+
+    compute_client = create_client(oci.core.ComputeClient, config)
+
+Profiling is off unless ``OCITOOLS_PROFILE`` is set; the factory then returns
+the plain SDK client, so there is no overhead at all. With
+``OCITOOLS_PROFILE=1`` (profile written to ``oci_api_profile.json``) or
+``OCITOOLS_PROFILE=<path>``, every operation of every client is wrapped to
+record, per ``service.operation``:
+
+- calls and latency (p50/p95/p99 from a log-bucketed histogram),
+- pages (responses of ``list_*`` operations) and bytes received
+  (``content-length``),
+- throttled (429) and server error (5xx) responses. HTTP attempts are counted
+  on the SDK ``call_api`` hook, so responses that a retry strategy retried
+  are included.
+
+At exit the profile is written as JSON and the top ``OCITOOLS_PROFILE_TOP``
+operations (default 10) by total time are printed to stderr.
+
+``load_config`` replaces ``oci.config.from_file`` and, with ``create_client``,
+honours ``OCITOOLS_MODE=record|replay`` (see ``ocitools.replay``), so any
+script can be recorded once and replayed offline. ``create_client(...,
+rate_limit=True)`` paces the client with ``ocitools.rate_limit``.
+"""
+
+import atexit
+import json
+import math
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+import oci
+
+from ocitools import rate_limit as rate_limiter
+from ocitools import replay
+
+DEFAULT_PROFILE_PATH = "oci_api_profile.json"
+DEFAULT_TOP = 10
+
+# Histogram buckets grow by 5%, so percentiles are accurate to about 5%
+_BUCKET_GROWTH = math.log(1.05)
+_MIN_LATENCY_MS = 0.01
+
+
+class LatencyHistogram:
+    """Constant-memory latency histogram with log-spaced buckets."""
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, latency_ms: float) -> None:
+        index = int(math.log(max(latency_ms, _MIN_LATENCY_MS) / _MIN_LATENCY_MS) / _BUCKET_GROWTH)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def percentile(self, fraction: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = math.ceil(fraction * self.count)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Upper edge of the bucket, never above the slowest call seen
+                return min(_MIN_LATENCY_MS * math.exp((index + 1) * _BUCKET_GROWTH), self.max_ms)
+        return self.max_ms
+
+
+class OperationStats:
+    """Counters of one ``service.operation``."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.pages = 0
+        self.bytes = 0
+        self.attempts = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.latency = LatencyHistogram()
+
+    def as_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "pages": self.pages,
+            "bytes": self.bytes,
+            "http_attempts": self.attempts,
+            "throttled_429": self.throttled,
+            "server_errors_5xx": self.server_errors,
+            "total_ms": round(self.latency.total_ms, 3),
+            "p50_ms": round(self.latency.percentile(0.50), 3),
+            "p95_ms": round(self.latency.percentile(0.95), 3),
+            "p99_ms": round(self.latency.percentile(0.99), 3),
+            "max_ms": round(self.latency.max_ms, 3),
+        }
+
+
+class ApiProfiler:
+    """Thread-safe collection of ``OperationStats`` for one process."""
+
+    def __init__(self, path: str = DEFAULT_PROFILE_PATH, top: int = DEFAULT_TOP):
+        self.path = path
+        self.top = top
+        self.started = time.time()
+        self.operations: Dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, key: str) -> OperationStats:
+        stats = self.operations.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self.operations.setdefault(key, OperationStats())
+        return stats
+
+    def record_call(self, key: str, latency_ms: float, response=None, error=None, count_status: bool = True) -> None:
+        stats = self._stats(key)
+        with self._lock:
+            stats.calls += 1
+            stats.latency.add(latency_ms)
+            if error is not None:
+                stats.errors += 1
+                if count_status:
+                    self._count_status(stats, getattr(error, "status", None))
+                return
+            if key.split(".", 1)[1].startswith("list_"):
+                stats.pages += 1
+            stats.bytes += _content_length(response)
+
+    def record_attempt(self, key: str, status: Optional[int]) -> None:
+        stats = self._stats(key)
+        with self._lock:
+            stats.attempts += 1
+            self._count_status(stats, status)
+
+    @staticmethod
+    def _count_status(stats: OperationStats, status: Optional[int]) -> None:
+        if status == 429:
+            stats.throttled += 1
+        elif status is not None and 500 <= status < 600:
+            stats.server_errors += 1
+
+    def profile(self) -> Dict:
+        with self._lock:
+            operations = {key: stats.as_dict() for key, stats in sorted(self.operations.items())}
+        return {
+            "script": os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else None,
+            "started_at": self.started,
+            "wall_seconds": round(time.time() - self.started, 3),
+            "totals": {field: sum(op[field] for op in operations.values())
+                       for field in ("calls", "errors", "pages", "bytes", "throttled_429", "server_errors_5xx")},
+            "operations": operations,
+        }
+
+    def summary(self, profile: Dict = None) -> List[str]:
+        profile = profile or self.profile()
+        totals = profile["totals"]
+        lines = [f"OCI API profile: {totals['calls']} calls, {totals['pages']} pages, {totals['bytes']} bytes, "
+                 f"{totals['throttled_429']} throttled, {totals['server_errors_5xx']} 5xx "
+                 f"in {profile['wall_seconds']:.1f}s (saved to '{self.path}')"]
+        ranked = sorted(profile["operations"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        for key, op in ranked[:self.top]:
+            lines.append(f"  {key:<55} {op['calls']:>7} calls {op['total_ms'] / 1000:>9.2f}s "
+                         f"p50 {op['p50_ms']:>8.1f}ms p95 {op['p95_ms']:>8.1f}ms p99 {op['p99_ms']:>8.1f}ms "
+                         f"429 {op['throttled_429']:>4} 5xx {op['server_errors_5xx']:>4}")
+        return lines
+
+    def write(self) -> None:
+        profile = self.profile()
+        with open(self.path, "w") as file:
+            json.dump(profile, file, indent=4)
+        print("\n".join(self.summary(profile)), file=sys.stderr)
+
+
+def _content_length(response) -> int:
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return 0
+    try:
+        return int(headers.get("content-length") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def service_name(client) -> str:
+    """``ComputeClient`` -> ``compute`` (replay stand-ins report the class they replace)."""
+    return replay.service_of(getattr(client, "client_class", type(client)))
+
+
+def _wrap_operation(profiler: ApiProfiler, key: str, method, count_status: bool):
+    def operation(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = method(*args, **kwargs)
+        except Exception as e:
+            profiler.record_call(key, (time.perf_counter() - start) * 1000, error=e, count_status=count_status)
+            raise
+        profiler.record_call(key, (time.perf_counter() - start) * 1000, response=response)
+        return response
+    operation.__name__ = method.__name__
+    operation.__doc__ = method.__doc__
+    return operation
+
+
+def _hook_call_api(profiler: ApiProfiler, service: str, base_client) -> None:
+    call_api = base_client.call_api
+
+    def hooked_call_api(*args, **kwargs):
+        key = f"{service}.{kwargs.get('operation_name') or 'unknown'}"
+        try:
+            response = call_api(*args, **kwargs)
+        except Exception as e:
+            profiler.record_attempt(key, getattr(e, "status", None))
+            raise
+        profiler.record_attempt(key, getattr(response, "status", None))
+        return response
+
+    base_client.call_api = hooked_call_api
+
+
+def instrument(client, profiler: ApiProfiler):
+    """Wrap every public operation of an SDK client instance in place."""
+    service = service_name(client)
+    base_client = getattr(client, "base_client", None)
+    hooked = base_client is not None and hasattr(base_client, "call_api")
+    if hooked:
+        _hook_call_api(profiler, service, base_client)
+    for name in dir(client):
+        if name.startswith("_"):
+            continue
+        attribute = getattr(client, name)
+        if getattr(attribute, "__self__", None) is client:
+            setattr(client, name, _wrap_operation(profiler, f"{service}.{name}", attribute, count_status=not hooked))
+    return client
+
+
+_profiler: Optional[ApiProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> Optional[ApiProfiler]:
+    """The process-wide profiler, or None when ``OCITOOLS_PROFILE`` is not set."""
+    global _profiler
+    if _profiler is None:
+        setting = os.environ.get("OCITOOLS_PROFILE", "")
+        if setting.lower() in ("", "0", "false", "no"):
+            return None
+        with _profiler_lock:
+            if _profiler is None:
+                path = DEFAULT_PROFILE_PATH if setting.lower() in ("1", "true", "yes") else setting
+                _profiler = ApiProfiler(path, int(os.environ.get("OCITOOLS_PROFILE_TOP", DEFAULT_TOP)))
+                atexit.register(_profiler.write)
+    return _profiler
+
+
+def load_config(file_location: str = "~/.oci/config", profile_name: str = "DEFAULT") -> Dict:
+    """``oci.config.from_file``, or the recorded config when replaying."""
+    mode = replay.backend_mode()
+    if mode == "replay":
+        return dict(replay.get_cassette().config)
+    config = oci.config.from_file(file_location, profile_name)
+    if mode == "record":
+        replay.get_recorder().remember_config(config)
+    return config
+
+
+def create_client(client_class, config, rate_limit: bool = False, **kwargs):
+    """Create an OCI SDK client (or its replay stand-in), instrumented when profiling is enabled.
+
+    With ``rate_limit=True`` every operation goes through the shared adaptive
+    limiter of the client's region and service (see ``ocitools.rate_limit``),
+    which also takes over retrying 429s from the SDK retry strategy.
+    """
+    mode = replay.backend_mode()
+    if mode == "replay":
+        client = replay.ReplayClient(replay.get_cassette(), client_class, config)
+    else:
+        if rate_limit:
+            kwargs.setdefault("retry_strategy", oci.retry.NoneRetryStrategy())
+        client = client_class(config, **kwargs)
+        if mode == "record":
+            recorder = replay.get_recorder()
+            recorder.remember_config(config)
+            recorder.instrument(client, client_class, config.get("region"))
+    profiler = get_profiler()
+    if profiler is not None:
+        instrument(client, profiler)
+    if rate_limit:
+        # Outermost, so the profile shows every attempt the limiter makes
+        rate_limiter.instrument(client, client_class, config.get("region"))
+    return client
@@ -0,0 +1,182 @@
+"""
+Compartment tree of a tenancy, cached on disk between runs.
+
+Almost every script starts by listing the whole compartment hierarchy
+(``list_compartments`` with ``compartment_id_in_subtree=True``) and fetching
+the root with ``get_compartment``. ``CompartmentTree.load`` does that once per
+TTL window (``DEFAULT_TTL_SECONDS``, or ``OCITOOLS_COMPARTMENT_TTL``) and
+stores the result in the shared disk cache (see ``ocitools.disk_cache``), so
+later runs of any script answer from disk without identity calls::
+
+    tree = CompartmentTree.load(identity_client, config["tenancy"])
+    for compartment in tree.compartments(include_root=True):
+        ...
+    compartment_id = tree.id_of("LinuxBancoDados")
+    ids_below = tree.subtree(compartment_id)
+
+Compartments are returned as ``oci.identity.models.Compartment`` objects, so
+code written against the SDK listing keeps working. Scripts that create,
+update or delete resources pass ``refresh=True``: a compartment renamed or
+recreated within the TTL would otherwise resolve to a stale OCID.
+"""
+
+import atexit
+import os
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import oci
+
+from ocitools.disk_cache import JsonDiskCache
+
+DEFAULT_TTL_SECONDS = 3600
+
+
+def _to_entry(compartment) -> Dict:
+    entry = {field: getattr(compartment, field, None) for field in oci.identity.models.Compartment().swagger_types}
+    if isinstance(entry["time_created"], datetime):
+        entry["time_created"] = entry["time_created"].isoformat()
+    return entry
+
+
+def _to_model(entry: Dict):
+    values = dict(entry)
+    if values.get("time_created"):
+        values["time_created"] = datetime.fromisoformat(values["time_created"])
+    return oci.identity.models.Compartment(**values)
+
+
+class CompartmentTree:
+    """Parent/child links, name and ID maps and paths of every compartment of a tenancy."""
+
+    def __init__(self, tenancy_id: str, root: Dict, entries: List[Dict]):
+        self.tenancy_id = tenancy_id
+        self._root = root
+        self._entries = entries
+        self._by_id: Dict[str, Dict] = {entry["id"]: entry for entry in entries}
+        self._by_id[tenancy_id] = root
+        self._children: Dict[str, List[str]] = {}
+        for entry in entries:
+            self._children.setdefault(entry["compartment_id"], []).append(entry["id"])
+        self._by_name: Dict[str, List[str]] = {}
+        for entry in entries + [root]:
+            self._by_name.setdefault(entry["name"], []).append(entry["id"])
+        self._models: Dict[str, object] = {}
+
+    @classmethod
+    def fetch(cls, identity_client, tenancy_id: str, access_level: str = "ANY") -> "CompartmentTree":
+        """Build the tree from the identity service (two round trips plus paging)."""
+        compartments = oci.pagination.list_call_get_all_results(
+            identity_client.list_compartments,
+            tenancy_id,
+            compartment_id_in_subtree=True,
+            access_level=access_level
+        ).data
+        root = identity_client.get_compartment(tenancy_id).data
+        return cls(tenancy_id, _to_entry(root), [_to_entry(c) for c in compartments])
+
+    @classmethod
+    def load(cls, identity_client, tenancy_id: str, access_level: str = "ANY",
+             ttl_seconds: Optional[float] = None, refresh: bool = False) -> "CompartmentTree":
+        """The cached tree of ``tenancy_id``, fetched and cached when missing, expired or ``refresh``."""
+        if ttl_seconds is None:
+            ttl_seconds = float(os.environ.get("OCITOOLS_COMPARTMENT_TTL", DEFAULT_TTL_SECONDS))
+        cache = _get_cache(ttl_seconds)
+        key = f"{tenancy_id}:{access_level}"
+        cached = None if refresh else cache.get(key)
+        if cached is not None:
+            return cls(tenancy_id, cached["root"], cached["compartments"])
+        tree = cls.fetch(identity_client, tenancy_id, access_level)
+        cache.set(key, {"root": tree._root, "compartments": tree._entries})
+        return tree
+
+    def _model(self, compartment_id: str):
+        model = self._models.get(compartment_id)
+        if model is None:
+            model = self._models[compartment_id] = _to_model(self._by_id[compartment_id])
+        return model
+
+    @property
+    def root(self):
+        """The tenancy (root compartment), as ``get_compartment(tenancy_id).data``."""
+        return self._model(self.tenancy_id)
+
+    def compartments(self, include_root: bool = False, lifecycle_state: Optional[str] = None) -> List:
+        """Every compartment in listing order, the root last when ``include_root``."""
+        ids = [entry["id"] for entry in self._entries] + ([self.tenancy_id] if include_root else [])
+        models = [self._model(compartment_id) for compartment_id in ids]
+        if lifecycle_state:
+            models = [c for c in models if c.lifecycle_state == lifecycle_state]
+        return models
+
+    def get(self, compartment_id: str):
+        """The compartment with this OCID (``KeyError`` when unknown)."""
+        return self._model(compartment_id)
+
+    def __contains__(self, compartment_id: str) -> bool:
+        return compartment_id in self._by_id
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def name_of(self, compartment_id: str, default: Optional[str] = None) -> Optional[str]:
+        entry = self._by_id.get(compartment_id)
+        return entry["name"] if entry else default
+
+    def ids_named(self, name: str) -> List[str]:
+        """OCIDs of every compartment called ``name`` (names are only unique among siblings)."""
+        return list(self._by_name.get(name, []))
+
+    def id_of(self, name: str, lifecycle_state: Optional[str] = "ACTIVE") -> str:
+        """OCID of the first compartment called ``name`` (``KeyError`` when there is none)."""
+        for compartment_id in self._by_name.get(name, []):
+            if lifecycle_state is None or self._by_id[compartment_id]["lifecycle_state"] in (lifecycle_state, None):
+                return compartment_id
+        raise KeyError(name)
+
+    def parent_of(self, compartment_id: str) -> Optional[str]:
+        """Parent OCID, or None for the root."""
+        if compartment_id == self.tenancy_id:
+            return None
+        return self._by_id[compartment_id]["compartment_id"]
+
+    def children_of(self, compartment_id: str) -> List[str]:
+        return list(self._children.get(compartment_id, []))
+
+    def ancestors(self, compartment_id: str) -> List[str]:
+        """OCIDs from the parent up to the root."""
+        ancestors = []
+        parent = self.parent_of(compartment_id)
+        while parent is not None:
+            ancestors.append(parent)
+            parent = self.parent_of(parent) if parent in self._by_id else None
+        return ancestors
+
+    def path_of(self, compartment_id: str, separator: str = "/") -> str:
+        """Names from the root down, e.g. ``root/Producao/LinuxBancoDados``."""
+        ids = [compartment_id] + self.ancestors(compartment_id)
+        return separator.join(self.name_of(i, i) for i in reversed(ids))
+
+    def walk(self, compartment_id: str) -> Iterator[str]:
+        """OCIDs of ``compartment_id`` and everything below it, depth first."""
+        stack = [compartment_id]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(reversed(self._children.get(current, [])))
+
+    def subtree(self, compartment_id: str, include_self: bool = True) -> List[str]:
+        """OCIDs of the compartments in the subtree of ``compartment_id``."""
+        ids = list(self.walk(compartment_id))
+        return ids if include_self else ids[1:]
+
+
+_cache: Optional[JsonDiskCache] = None
+
+
+def _get_cache(ttl_seconds: float) -> JsonDiskCache:
+    global _cache
+    if _cache is None or _cache.ttl_seconds != ttl_seconds:
+        _cache = JsonDiskCache("compartments", ttl_seconds)
+        atexit.register(_cache.save)
+    return _cache
@@ -0,0 +1,329 @@
+"""
+Tenancy discovery stage shared by the inventory and security reports.
+
+``TenancyDiscovery`` performs one sweep (VCNs, instances with their VNIC NSGs,
+volumes, buckets, ADBs, load balancers, Cloud Advisor and Cloud Guard) and
+produces a ``Snapshot``. The sweep only collects facts; findings are derived
+later by the rule engine, so the same snapshot can feed any number of reports.
+
+Work is split in (compartment, service) units that can run concurrently on a
+``ServicePool``; units are merged in serial order, optionally checkpointed,
+and either kept in memory or streamed to an NDJSON snapshot file. Streamed
+units write straight to the stream (or to their spool when parallel), with
+the checkpoint saving each record on the way, so no unit is buffered.
+
+Progress and service errors go through ``log`` using ``DiscoveryMessages``
+templates, so each report keeps its own language (``PORTUGUESE_MESSAGES``
+for the security audit report).
+"""
+
+from collections import namedtuple
+
+import oci
+
+from ocitools.clients import create_client
+from ocitools.compartments import CompartmentTree
+from ocitools.image_cache import ImageCache
+from ocitools.nsg_cache import NsgRuleCache
+from ocitools.object_listing import DEFAULT_SHARD_WORKERS, ShardedObjectLister
+from ocitools.paging import paginate
+from ocitools.resource_stream import MemorySink
+from ocitools.service_pool import ServicePool
+from ocitools.snapshot import Snapshot
+from ocitools.volume_attachments import VolumeAttachmentIndex
+
+# str.format templates: {compartment} is the compartment name, {error} the ServiceError
+DiscoveryMessages = namedtuple("DiscoveryMessages", ["compartment", "cloud_advisor_error", "cloud_guard_error"])
+
+ENGLISH_MESSAGES = DiscoveryMessages(
+    compartment="Discovering resources in compartment: {compartment}",
+    cloud_advisor_error="Cloud Advisor Service Error: {error}",
+    cloud_guard_error="Cloud Guard Service Error: {error}",
+)
+
+PORTUGUESE_MESSAGES = DiscoveryMessages(
+    compartment="Descobrindo recursos no compartimento: {compartment}",
+    cloud_advisor_error="Erro no serviço Cloud Advisor: {error.message}",
+    cloud_guard_error="Erro no serviço Cloud Guard: {error.message}",
+)
+
+
+class TenancyDiscovery:
+    """One sweep of every active compartment of a tenancy."""
+
+    def __init__(self, config, workers: int = 1, bucket_objects: bool = False,
+                 bucket_shards: int = DEFAULT_SHARD_WORKERS, checkpoint=None, log=print,
+                 messages: DiscoveryMessages = ENGLISH_MESSAGES):
+        self.config = config
+        self.tenancy_id = config["tenancy"]
+        self.workers = workers
+        self.bucket_objects = bucket_objects
+        self.checkpoint = checkpoint
+        self.log = log
+        self.messages = messages
+
+        self.identity_client = create_client(oci.identity.IdentityClient, config)
+        self.virtual_network_client = create_client(oci.core.VirtualNetworkClient, config)
+        self.compute_client = create_client(oci.core.ComputeClient, config)
+        self.block_storage_client = create_client(oci.core.BlockstorageClient, config)
+        self.object_storage_client = create_client(oci.object_storage.ObjectStorageClient, config)
+        self.database_client = create_client(oci.database.DatabaseClient, config)
+        self.load_balancer_client = create_client(oci.load_balancer.LoadBalancerClient, config)
+        self.cloud_advisor_client = create_client(oci.optimizer.OptimizerClient, config)
+        self.cloud_guard_client = create_client(oci.cloud_guard.CloudGuardClient, config)
+        self.namespace = self.object_storage_client.get_namespace().data
+
+        self.attachment_index = VolumeAttachmentIndex(self.compute_client)
+        self.nsg_cache = NsgRuleCache(self.virtual_network_client)
+        self.image_cache = ImageCache(self.compute_client)
+        self.object_lister = ShardedObjectLister(self.object_storage_client, self.namespace, bucket_shards)
+
+        # (service, discovery function) in the order a serial run visits them
+        self.tasks = [
+            ("network", self.discover_vcns),
+            ("compute", self.discover_instances),
+            ("block_storage", self.discover_volumes),
+            ("object_storage", self.discover_buckets),
+            ("database", self.discover_autonomous_databases),
+            ("load_balancer", self.discover_load_balancers),
+        ]
+        self._stream = None
+        self._resources = {}
+        self._cloud_advisor = []
+        self._cloud_guard = []
+
+    @property
+    def bucket_contents(self) -> str:
+        return "objects" if self.bucket_objects else "summary"
+
+    # Each discovery function handles one (compartment, service) unit and
+    # reports the resources, with the fields the rules need, to a sink.
+    def discover_vcns(self, compartment, sink):
+        vcn_response = oci.pagination.list_call_get_all_results(
+            self.virtual_network_client.list_vcns,
+            compartment_id=compartment.id
+        ).data
+        for vcn in vcn_response:
+            sink.resource("VCNs", {"name": vcn.display_name, "id": vcn.id, "cidr_block": vcn.cidr_block})
+
+    def discover_instances(self, compartment, sink):
+        # One list call per compartment answers every attachment lookup
+        self.attachment_index.load(compartment.id)
+        for instance in paginate(self.compute_client.list_instances, compartment_id=compartment.id):
+            metadata = instance.metadata or {}
+            try:
+                image_details = self.image_cache.get(instance.image_id)
+                image_os, image_is_latest = image_details.operating_system, image_details.is_latest
+            except oci.exceptions.ServiceError:
+                # Deleted or inaccessible image: the image rules cannot apply
+                image_os, image_is_latest = None, None
+
+            # Ingress rules open to the world, per NSG of each VNIC
+            nsgs = []
+            vnics = self.compute_client.list_vnic_attachments(compartment_id=compartment.id, instance_id=instance.id).data
+            for vnic_attachment in vnics:
+                vnic = self.virtual_network_client.get_vnic(vnic_attachment.vnic_id).data
+                for nsg_id in vnic.nsg_ids:
+                    try:
+                        open_rules = sum(1 for rule in self.nsg_cache.get_rules(nsg_id)
+                                         if rule.direction == "INGRESS" and rule.source == "0.0.0.0/0")
+                        nsgs.append({"nsg_id": nsg_id, "open_ingress_rules": open_rules})
+                    except oci.exceptions.ServiceError as e:
+                        nsgs.append({"nsg_id": nsg_id, "error": str(e)})
+
+            sink.resource("Compute Instances", {
+                "name": instance.display_name,
+                "id": instance.id,
+                "block_volumes": self.attachment_index.volume_ids_for_instance(instance.id, compartment.id),
+                "image_operating_system": image_os,
+                "image_is_latest": image_is_latest,
+                "metadata_keys": list(metadata),
+                "logging_agent": metadata.get("logging_agent"),
+                "nsgs": nsgs
+            })
+
+    def discover_volumes(self, compartment, sink):
+        self.attachment_index.load(compartment.id)
+        volume_response = oci.pagination.list_call_get_all_results(
+            self.block_storage_client.list_volumes,
+            compartment_id=compartment.id
+        ).data
+        for volume in volume_response:
+            sink.resource("Block Volumes", {
+                "name": volume.display_name,
+                "id": volume.id,
+                "attached": self.attachment_index.is_attached(volume.id, compartment.id),
+                "is_auto_tune_enabled": volume.is_auto_tune_enabled
+            })
+
+    def discover_buckets(self, compartment, sink):
+        bucket_response = oci.pagination.list_call_get_all_results(
+            self.object_storage_client.list_buckets,
+            namespace_name=self.namespace,
+            compartment_id=compartment.id
+        ).data
+        for bucket in bucket_response:
+            # Detailed bucket info tells whether it is public
+            bucket_details = self.object_storage_client.get_bucket(
+                namespace_name=self.namespace,
+                bucket_name=bucket.name
+            ).data
+            sink.resource("Buckets", {"name": bucket.name, "public_access_type": bucket_details.public_access_type})
+            if self.bucket_objects:
+                for obj in self.object_lister.list_objects(bucket.name):
+                    sink.resource("Bucket Objects", {"bucket_name": bucket.name, "object_name": obj.name})
+            else:
+                for row in self.object_lister.summarize(bucket.name).rows():
+                    sink.resource("Bucket Summary", row)
+
+    def discover_autonomous_databases(self, compartment, sink):
+        adb_response = oci.pagination.list_call_get_all_results(
+            self.database_client.list_autonomous_databases,
+            compartment_id=compartment.id
+        ).data
+        for adb in adb_response:
+            sink.resource("Autonomous Databases", {"name": adb.display_name, "id": adb.id, "db_workload": adb.db_workload})
+
+    def discover_load_balancers(self, compartment, sink):
+        lb_response = oci.pagination.list_call_get_all_results(
+            self.load_balancer_client.list_load_balancers,
+            compartment_id=compartment.id
+        ).data
+        for lb in lb_response:
+            sink.resource("Load Balancers", {"name": lb.display_name, "id": lb.id, "shape_name": lb.shape_name})
+
+    def discover_cloud_advisor(self):
+        recommendations = []
+        try:
+            advisor_recommendations = oci.pagination.list_call_get_all_results(
+                self.cloud_advisor_client.list_recommendations,
+                compartment_id=self.tenancy_id,
+                compartment_id_in_subtree=True  # Include sub-compartments
+            ).data
+            for recommendation in advisor_recommendations:
+                recommendations.append({
+                    "Name": recommendation.name,
+                    "Recommendation": getattr(recommendation, "description", "No description available")
+                })
+        except oci.exceptions.ServiceError as e:
+            self.log(self.messages.cloud_advisor_error.format(error=e))
+        return recommendations
+
+    def discover_cloud_guard(self):
+        problems = []
+        try:
+            cloud_guard_problems = oci.pagination.list_call_get_all_results(
+                self.cloud_guard_client.list_problems,
+                compartment_id=self.tenancy_id,
+                compartment_id_in_subtree=True
+            ).data
+            for problem in cloud_guard_problems:
+                problems.append({
+                    "Name": problem.resource_name,
+                    "Description": problem.labels
+                })
+        except oci.exceptions.ServiceError as e:
+            self.log(self.messages.cloud_guard_error.format(error=e))
+        return problems
+
+    # Unit plumbing: write to memory, the stream or a spool, checkpointing on the way
+    def _run_unit(self, service, task, compartment):
+        if self._stream is None:
+            sink = MemorySink(compartment.name)
+        elif self.workers > 1:
+            sink = self._stream.spool(compartment.name)
+        else:
+            sink = self._stream.sink(compartment.name)
+        if self.checkpoint is None:
+            task(compartment, sink)
+        elif not self.checkpoint.restore(compartment.id, service, sink):
+            recorder = self.checkpoint.recorder(compartment.id, service, sink)
+            task(compartment, recorder)
+            self.checkpoint.finish(recorder)
+        return sink
+
+    def _run_tenancy_unit(self, service, task):
+        results = self.checkpoint.get(self.tenancy_id, service) if self.checkpoint else None
+        if results is None:
+            results = task()
+            if self.checkpoint:
+                self.checkpoint.put(self.tenancy_id, service, results)
+        return results
+
+    def _start_compartment(self, compartment):
+        self.log(self.messages.compartment.format(compartment=compartment.name))
+        if self._stream is None:
+            self._resources[compartment.name] = {}
+        else:
+            self._stream.compartment(compartment.name, compartment.id)
+
+    def _commit_unit(self, compartment, sink):
+        if self._stream is None:
+            for resource_type, items in sink.resources.items():
+                self._resources[compartment.name].setdefault(resource_type, []).extend(items)
+        else:
+            self._stream.commit(sink)
+
+    def _record_tenancy_results(self, advisor, problems):
+        if self._stream is None:
+            self._cloud_advisor.extend(advisor)
+            self._cloud_guard.extend(problems)
+        else:
+            for recommendation in advisor:
+                self._stream.cloud_advisor(recommendation)
+            for problem in problems:
+                self._stream.cloud_guard(problem)
+
+    def _sweep(self, active_compartments):
+        """Discover every unit, serially or on a ``ServicePool``, committing them in serial order."""
+        if self.workers > 1:
+            # Fan out (compartment, service) units, then merge them in serial order
+            with ServicePool(self.workers) as pool:
+                unit_futures = [
+                    (compartment, [pool.submit(service, self._run_unit, service, task, compartment)
+                                   for service, task in self.tasks])
+                    for compartment in active_compartments
+                ]
+                advisor_future = pool.submit("optimizer", self._run_tenancy_unit, "optimizer", self.discover_cloud_advisor)
+                cloud_guard_future = pool.submit("cloud_guard", self._run_tenancy_unit, "cloud_guard", self.discover_cloud_guard)
+                for compartment, futures in unit_futures:
+                    self._start_compartment(compartment)
+                    for future in futures:
+                        self._commit_unit(compartment, future.result())
+                self._record_tenancy_results(advisor_future.result(), cloud_guard_future.result())
+        else:
+            for compartment in active_compartments:
+                self._start_compartment(compartment)
+                for service, task in self.tasks:
+                    self._commit_unit(compartment, self._run_unit(service, task, compartment))
+            self._record_tenancy_results(self._run_tenancy_unit("optimizer", self.discover_cloud_advisor),
+                                         self._run_tenancy_unit("cloud_guard", self.discover_cloud_guard))
+
+    def run(self, stream=None) -> Snapshot:
+        """Sweep the tenancy into memory, or into ``stream`` (a ``ResourceStream``, closed on return)."""
+        self._stream = stream
+        if stream is not None:
+            stream.header({"tenancy": self.tenancy_id, "bucket_contents": self.bucket_contents})
+
+        compartments = CompartmentTree.load(self.identity_client, self.tenancy_id).compartments()
+        compartments.append(oci.identity.models.Compartment(id=self.tenancy_id, name="Tenancy Root"))
+        active_compartments = [c for c in compartments if c.lifecycle_state == "ACTIVE"]
+
+        # The bucket listing pool only lives for the sweep
+        with self.object_lister:
+            self._sweep(active_compartments)
+
+        if self.checkpoint:
+            self.checkpoint.mark_complete()
+        if stream is not None:
+            stream.close()
+            return Snapshot.load(stream.path)
+        return Snapshot(self._resources, self._cloud_advisor, self._cloud_guard,
+                        {"tenancy": self.tenancy_id, "bucket_contents": self.bucket_contents})
+
+    def summaries(self):
+        """One line per cache / checkpoint describing the API calls it saved."""
+        lines = [self.attachment_index.summary(), self.nsg_cache.summary()]
+        if self.checkpoint:
+            lines.append(self.checkpoint.summary())
+        return lines
@@ -0,0 +1,79 @@
+"""
+Small JSON key/value store on disk with a TTL per entry.
+
+Files live under ``~/.cache/ocitools`` (override with ``OCITOOLS_CACHE_DIR``)
+so the cached data survives between runs and is shared by every script.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "ocitools")
+
+logger = logging.getLogger(__name__)
+
+
+def cache_dir() -> str:
+    """Return the cache directory, honouring ``OCITOOLS_CACHE_DIR``."""
+    return os.path.expanduser(os.environ.get("OCITOOLS_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+class JsonDiskCache:
+    """Dictionary persisted as one JSON file; entries expire after ``ttl_seconds``."""
+
+    def __init__(self, name: str, ttl_seconds: float):
+        self.path = os.path.join(cache_dir(), f"{name}.json")
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = self._read()
+        self._dirty = False
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _fresh(self, entry: Optional[Dict], now: float) -> bool:
+        return bool(entry) and now - entry.get("stored_at", 0) < self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the stored value, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if self._fresh(entry, time.time()):
+                return entry["value"]
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = {"stored_at": time.time(), "value": value}
+            self._dirty = True
+
+    def save(self) -> None:
+        """Merge with the file on disk (newest entry wins) and write it atomically."""
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            merged = self._read()
+            for key, entry in self._entries.items():
+                if entry.get("stored_at", 0) >= merged.get(key, {}).get("stored_at", 0):
+                    merged[key] = entry
+            merged = {k: v for k, v in merged.items() if self._fresh(v, now)}
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as file:
+                    json.dump(merged, file)
+                os.replace(tmp_path, self.path)
+                self._entries = merged
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Could not write cache file {self.path}: {e}")
@@ -0,0 +1,164 @@
+"""
+Effective IAM permissions: "who can <verb> <resource> in <compartment>".
+
+``PermissionResolver`` combines the parsed policy statements
+(``ocitools.iam_policies.PolicyIndex``), the group memberships and the
+compartment tree into an inverted index from (verb, resource, compartment) to
+the statements granting exactly that, and answers queries by expanding the
+question instead of rescanning policies::
+
+    resolver = PermissionResolver(index, groups, group_user_map, users)
+    for grant in resolver.who_can("manage", "volume-family", "Prod/DB"):
+        print(grant.principal_kind, grant.principal, grant.via, grant.statement.text)
+
+A statement grants the query when:
+
+- its verb is the one asked or a stronger one (inspect < read < use < manage);
+- its resource type is the one asked, a family containing it or
+  ``all-resources``. A family is only granted by the family itself (or
+  ``all-resources``), not by statements on some of its members;
+- it is written in the compartment asked or in one of its ancestors (policies
+  are inherited down the tree; ``in tenancy`` covers every compartment).
+
+Only ``Allow`` statements count (``Endorse`` grants act in other tenancies and
+``Admit`` grants go to principals of other tenancies). Statements with a
+``where`` clause are returned too; ``Grant.statement.conditions`` tells them
+apart. Group members, compartment ancestors and answers are memoized, so a
+repeated query costs one dictionary lookup.
+"""
+
+from collections import defaultdict, namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ocitools.iam_policies import (ALL_RESOURCES, RESOURCE_FAMILIES, VERBS, PolicyIndex, PolicyStatement,
+                                   normalize_path)
+
+Grant = namedtuple("Grant", ["principal_kind", "principal", "via", "statement"])
+Grant.__doc__ = """One way a principal gets the access asked for.
+
+``principal_kind`` is ``user``, ``dynamic-group``, ``service``, ``any-user``,
+``any-group`` or ``group`` (a group the memberships do not know); ``principal``
+is the user OCID or the name; ``via`` is the group a user gets it through."""
+
+
+class PermissionResolver:
+    """Inverted index of Allow statements with compartment inheritance and memoized queries."""
+
+    def __init__(self, index: PolicyIndex, groups: Iterable = (), group_user_map: Dict[str, List[str]] = None,
+                 users: Iterable = ()):
+        self.index = index
+        self.group_user_map = group_user_map or {}
+        self.users = list(users)
+        self._group_ids: Dict[str, str] = {}
+        self._group_names: Dict[str, str] = {}
+        for group in groups:
+            self._group_ids[group.name.lower()] = group.id
+            self._group_ids[group.id.lower()] = group.id
+            self._group_names[group.id] = group.name
+        # (verb, resource, compartment path in lowercase) -> (position, statement), in policy order
+        self._grants: Dict[Tuple[str, str, str], List[Tuple[int, PolicyStatement]]] = defaultdict(list)
+        for position, statement in enumerate(index.statements):
+            if statement.action == "allow" and statement.verb and statement.compartment is not None:
+                key = (statement.verb, statement.resource, statement.compartment.lower())
+                self._grants[key].append((position, statement))
+        self._members: Dict[str, List[Tuple[str, str, str]]] = {}
+        self._scopes: Dict[str, List[str]] = {}
+        self._answers: Dict[Tuple[str, str, str], List[Grant]] = {}
+
+    # --- Query expansion ------------------------------------------------------
+
+    @staticmethod
+    def verbs_covering(verb: str) -> Tuple[str, ...]:
+        """The verb and every stronger one."""
+        try:
+            return VERBS[VERBS.index(verb.lower()):]
+        except ValueError:
+            raise ValueError(f"unknown verb '{verb}' (one of {', '.join(VERBS)})") from None
+
+    @staticmethod
+    def resources_covering(resource: str) -> Tuple[str, ...]:
+        """The resource type, the families it belongs to and ``all-resources``."""
+        resource = resource.lower()
+        if resource == ALL_RESOURCES:
+            return (resource,)
+        return (resource,) + RESOURCE_FAMILIES.get(resource, ()) + (ALL_RESOURCES,)
+
+    def scopes(self, compartment: str) -> List[str]:
+        """Lowercase paths of the compartment and its ancestors, up to the tenancy (``""``)."""
+        scopes = self._scopes.get(compartment)
+        if scopes is None:
+            if compartment.startswith("ocid1."):
+                path = self.index.path_of(compartment)
+                if path is None:
+                    raise KeyError(f"compartment {compartment} is not in the compartment tree")
+            else:
+                path = normalize_path(compartment)
+            parts = path.lower().split("/") if path else []
+            scopes = self._scopes[compartment] = ["/".join(parts[:size]) for size in range(len(parts), -1, -1)]
+        return scopes
+
+    # --- Principals -----------------------------------------------------------
+
+    def group_members(self, name: str) -> List[Tuple[str, str, str]]:
+        """``(kind, principal, via)`` for the members of a group named in a statement."""
+        members = self._members.get(name)
+        if members is None:
+            lookup = name.lower()
+            # 'Default'/'Admins' is the Admins group of the default identity domain
+            group_id = self._group_ids.get(lookup) or self._group_ids.get(lookup.rpartition("/")[2])
+            if group_id is None:
+                members = [("group", name, None)]
+            else:
+                via = self._group_names[group_id]
+                members = [("user", user_id, via) for user_id in self.group_user_map.get(group_id, [])]
+            self._members[name] = members
+        return members
+
+    def principals(self, statement: PolicyStatement) -> List[Tuple[str, str, str]]:
+        principals = []
+        for subject in statement.subjects:
+            if subject.kind == "group":
+                principals.extend(self.group_members(subject.name))
+            elif subject.kind == "any-user":
+                principals.append(("any-user", None, None))
+                principals.extend(("user", user.id, None) for user in self.users)
+            else:
+                principals.append((subject.kind, subject.name, None))
+        return principals
+
+    # --- Queries --------------------------------------------------------------
+
+    def statements_granting(self, verb: str, resource: str, compartment: str) -> List[PolicyStatement]:
+        """Allow statements that give ``verb`` on ``resource`` in ``compartment``, in policy order."""
+        found = []
+        for scope in self.scopes(compartment):
+            for granted_verb in self.verbs_covering(verb):
+                for granted_resource in self.resources_covering(resource):
+                    found.extend(self._grants.get((granted_verb, granted_resource, scope), ()))
+        found.sort(key=lambda entry: entry[0])
+        return [statement for _, statement in found]
+
+    def who_can(self, verb: str, resource: str, compartment: str) -> List[Grant]:
+        """Every (principal, statement) pair giving ``verb`` on ``resource`` in ``compartment``."""
+        key = (verb.lower(), resource.lower(), compartment)
+        answer = self._answers.get(key)
+        if answer is None:
+            answer = self._answers[key] = [
+                Grant(kind, principal, via, statement)
+                for statement in self.statements_granting(verb, resource, compartment)
+                for kind, principal, via in self.principals(statement)
+            ]
+        return answer
+
+    def users_who_can(self, verb: str, resource: str, compartment: str,
+                      unconditional: bool = False) -> List[str]:
+        """OCIDs of the users with the access, optionally only through statements without conditions."""
+        return sorted({grant.principal for grant in self.who_can(verb, resource, compartment)
+                       if grant.principal_kind == "user" and not (unconditional and grant.statement.conditions)})
+
+    def can(self, user_id: str, verb: str, resource: str, compartment: str) -> Optional[Grant]:
+        """The first grant giving a user the access, or None."""
+        for grant in self.who_can(verb, resource, compartment):
+            if grant.principal_kind == "user" and grant.principal == user_id:
+                return grant
+        return None
@@ -0,0 +1,283 @@
+"""
+IAM policy statements parsed into structured records and indexed.
+
+Policy statements are free text::
+
+    Allow group NetAdmins to manage virtual-network-family in compartment Prod:Network
+    Allow dynamic-group 'Default'/'Functions' to read secret-family in tenancy where target.vault.id = '...'
+    Allow group Auditors, group Ops to {INSTANCE_READ, VOLUME_INSPECT} in compartment id ocid1.compartment...
+
+``parse_statement`` turns one into a ``PolicyStatement``: action (allow /
+endorse / admit), subjects, verb and resource type (or a permission list),
+the families the resource type belongs to, the location and the ``where``
+conditions. ``PolicyIndex`` parses every statement of a list of policies once
+and indexes them by verb, resource type, family, permission, subject and
+compartment, so analyses query the indexes instead of rescanning the text::
+
+    index = PolicyIndex(policies, tree)
+    for statement in index.find(verb="manage", family="volume-family", compartment="Prod/DB"):
+        ...
+
+Compartment locations are resolved to absolute paths below the root (``""``
+is the tenancy itself, ``"Prod/DB"`` a compartment), following OCI rules: a
+path in a statement is relative to the compartment the policy is attached
+to. Resolution needs the compartment tree (``ocitools.compartments``); without
+it paths are taken relative to the root. Statements that do not follow the
+grammar (``Define`` statements, typos) are kept in ``PolicyIndex.unparsed``.
+"""
+
+import re
+from collections import defaultdict, namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+VERBS = ("inspect", "read", "use", "manage")
+SUBJECT_KINDS = ("group", "dynamic-group", "any-user", "any-group", "service", "resource")
+ALL_RESOURCES = "all-resources"
+
+# Individual resource types of the common families (a type can be in more than one)
+FAMILY_MEMBERS: Dict[str, Tuple[str, ...]] = {
+    "instance-family": ("instances", "instance-images", "instance-console-connection", "console-histories",
+                        "app-catalog-listing", "volume-attachments", "vnic-attachments"),
+    "compute-management-family": ("instance-configurations", "instance-pools", "cluster-networks"),
+    "volume-family": ("volumes", "volume-attachments", "volume-backups", "boot-volume-backups",
+                      "backup-policies", "backup-policy-assignments", "volume-groups", "volume-group-backups"),
+    "virtual-network-family": ("vcns", "subnets", "route-tables", "network-security-groups", "security-lists",
+                               "dhcp-options", "private-ips", "public-ips", "ipv6s", "internet-gateways",
+                               "nat-gateways", "service-gateways", "local-peering-gateways",
+                               "remote-peering-connections", "drgs", "drg-attachments", "cpes",
+                               "ipsec-connections", "cross-connects", "cross-connect-groups",
+                               "virtual-circuits", "vnics", "vnic-attachments", "vlans"),
+    "object-family": ("buckets", "objects", "objectstorage-namespaces"),
+    "file-family": ("file-systems", "mount-targets", "export-sets"),
+    "database-family": ("db-systems", "db-nodes", "db-homes", "databases", "db-backups", "pluggable-databases"),
+    "autonomous-database-family": ("autonomous-databases", "autonomous-backups",
+                                   "autonomous-container-databases", "autonomous-exadata-infrastructures"),
+    "cluster-family": ("clusters", "cluster-node-pools", "cluster-work-requests"),
+    "dns": ("dns-zones", "dns-records", "dns-traffic", "dns-steering-policies"),
+    "secret-family": ("vaults", "keys", "secrets", "secret-bundles"),
+}
+RESOURCE_FAMILIES: Dict[str, Tuple[str, ...]] = {}
+for _family, _members in FAMILY_MEMBERS.items():
+    for _member in _members:
+        RESOURCE_FAMILIES[_member] = RESOURCE_FAMILIES.get(_member, ()) + (_family,)
+
+STATEMENT_RE = re.compile(
+    r"^\s*(?P<action>allow|endorse|admit)\s+(?P<subjects>.+?)\s+to\s+"
+    r"(?:\{(?P<permissions>[^}]*)\}|(?P<verb>[\w-]+)\s+(?P<resource>[\w-]+))"
+    r"(?:\s+in\s+(?P<location>.+?))?"
+    r"(?:\s+where\s+(?P<conditions>.+?))?\s*$",
+    re.IGNORECASE | re.DOTALL)
+
+Subject = namedtuple("Subject", ["kind", "name"])
+
+PolicyStatement = namedtuple("PolicyStatement", [
+    "policy_name", "policy_compartment_id", "text", "action", "subjects", "verb", "permissions",
+    "resource", "families", "location", "compartment", "compartment_id", "conditions",
+])
+PolicyStatement.__doc__ = """One parsed statement.
+
+``verb``/``resource`` are lowercase (None for permission lists);
+``families`` are the families ``resource`` belongs to (the family itself for
+a family); ``location`` is ``tenancy`` or ``compartment``; ``compartment`` is
+the absolute path (``""`` for the tenancy); ``compartment_id`` is None when
+the compartment is not in the tree."""
+
+
+class PolicyParseError(ValueError):
+    """A statement does not follow the policy grammar."""
+
+
+def _unquote(name: str) -> str:
+    return name.replace("'", "").replace('"', "")
+
+
+def parse_subjects(text: str) -> Tuple[Subject, ...]:
+    """``group A, group id ocid1..., dynamic-group B`` -> subjects (names without quotes)."""
+    subjects = []
+    kind = None
+    for part in text.split(","):
+        tokens = part.split()
+        if not tokens:
+            continue
+        if tokens[0].lower() in SUBJECT_KINDS:
+            kind = tokens.pop(0).lower()
+        if kind is None:
+            raise PolicyParseError(f"unknown subject '{part.strip()}'")
+        if tokens and tokens[0].lower() == "id":
+            tokens.pop(0)
+        # Admit statements name the foreign tenancy: "group X of tenancy Acceptor"
+        if "of" in (token.lower() for token in tokens):
+            tokens = tokens[:[token.lower() for token in tokens].index("of")]
+        subjects.append(Subject(kind, _unquote(" ".join(tokens)) if tokens else None))
+    return tuple(subjects)
+
+
+def normalize_path(path: str) -> str:
+    """``Prod:DB`` / ``/Prod/DB/`` -> ``Prod/DB``."""
+    return "/".join(part for part in re.split(r"[:/]", path) if part)
+
+
+def join_path(base: str, relative: str) -> str:
+    return "/".join(part for part in (base, normalize_path(relative)) if part)
+
+
+def parse_statement(text: str, policy_name: str = None, policy_compartment_id: str = None,
+                    base_path: str = "") -> PolicyStatement:
+    """Parse one statement; ``base_path`` is the path of the compartment the policy is attached to."""
+    match = STATEMENT_RE.match(text)
+    if match is None:
+        raise PolicyParseError(f"not an allow/endorse/admit statement: {text[:100]}")
+    action = match.group("action").lower()
+    subjects = parse_subjects(match.group("subjects"))
+
+    verb = resource = None
+    permissions: Tuple[str, ...] = ()
+    families: Tuple[str, ...] = ()
+    if match.group("permissions") is not None:
+        permissions = tuple(p.strip().upper() for p in match.group("permissions").split(",") if p.strip())
+    else:
+        verb = match.group("verb").lower()
+        if verb not in VERBS:
+            raise PolicyParseError(f"unknown verb '{verb}': {text[:100]}")
+        resource = match.group("resource").lower()
+        if resource in FAMILY_MEMBERS or resource.endswith("-family"):
+            families = (resource,)
+        else:
+            families = RESOURCE_FAMILIES.get(resource, ())
+
+    location_text = match.group("location")
+    if location_text is None:
+        if action == "allow":
+            raise PolicyParseError(f"missing location: {text[:100]}")
+        location, compartment, compartment_id = "tenancy", "", None
+    else:
+        tokens = location_text.split()
+        location = tokens[0].lower()
+        compartment_id = None
+        if location == "tenancy":
+            compartment = ""
+        elif location == "compartment" and len(tokens) == 3 and tokens[1].lower() == "id":
+            compartment, compartment_id = None, tokens[2]
+        elif location == "compartment" and len(tokens) == 2:
+            compartment = join_path(base_path, _unquote(tokens[1]))
+        elif action == "endorse":
+            # "in any-tenancy" and other locations of the endorsed tenancy
+            compartment = None
+        else:
+            raise PolicyParseError(f"unknown location '{location_text}': {text[:100]}")
+
+    if action == "endorse":
+        # Endorse locations are in the other tenancy
+        compartment = compartment_id = None
+
+    conditions = match.group("conditions")
+    return PolicyStatement(policy_name, policy_compartment_id, text, action, subjects, verb, permissions,
+                           resource, families, location, compartment, compartment_id,
+                           conditions.strip() if conditions else None)
+
+
+class PolicyIndex:
+    """Every statement of a set of policies, parsed once and indexed for lookups."""
+
+    def __init__(self, policies: Iterable = (), tree=None):
+        self.tree = tree
+        self.statements: List[PolicyStatement] = []
+        self.unparsed: List[Tuple[str, str, str]] = []  # (policy name, statement, reason)
+        self.by_verb: Dict[str, List[int]] = defaultdict(list)
+        self.by_resource: Dict[str, List[int]] = defaultdict(list)
+        self.by_family: Dict[str, List[int]] = defaultdict(list)
+        self.by_permission: Dict[str, List[int]] = defaultdict(list)
+        self.by_subject: Dict[Tuple[str, Optional[str]], List[int]] = defaultdict(list)
+        self.by_compartment: Dict[str, List[int]] = defaultdict(list)
+        self._paths: Dict[str, str] = {}
+        self._ids: Optional[Dict[str, str]] = None
+        for policy in policies:
+            self.add_policy(policy)
+
+    # --- Compartment paths -------------------------------------------------
+
+    def path_of(self, compartment_id: str) -> Optional[str]:
+        """Absolute path of a compartment (``""`` for the root), None when it is not in the tree."""
+        if self.tree is None or compartment_id not in self.tree:
+            return None
+        path = self._paths.get(compartment_id)
+        if path is None:
+            path = self._paths[compartment_id] = self.tree.path_of(compartment_id).partition("/")[2]
+        return path
+
+    def id_of(self, path: str) -> Optional[str]:
+        """OCID of the compartment at an absolute path, None when unknown."""
+        if self.tree is None:
+            return None
+        if self._ids is None:
+            self._ids = {self.path_of(compartment_id): compartment_id
+                         for compartment_id in self.tree.walk(self.tree.tenancy_id)}
+        return self._ids.get(normalize_path(path))
+
+    # --- Building ------------------------------------------------------------
+
+    def add_policy(self, policy) -> None:
+        base_path = self.path_of(policy.compartment_id) or ""
+        for text in policy.statements or []:
+            self.add_statement(text, policy.name, policy.compartment_id, base_path)
+
+    def add_statement(self, text: str, policy_name: str = None, policy_compartment_id: str = None,
+                      base_path: str = "") -> Optional[PolicyStatement]:
+        try:
+            statement = parse_statement(text, policy_name, policy_compartment_id, base_path)
+        except PolicyParseError as e:
+            self.unparsed.append((policy_name, text, str(e)))
+            return None
+        if statement.compartment_id is not None:
+            statement = statement._replace(compartment=self.path_of(statement.compartment_id))
+        elif statement.compartment is not None:
+            statement = statement._replace(compartment_id=self.id_of(statement.compartment))
+
+        position = len(self.statements)
+        self.statements.append(statement)
+        if statement.verb:
+            self.by_verb[statement.verb].append(position)
+            self.by_resource[statement.resource].append(position)
+        for family in statement.families:
+            self.by_family[family].append(position)
+        for permission in statement.permissions:
+            self.by_permission[permission].append(position)
+        for subject in set(statement.subjects):
+            self.by_subject[(subject.kind, subject.name.lower() if subject.name else None)].append(position)
+        if statement.compartment is not None:
+            self.by_compartment[statement.compartment].append(position)
+        return statement
+
+    # --- Queries -------------------------------------------------------------
+
+    def find(self, verb: str = None, resource: str = None, family: str = None, permission: str = None,
+             subject: Tuple[str, Optional[str]] = None, compartment: str = None) -> List[PolicyStatement]:
+        """Statements matching every given key exactly, in policy order.
+
+        ``subject`` is ``(kind, name)``, e.g. ``("group", "NetAdmins")``;
+        ``compartment`` an absolute path (``""`` for statements ``in tenancy``).
+        """
+        lookups = []
+        if verb is not None:
+            lookups.append(self.by_verb.get(verb.lower(), []))
+        if resource is not None:
+            lookups.append(self.by_resource.get(resource.lower(), []))
+        if family is not None:
+            lookups.append(self.by_family.get(family.lower(), []))
+        if permission is not None:
+            lookups.append(self.by_permission.get(permission.upper(), []))
+        if subject is not None:
+            kind, name = subject
+            lookups.append(self.by_subject.get((kind.lower(), name.lower() if name else None), []))
+        if compartment is not None:
+            lookups.append(self.by_compartment.get(normalize_path(compartment), []))
+        if not lookups:
+            return list(self.statements)
+        lookups.sort(key=len)
+        positions = set(lookups[0])
+        for other in lookups[1:]:
+            positions.intersection_update(other)
+        return [self.statements[position] for position in sorted(positions)]
+
+    def __len__(self) -> int:
+        return len(self.statements)
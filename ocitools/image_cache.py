@@ -0,0 +1,92 @@
+"""
+Image metadata cache shared by every script that calls ``get_image``.
+
+Two layers: an in-memory dictionary for the current run and a JSON store on
+disk (see ``ocitools.disk_cache``) that keeps entries for ``ttl_seconds``.
+Deleted images are remembered as well (negative cache), so each distinct
+image costs at most one ``get_image`` call per TTL window.
+"""
+
+import atexit
+import threading
+from collections import namedtuple
+from typing import Dict
+
+import oci
+
+from ocitools.disk_cache import JsonDiskCache
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+ImageInfo = namedtuple("ImageInfo", ["id", "operating_system", "operating_system_version", "is_latest"])
+
+
+class ImageCache:
+    """Cached replacement for ``compute_client.get_image(image_id).data``."""
+
+    def __init__(self, compute_client, ttl_seconds: float = DEFAULT_TTL_SECONDS, persistent: bool = True):
+        self.compute_client = compute_client
+        self._memory: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._disk = JsonDiskCache("images", ttl_seconds) if persistent else None
+        self.api_calls = 0
+        if self._disk:
+            atexit.register(self._disk.save)
+
+    @staticmethod
+    def _to_result(entry: dict) -> ImageInfo:
+        if entry.get("missing"):
+            # Re-raise the original "not found" so callers keep their error handling
+            raise oci.exceptions.ServiceError(entry["status"], entry["code"], {}, entry["message"])
+        return ImageInfo(**entry)
+
+    def _lookup(self, image_id: str):
+        entry = self._memory.get(image_id)
+        if entry is None and self._disk:
+            entry = self._disk.get(image_id)
+            if entry is not None:
+                self._memory[image_id] = entry
+        return entry
+
+    def get(self, image_id: str) -> ImageInfo:
+        """Return image metadata; raises ``ServiceError`` for deleted images."""
+        with self._lock:
+            entry = self._lookup(image_id)
+            if entry is None:
+                key_lock = self._key_locks.setdefault(image_id, threading.Lock())
+        if entry is not None:
+            return self._to_result(entry)
+
+        with key_lock:
+            with self._lock:
+                entry = self._lookup(image_id)
+            if entry is None:
+                entry = self._fetch(image_id)
+        return self._to_result(entry)
+
+    def _fetch(self, image_id: str) -> dict:
+        with self._lock:
+            self.api_calls += 1
+        try:
+            image = self.compute_client.get_image(image_id).data
+            entry = {
+                "id": image_id,
+                "operating_system": image.operating_system,
+                "operating_system_version": image.operating_system_version,
+                "is_latest": getattr(image, "is_latest", None)
+            }
+        except oci.exceptions.ServiceError as e:
+            if e.status != 404:
+                raise
+            entry = {"missing": True, "status": e.status, "code": e.code, "message": e.message}
+        with self._lock:
+            self._memory[image_id] = entry
+        if self._disk:
+            self._disk.set(image_id, entry)
+        return entry
+
+    def save(self) -> None:
+        """Write new entries to disk now instead of waiting for interpreter exit."""
+        if self._disk:
+            self._disk.save()
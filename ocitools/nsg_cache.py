@@ -0,0 +1,87 @@
+"""
+Run-scoped cache of NSG security rules keyed by NSG OCID.
+
+Many instances share the same network security groups, so the rules of each
+NSG are downloaded once per run. The cache is filled on first use or
+prefetched per compartment and is safe to share between threads. An NSG that
+is gone or not visible (404/403) is remembered as such; other errors
+(throttling, server errors) are raised without being cached, so the next
+lookup tries again.
+"""
+
+import threading
+from typing import Dict, List
+
+import oci
+
+# Errors that will not change within a run
+CACHED_ERROR_STATUSES = (403, 404)
+
+
+class NsgRuleCache:
+    """Thread-safe cache of ``list_network_security_group_security_rules`` results."""
+
+    def __init__(self, virtual_network_client):
+        self.virtual_network_client = virtual_network_client
+        self._rules: Dict[str, List] = {}
+        self._errors: Dict[str, oci.exceptions.ServiceError] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, nsg_id: str):
+        """Return the cached rules (or raise the cached error); None on a miss."""
+        if nsg_id in self._rules:
+            self.hits += 1
+            return self._rules[nsg_id]
+        if nsg_id in self._errors:
+            self.hits += 1
+            raise self._errors[nsg_id]
+        return None
+
+    def get_rules(self, nsg_id: str) -> List:
+        """Return the security rules of an NSG, fetching them on first use."""
+        with self._lock:
+            rules = self._cached(nsg_id)
+            if rules is not None:
+                return rules
+            key_lock = self._key_locks.setdefault(nsg_id, threading.Lock())
+
+        # Only one thread downloads a given NSG; the others wait and reuse it
+        with key_lock:
+            with self._lock:
+                rules = self._cached(nsg_id)
+                if rules is not None:
+                    return rules
+            try:
+                rules = oci.pagination.list_call_get_all_results(
+                    self.virtual_network_client.list_network_security_group_security_rules,
+                    network_security_group_id=nsg_id
+                ).data
+            except oci.exceptions.ServiceError as e:
+                with self._lock:
+                    self.misses += 1
+                    if e.status in CACHED_ERROR_STATUSES:
+                        self._errors[nsg_id] = e
+                raise
+            with self._lock:
+                self.misses += 1
+                self._rules[nsg_id] = rules
+            return rules
+
+    def prefetch(self, compartment_id: str) -> int:
+        """Load the rules of every NSG in a compartment; returns the NSG count."""
+        nsgs = oci.pagination.list_call_get_all_results(
+            self.virtual_network_client.list_network_security_groups,
+            compartment_id=compartment_id
+        ).data
+        for nsg in nsgs:
+            try:
+                self.get_rules(nsg.id)
+            except oci.exceptions.ServiceError:
+                pass
+        return len(nsgs)
+
+    def summary(self) -> str:
+        return f"NSG rule cache: {self.misses} NSGs downloaded, {self.hits} lookups served from cache."
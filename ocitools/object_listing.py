@@ -0,0 +1,271 @@
+"""
+Streaming Object Storage listing and per-bucket content summaries.
+
+``list_call_get_all_results(list_objects, ...)`` materialises every object of
+a bucket before returning. ``iter_objects`` walks the ``list_objects`` pages
+instead (following ``next_start_with``, with the next page prefetched by
+``ocitools.paging``) and asks only for the fields the summaries need, so a
+bucket is aggregated in memory proportional to its number of top-level
+prefixes, not its number of objects.
+
+``ShardedObjectLister`` splits very large buckets by top-level prefix
+(``delimiter='/'``) and pages through the prefixes in parallel on a bounded
+pool; shard results are merged in prefix order, so the outcome does not depend
+on which shard finishes first. Listed objects are streamed: every name under
+one top-level prefix sorts before every name under the next, so the shards
+are read one after the other while the next ``workers`` prefixes are listed
+ahead, each at most ``PREFETCH_PAGES`` pages ahead of the reader.
+"""
+
+import heapq
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ocitools.paging import iter_pages
+
+SUMMARY_FIELDS = "name,size,timeCreated"
+MAX_PAGE_SIZE = 1000
+DEFAULT_SHARD_WORKERS = 4
+# Pages a prefix listed ahead may hold before waiting for the reader
+PREFETCH_PAGES = 2
+
+_DONE = object()
+
+
+def iter_object_pages(object_storage_client, namespace: str, bucket_name: str,
+                      fields: str = SUMMARY_FIELDS, **kwargs) -> Iterator:
+    """Yield the ``ListObjects`` pages of a bucket one at a time, the next one prefetched.
+
+    Extra keyword arguments (``prefix``, ``start``, ``end``, ``delimiter``)
+    are passed through to ``list_objects``.
+    """
+    for response in iter_pages(object_storage_client.list_objects, namespace_name=namespace,
+                               bucket_name=bucket_name, fields=fields, limit=MAX_PAGE_SIZE, **kwargs):
+        yield response.data
+
+
+def iter_objects(object_storage_client, namespace: str, bucket_name: str,
+                 fields: str = SUMMARY_FIELDS, **kwargs) -> Iterator:
+    """Yield every ``ObjectSummary`` of a bucket without holding the whole listing."""
+    for page in iter_object_pages(object_storage_client, namespace, bucket_name, fields, **kwargs):
+        yield from page.objects
+
+
+def top_level_prefix(object_name: str) -> str:
+    """``"logs/2024/a.gz"`` -> ``"logs/"``; objects at the bucket root map to ``""``."""
+    head, sep, _ = object_name.partition("/")
+    return head + sep if sep else ""
+
+
+class ObjectStats:
+    """Object count, total bytes and newest/oldest creation time of a set of objects."""
+
+    __slots__ = ("count", "bytes", "newest", "oldest")
+
+    def __init__(self):
+        self.count = 0
+        self.bytes = 0
+        self.newest = None
+        self.oldest = None
+
+    def add(self, obj) -> None:
+        self.count += 1
+        self.bytes += obj.size or 0
+        created = obj.time_created
+        if created is not None:
+            if self.newest is None or created > self.newest:
+                self.newest = created
+            if self.oldest is None or created < self.oldest:
+                self.oldest = created
+
+    def merge(self, other: "ObjectStats") -> None:
+        self.count += other.count
+        self.bytes += other.bytes
+        for created in (other.newest, other.oldest):
+            if created is None:
+                continue
+            if self.newest is None or created > self.newest:
+                self.newest = created
+            if self.oldest is None or created < self.oldest:
+                self.oldest = created
+
+    def as_dict(self) -> Dict:
+        return {
+            "object_count": self.count,
+            "total_bytes": self.bytes,
+            "newest": self.newest.isoformat() if self.newest else None,
+            "oldest": self.oldest.isoformat() if self.oldest else None,
+        }
+
+
+class BucketSummary:
+    """Totals for a bucket and for each of its top-level prefixes."""
+
+    def __init__(self, bucket_name: str):
+        self.bucket_name = bucket_name
+        self.total = ObjectStats()
+        self.prefixes: Dict[str, ObjectStats] = {}
+
+    def add(self, obj) -> None:
+        self.total.add(obj)
+        prefix = top_level_prefix(obj.name)
+        stats = self.prefixes.get(prefix)
+        if stats is None:
+            stats = self.prefixes[prefix] = ObjectStats()
+        stats.add(obj)
+
+    def rows(self) -> List[Dict]:
+        """One row for the whole bucket followed by one row per prefix, sorted by prefix."""
+        rows = [dict(bucket_name=self.bucket_name, scope="bucket", prefix="", **self.total.as_dict())]
+        for prefix in sorted(self.prefixes):
+            rows.append(dict(bucket_name=self.bucket_name, scope="prefix", prefix=prefix,
+                             **self.prefixes[prefix].as_dict()))
+        return rows
+
+
+def summarize_bucket(object_storage_client, namespace: str, bucket_name: str,
+                     summary: Optional[BucketSummary] = None, **kwargs) -> BucketSummary:
+    """Stream a bucket's listing into a ``BucketSummary`` (created if not given)."""
+    summary = summary or BucketSummary(bucket_name)
+    for obj in iter_objects(object_storage_client, namespace, bucket_name, **kwargs):
+        summary.add(obj)
+    return summary
+
+
+class ShardedObjectLister:
+    """Lists buckets one top-level prefix per task.
+
+    A single pool of ``workers`` threads is shared by every bucket listed
+    through the lister, so the number of concurrent ``list_objects`` cursors
+    stays bounded however many buckets are being discovered at once.
+    ``workers=1`` lists each shard inline. The pool is started on first use
+    and stopped by ``shutdown`` (or leaving a ``with`` block).
+    """
+
+    def __init__(self, object_storage_client, namespace: str, workers: int = DEFAULT_SHARD_WORKERS):
+        self.object_storage_client = object_storage_client
+        self.namespace = namespace
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def __enter__(self) -> "ShardedObjectLister":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def _pool(self) -> Optional[ThreadPoolExecutor]:
+        if self.workers <= 1:
+            return None
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="oci-shard")
+            return self._executor
+
+    def _shards(self, bucket_name: str, fields: str) -> Tuple[List, List[str]]:
+        """Objects stored at the bucket root and the sorted top-level prefixes."""
+        root_objects = []
+        prefixes = set()
+        for page in iter_object_pages(self.object_storage_client, self.namespace, bucket_name,
+                                      fields, delimiter="/"):
+            root_objects.extend(page.objects)
+            prefixes.update(page.prefixes or [])
+        return root_objects, sorted(prefixes)
+
+    def _map(self, fn, prefixes: List[str]) -> List:
+        """Run ``fn(prefix)`` for every prefix; results come back in prefix order."""
+        executor = self._pool()
+        if executor is None:
+            return [fn(prefix) for prefix in prefixes]
+        return [future.result() for future in [executor.submit(fn, prefix) for prefix in prefixes]]
+
+    def summarize(self, bucket_name: str) -> BucketSummary:
+        """Same result as ``summarize_bucket``, with the prefixes listed concurrently."""
+        root_objects, prefixes = self._shards(bucket_name, SUMMARY_FIELDS)
+
+        def prefix_stats(prefix):
+            stats = ObjectStats()
+            for obj in iter_objects(self.object_storage_client, self.namespace, bucket_name, prefix=prefix):
+                stats.add(obj)
+            return stats
+
+        summary = BucketSummary(bucket_name)
+        for obj in root_objects:
+            summary.add(obj)
+        for prefix, stats in zip(prefixes, self._map(prefix_stats, prefixes)):
+            if stats.count:
+                summary.prefixes[prefix] = stats
+                summary.total.merge(stats)
+        return summary
+
+    @staticmethod
+    def _offer(pages: queue.Queue, item, stop: threading.Event) -> bool:
+        """Put ``item`` in the bounded queue, waiting for room unless the reader went away."""
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fill(self, bucket_name: str, fields: str, prefix: str, pages: queue.Queue, stop: threading.Event) -> None:
+        try:
+            for page in iter_object_pages(self.object_storage_client, self.namespace, bucket_name,
+                                          fields, prefix=prefix):
+                if not self._offer(pages, page.objects, stop):
+                    return
+        except Exception as e:
+            self._offer(pages, e, stop)
+            return
+        self._offer(pages, _DONE, stop)
+
+    def _prefix_objects(self, bucket_name: str, fields: str, prefixes: List[str]) -> Iterator:
+        """The objects of every prefix, prefix after prefix, with the next prefixes listed ahead."""
+        executor = self._pool()
+        if executor is None:
+            for prefix in prefixes:
+                yield from iter_objects(self.object_storage_client, self.namespace, bucket_name, fields, prefix=prefix)
+            return
+        stop = threading.Event()
+        pending = iter(prefixes)
+        window = deque()
+
+        def start_next():
+            prefix = next(pending, None)
+            if prefix is not None:
+                pages = queue.Queue(PREFETCH_PAGES)
+                executor.submit(self._fill, bucket_name, fields, prefix, pages, stop)
+                window.append(pages)
+
+        try:
+            for _ in range(self.workers):
+                start_next()
+            while window:
+                pages = window[0]
+                for item in iter(pages.get, _DONE):
+                    if isinstance(item, Exception):
+                        raise item
+                    yield from item
+                window.popleft()
+                start_next()
+        finally:
+            # Listing finished or abandoned: let the prefixes listed ahead stop
+            stop.set()
+
+    def list_objects(self, bucket_name: str, fields: str = "name") -> Iterator:
+        """Every object of the bucket in name order, as a single cursor would return them."""
+        root_objects, prefixes = self._shards(bucket_name, fields)
+        # Root objects interleave with the prefixes ("data.txt" < "data/"), so merge by name
+        return heapq.merge(root_objects, self._prefix_objects(bucket_name, fields, prefixes),
+                           key=lambda obj: obj.name)
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,213 @@
+"""
+Adaptive client-side rate limiting shared by every script.
+
+One token bucket per (region, service) paces the calls of every client created
+with ``create_client(..., rate_limit=True)``. The bucket rate follows AIMD:
+each success adds about ``INCREASE_PER_SECOND`` requests/s per second of
+traffic, each 429 (or 503) halves it - at most once per ``COOLDOWN_SECONDS``,
+so a burst of concurrent 429s counts as one congestion signal - and pauses the
+bucket for ``Retry-After`` when the service sends it. Throughput therefore
+settles just under the service limit instead of alternating between bursts
+and long sleeps, and threads that share a service share its budget.
+
+Rate-limited clients are created without the SDK retry strategy; throttled
+and transient failures are retried here (``MAX_ATTEMPTS`` in total) so that
+every attempt goes through the bucket. Without the SDK strategy the SDK no
+longer adds ``opc_retry_token``, so the limiter does: operations that accept
+one get a single token per logical call, reused by every attempt, and the
+service deduplicates them. Other operations are retried on 5xx and read
+timeouts only when they are idempotent (``get_``, ``list_``, ``update_``,
+``delete_``...); a ``create_`` without a token is only retried on 429, which
+the service never processed. A ``delete_`` answering 404 after an ambiguous
+attempt succeeded on that attempt and counts as success.
+``OCITOOLS_RATE_LIMIT`` sets the starting rate in requests per second.
+"""
+
+import email.utils
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+import oci
+
+from ocitools import replay
+
+DEFAULT_RATE = 10.0
+MIN_RATE = 0.2
+MAX_RATE = 100.0
+INCREASE_PER_SECOND = 1.0
+DECREASE_FACTOR = 0.5
+COOLDOWN_SECONDS = 1.0
+MAX_ATTEMPTS = 8
+
+# Statuses that mean "slow down" (shrink the rate) and those that are only retried
+THROTTLE_STATUSES = (429, 503)
+TRANSIENT_STATUSES = (500, 502, 504)
+
+# Operations that can be repeated without changing the outcome
+IDEMPOTENT_PREFIXES = ("get_", "list_", "head_", "summarize_", "update_", "delete_")
+
+
+def retry_after_seconds(headers) -> Optional[float]:
+    """``Retry-After`` in seconds (delta-seconds or HTTP date), or None."""
+    value = (headers or {}).get("retry-after") or (headers or {}).get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        moment = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose rate grows additively on success and shrinks multiplicatively on throttling."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, min_rate: float = MIN_RATE, max_rate: float = MAX_RATE):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = 1.0
+        self.successes = 0
+        self.throttles = 0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        # Burst capacity of one second at the current rate
+        self.tokens = min(max(1.0, self.rate), self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Block until the bucket allows one more request."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self.successes += 1
+            self.rate = min(self.max_rate, self.rate + INCREASE_PER_SECOND / self.rate)
+
+    def throttled(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.throttles += 1
+            if now - self._last_decrease >= COOLDOWN_SECONDS:
+                self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+                self._last_decrease = now
+            self.tokens = 0.0
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            self._paused_until = max(self._paused_until, now + pause)
+
+    def backoff(self, seconds: float) -> None:
+        """Pause the bucket without changing its rate (transient server errors)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def call(self, operation, *args, **kwargs):
+        """Run ``operation`` through the bucket, retrying throttled and transient failures."""
+        return self.attempt(operation, args, kwargs)
+
+    def attempt(self, operation, args, kwargs, retry_safe: bool = True, delete: bool = False):
+        """``call`` with the retry policy of the operation.
+
+        ``retry_safe=False`` retries only 429 and connect timeouts (the request
+        never reached the service); ``delete=True`` turns a 404 that follows an
+        ambiguous failure into success.
+        """
+        ambiguous = False
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            self.acquire()
+            try:
+                response = operation(*args, **kwargs)
+            except oci.exceptions.ServiceError as e:
+                if delete and ambiguous and e.status == 404:
+                    # An earlier attempt whose answer was lost already deleted it
+                    self.succeeded()
+                    return oci.response.Response(e.status, e.headers, None, None)
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                if e.status == 429 or (retry_safe and e.status in THROTTLE_STATUSES):
+                    self.throttled(retry_after_seconds(e.headers))
+                elif retry_safe and e.status in TRANSIENT_STATUSES:
+                    ambiguous = True
+                    self.backoff(min(2 ** attempt, 30))
+                else:
+                    raise
+                continue
+            except oci.exceptions.ConnectTimeout:
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                self.backoff(min(2 ** attempt, 30))
+                continue
+            except oci.exceptions.RequestException:
+                if attempt == MAX_ATTEMPTS or not retry_safe:
+                    raise
+                ambiguous = True
+                self.backoff(min(2 ** attempt, 30))
+                continue
+            self.succeeded()
+            return response
+
+
+_limiters: Dict[Tuple[Optional[str], str], AdaptiveRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(region: Optional[str], service: str) -> AdaptiveRateLimiter:
+    """The process-wide limiter of one (region, service)."""
+    key = (region, service)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = AdaptiveRateLimiter(float(os.environ.get("OCITOOLS_RATE_LIMIT", DEFAULT_RATE)))
+        return limiter
+
+
+def accepts_retry_token(method) -> bool:
+    """Whether an SDK operation takes ``opc_retry_token`` (documented on every one that does)."""
+    return ":param str opc_retry_token:" in (method.__doc__ or "")
+
+
+def _wrap_operation(limiter: AdaptiveRateLimiter, method, name: str, takes_token: bool):
+    retry_safe = takes_token or name.startswith(IDEMPOTENT_PREFIXES)
+    delete = name.startswith("delete_")
+
+    def operation(*args, **kwargs):
+        if takes_token and kwargs.get("opc_retry_token") is None:
+            # One token per logical call, so the service deduplicates the retries
+            kwargs["opc_retry_token"] = uuid.uuid4().hex
+        return limiter.attempt(method, args, kwargs, retry_safe=retry_safe, delete=delete)
+    operation.__name__ = method.__name__
+    operation.__doc__ = method.__doc__
+    return operation
+
+
+def instrument(client, client_class, region: Optional[str]):
+    """Route every operation of ``client`` through the limiter of its region and service."""
+    limiter = get_limiter(region, replay.service_of(client_class))
+    for name in replay.operation_names(client_class):
+        takes_token = accepts_retry_token(getattr(client_class, name))
+        setattr(client, name, _wrap_operation(limiter, getattr(client, name), name, takes_token))
+    return client
@@ -0,0 +1,108 @@
+"""
+Concurrent fan-out of a per-region collection over the subscribed regions.
+
+Multi-region scripts used to walk ``list_region_subscriptions`` one region at
+a time, switching ``config['region']`` and reloading the compartments in each
+iteration. ``RegionFanout`` lists the regions and loads the compartment tree
+once, hands out clients bound to one region (the caller's config is never
+modified) and runs one task per region on a thread pool::
+
+    fanout = RegionFanout(config)
+    compartments = fanout.compartments(include_root=True)
+
+    def processar_regiao(region):
+        compute_client = fanout.client(oci.core.ComputeClient, region)
+        return [...]
+
+    rows = fanout.rows(processar_regiao)
+
+Results come back in subscription order whatever order the regions finish
+in, so the output is the same as a serial run while the wall time approaches
+that of the slowest region. ``OCITOOLS_REGION_WORKERS`` (default
+``DEFAULT_WORKERS``) sets how many regions run at the same time; 1 runs them
+one after another.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import oci
+
+from ocitools.clients import create_client
+from ocitools.compartments import CompartmentTree
+
+DEFAULT_WORKERS = 4
+
+
+class RegionFanout:
+    """Region-scoped clients, tenancy-wide identity data and a pool that runs one task per region."""
+
+    def __init__(self, config: Dict, workers: Optional[int] = None, regions: Optional[List[str]] = None):
+        self.config = dict(config)
+        self.tenancy_id = config["tenancy"]
+        if workers is None:
+            workers = int(os.environ.get("OCITOOLS_REGION_WORKERS", DEFAULT_WORKERS))
+        self.workers = max(1, workers)
+        self._clients: Dict[Tuple[type, str], object] = {}
+        self._lock = threading.Lock()
+        self._tree: Optional[CompartmentTree] = None
+        # Identity is global: the home-region client serves regions and compartments
+        self.identity_client = self.client(oci.identity.IdentityClient, config.get("region"))
+        if regions is None:
+            logging.info("Buscando regiões ativas na tenancy...")
+            regions = [r.region_name for r in self.identity_client.list_region_subscriptions(self.tenancy_id).data]
+            logging.info(f"Regiões encontradas: {', '.join(regions)}")
+        self.regions = list(regions)
+
+    def region_config(self, region: str) -> Dict:
+        """A copy of the config pointing at ``region``."""
+        return dict(self.config, region=region)
+
+    def client(self, client_class, region: str, **kwargs):
+        """The client of ``client_class`` for ``region``, created once per (class, region)."""
+        key = (client_class, region)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = create_client(client_class, self.region_config(region), **kwargs)
+            return client
+
+    @property
+    def compartment_tree(self) -> CompartmentTree:
+        with self._lock:
+            if self._tree is None:
+                self._tree = CompartmentTree.load(self.identity_client, self.tenancy_id)
+            return self._tree
+
+    def compartments(self, include_root: bool = True, lifecycle_state: Optional[str] = None) -> List:
+        """The tenancy's compartments, loaded once for every region."""
+        return self.compartment_tree.compartments(include_root=include_root, lifecycle_state=lifecycle_state)
+
+    def map(self, fn: Callable[[str], object]) -> Iterator[Tuple[str, object]]:
+        """``(region, fn(region))`` in subscription order, the regions running ``workers`` at a time.
+
+        Each result is yielded as soon as it and every region before it are
+        done. An exception raised by ``fn`` is re-raised when its region's
+        turn comes and the regions not yet started are cancelled.
+        """
+        if self.workers == 1 or len(self.regions) <= 1:
+            for region in self.regions:
+                yield region, fn(region)
+            return
+        executor = ThreadPoolExecutor(max_workers=min(self.workers, len(self.regions)), thread_name_prefix="oci-region")
+        futures = [(region, executor.submit(fn, region)) for region in self.regions]
+        try:
+            for region, future in futures:
+                yield region, future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def rows(self, fn: Callable[[str], List]) -> List:
+        """The lists returned by ``fn`` for every region, concatenated in subscription order."""
+        rows = []
+        for _, region_rows in self.map(fn):
+            rows.extend(region_rows)
+        return rows
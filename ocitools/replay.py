@@ -0,0 +1,342 @@
+"""
+Record/replay backend for running the scripts without a tenancy.
+
+``OCITOOLS_MODE`` selects what ``ocitools.clients`` hands out:
+
+- ``live`` (default): the OCI SDK clients.
+- ``record``: SDK clients whose operations are also written to the cassette
+  (``OCITOOLS_CASSETTE``, default ``oci_cassette.json.gz``) at exit:
+  arguments, status, headers (``opc-next-page`` included), data, errors such
+  as 429s with their ``retry-after`` header, the statuses of attempts the SDK
+  retried, and how long each call took.
+- ``replay``: ``ReplayClient`` stand-ins that answer from the cassette with
+  no network access; ``load_config`` returns the (secret-free) config that
+  was recorded. ``OCITOOLS_REPLAY_LATENCY`` injects latency per call: a
+  number of milliseconds, or ``recorded`` to sleep as long as the recorded
+  call took.
+
+Replayed calls are matched on (region, service, operation, arguments).
+Calls whose arguments changed since recording (timestamps in names, for
+example) fall back to the next unused interaction of the same operation; a
+call made more often than recorded gets the last matching response again.
+Models are stored as their ``swagger_types`` attributes and rebuilt as the
+same SDK model classes.
+
+A synthetic tenancy spec (``ocitools.synthetic``) can stand in for a cassette:
+replaying it generates the tenancy's resources instead of looking them up.
+"""
+
+import atexit
+import base64
+import importlib
+import json
+import os
+import threading
+import time
+import types
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import oci
+
+from ocitools import synthetic
+from ocitools.resource_stream import open_stream
+
+CASSETTE_VERSION = 1
+DEFAULT_CASSETTE = "oci_cassette.json.gz"
+MODES = ("live", "record", "replay")
+
+# Config keys that are safe to store in a cassette (no key material or paths)
+CONFIG_KEYS = ("tenancy", "region", "user")
+
+# Keyword arguments that do not change what the service returns
+IGNORED_KWARGS = ("retry_strategy", "opc_request_id", "opc_retry_token", "allow_control_chars")
+
+
+class CassetteMiss(LookupError):
+    """Replay was asked for a call that the cassette does not contain."""
+
+
+def backend_mode() -> str:
+    mode = os.environ.get("OCITOOLS_MODE", "live").lower()
+    if mode not in MODES:
+        raise ValueError(f"OCITOOLS_MODE must be one of {', '.join(MODES)}, not '{mode}'.")
+    return mode
+
+
+def cassette_path() -> str:
+    return os.environ.get("OCITOOLS_CASSETTE", DEFAULT_CASSETTE)
+
+
+# --- Serialisation -------------------------------------------------------
+
+def encode(value):
+    """JSON-compatible form of SDK responses and arguments."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, datetime):
+        return {"__type__": "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {"__type__": "date", "value": value.isoformat()}
+    if isinstance(value, (list, tuple)):
+        return [encode(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): encode(item) for key, item in value.items()}
+    if isinstance(value, bytes):
+        return {"__type__": "bytes", "value": base64.b64encode(value).decode("ascii")}
+    if hasattr(value, "swagger_types"):
+        cls = type(value)
+        return {"__type__": "model", "class": f"{cls.__module__}.{cls.__name__}",
+                "fields": {attr: encode(getattr(value, attr)) for attr in value.swagger_types}}
+    return {"__type__": "unsupported", "class": type(value).__name__}
+
+
+def decode(value):
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    kind = value.get("__type__")
+    if kind is None:
+        return {key: decode(item) for key, item in value.items()}
+    if kind == "datetime":
+        return datetime.fromisoformat(value["value"])
+    if kind == "date":
+        return date.fromisoformat(value["value"])
+    if kind == "bytes":
+        return base64.b64decode(value["value"])
+    if kind == "model":
+        module_name, class_name = value["class"].rsplit(".", 1)
+        model = getattr(importlib.import_module(module_name), class_name)()
+        for attr, item in value["fields"].items():
+            setattr(model, attr, decode(item))
+        return model
+    return None
+
+
+def request_key(region: Optional[str], service: str, operation: str, args, kwargs) -> str:
+    kwargs = {key: item for key, item in kwargs.items() if key not in IGNORED_KWARGS}
+    return json.dumps([region, service, operation, encode(list(args)), encode(kwargs)], sort_keys=True)
+
+
+def _headers(headers) -> Dict[str, str]:
+    return {str(key): str(item) for key, item in dict(headers or {}).items()}
+
+
+def _case_insensitive(headers: Dict[str, str]):
+    # Same header type as live SDK responses (the SDK vendors requests)
+    try:
+        from oci._vendor.requests.structures import CaseInsensitiveDict
+    except ImportError:
+        try:
+            from requests.structures import CaseInsensitiveDict
+        except ImportError:
+            return headers
+    return CaseInsensitiveDict(headers)
+
+
+def operation_names(client_class) -> List[str]:
+    """Public operations of an SDK client class."""
+    return [name for name in dir(client_class)
+            if not name.startswith("_") and isinstance(getattr(client_class, name, None), types.FunctionType)]
+
+
+def service_of(client_class) -> str:
+    name = client_class.__name__
+    return (name[:-len("Client")] if name.endswith("Client") else name).lower()
+
+
+# --- Recording -----------------------------------------------------------
+
+class Recorder:
+    """Collects the interactions of every recorded client and saves them at exit."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.config: Dict = {}
+        self.interactions: List[Dict] = []
+        self._lock = threading.Lock()
+        self._attempts = threading.local()
+
+    def remember_config(self, config: Dict) -> None:
+        with self._lock:
+            if not self.config:
+                self.config = {key: config[key] for key in CONFIG_KEYS if key in config}
+
+    def instrument(self, client, client_class, region: Optional[str]):
+        service = service_of(client_class)
+        base_client = getattr(client, "base_client", None)
+        if base_client is not None and hasattr(base_client, "call_api"):
+            self._hook_call_api(base_client)
+        for name in operation_names(client_class):
+            setattr(client, name, self._wrap(getattr(client, name), region, service, name))
+        return client
+
+    def _hook_call_api(self, base_client) -> None:
+        # Statuses of HTTP attempts that the SDK retry strategy retried
+        call_api = base_client.call_api
+        attempts = self._attempts
+
+        def hooked_call_api(*args, **kwargs):
+            try:
+                return call_api(*args, **kwargs)
+            except oci.exceptions.ServiceError as e:
+                if getattr(attempts, "statuses", None) is not None:
+                    attempts.statuses.append({"status": e.status, "headers": _headers(e.headers)})
+                raise
+
+        base_client.call_api = hooked_call_api
+
+    def _wrap(self, method, region, service, operation):
+        recorder = self
+
+        def recorded(*args, **kwargs):
+            recorder._attempts.statuses = []
+            interaction = {"key": request_key(region, service, operation, args, kwargs),
+                           "region": region, "service": service, "operation": operation}
+            start = time.perf_counter()
+            try:
+                response = method(*args, **kwargs)
+            except oci.exceptions.ServiceError as e:
+                interaction["error"] = {"status": e.status, "code": e.code, "headers": _headers(e.headers),
+                                        "message": e.message}
+                raise
+            else:
+                interaction["status"] = getattr(response, "status", None)
+                interaction["headers"] = _headers(getattr(response, "headers", None))
+                interaction["data"] = encode(getattr(response, "data", None))
+                return response
+            finally:
+                interaction["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                # A ServiceError raised by the final attempt is the error itself, not a retry
+                retried = recorder._attempts.statuses
+                if "error" in interaction and retried:
+                    retried = retried[:-1]
+                interaction["retried"] = retried
+                recorder._attempts.statuses = None
+                with recorder._lock:
+                    recorder.interactions.append(interaction)
+        recorded.__name__ = method.__name__
+        recorded.__doc__ = method.__doc__
+        return recorded
+
+    def save(self) -> None:
+        with self._lock:
+            document = {"version": CASSETTE_VERSION, "recorded_at": datetime.now().isoformat(),
+                        "config": self.config, "interactions": self.interactions}
+        with open_stream(self.path, "w") as file:
+            json.dump(document, file)
+
+
+# --- Replay --------------------------------------------------------------
+
+class Cassette:
+    """Recorded interactions indexed for replay."""
+
+    def __init__(self, document: Dict, latency: str = "0"):
+        if document.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version {document.get('version')!r}.")
+        self.config = document.get("config", {})
+        self.interactions = document["interactions"]
+        self.latency = latency
+        self.calls = 0
+        self.misses = 0
+        self._by_key: Dict[str, List[int]] = OrderedDict()
+        self._by_operation: Dict[tuple, List[int]] = OrderedDict()
+        for index, interaction in enumerate(self.interactions):
+            self._by_key.setdefault(interaction["key"], []).append(index)
+            operation = (interaction["region"], interaction["service"], interaction["operation"])
+            self._by_operation.setdefault(operation, []).append(index)
+        self._used = set()
+        self._last: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, latency: str = "0"):
+        """The cassette at ``path``, or a ``SyntheticTenancy`` when it holds a synthetic tenancy spec."""
+        with open_stream(path, "r") as file:
+            document = json.load(file)
+        if synthetic.is_spec(document):
+            return synthetic.SyntheticTenancy(document, latency)
+        return cls(document, latency)
+
+    def _next(self, key: str, operation: tuple) -> int:
+        with self._lock:
+            self.calls += 1
+            for index in self._by_key.get(key, ()):
+                if index not in self._used:
+                    break
+            else:
+                index = self._last.get(key)
+                if index is None:
+                    self.misses += 1
+                    index = next((i for i in self._by_operation.get(operation, ()) if i not in self._used), None)
+                if index is None:
+                    raise CassetteMiss(f"No recorded response for {operation[1]}.{operation[2]} "
+                                       f"in region {operation[0]}: {key}")
+            self._used.add(index)
+            self._last[key] = index
+            return index
+
+    def _sleep(self, interaction: Dict) -> None:
+        if self.latency == "recorded":
+            delay_ms = interaction.get("elapsed_ms", 0)
+        else:
+            delay_ms = float(self.latency or 0)
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+
+    def respond(self, region, service: str, operation: str, args, kwargs):
+        interaction = self.interactions[self._next(request_key(region, service, operation, args, kwargs),
+                                                   (region, service, operation))]
+        self._sleep(interaction)
+        if "error" in interaction:
+            error = interaction["error"]
+            raise oci.exceptions.ServiceError(error["status"], error["code"], _case_insensitive(error["headers"]),
+                                              error["message"])
+        return oci.response.Response(interaction["status"], _case_insensitive(interaction["headers"]),
+                                     decode(interaction["data"]), None)
+
+    def summary(self) -> str:
+        return (f"Replayed {self.calls} OCI calls from the cassette "
+                f"({self.misses} matched by operation order instead of arguments).")
+
+
+class ReplayClient:
+    """Stand-in for an SDK client that answers every operation from a cassette."""
+
+    def __init__(self, cassette: Cassette, client_class, config: Dict):
+        self.client_class = client_class
+        self.region = config.get("region")
+        service = service_of(client_class)
+        for name in operation_names(client_class):
+            setattr(self, name, types.MethodType(self._operation(cassette, service, name), self))
+
+    def _operation(self, cassette: Cassette, service: str, name: str):
+        def operation(client, *args, **kwargs):
+            return cassette.respond(client.region, service, name, args, kwargs)
+        operation.__name__ = name
+        return operation
+
+
+_recorder: Optional[Recorder] = None
+_cassette: Optional[Cassette] = None
+_state_lock = threading.Lock()
+
+
+def get_recorder() -> Recorder:
+    global _recorder
+    with _state_lock:
+        if _recorder is None:
+            _recorder = Recorder(cassette_path())
+            atexit.register(_recorder.save)
+        return _recorder
+
+
+def get_cassette() -> Cassette:
+    global _cassette
+    with _state_lock:
+        if _cassette is None:
+            _cassette = Cassette.load(cassette_path(), os.environ.get("OCITOOLS_REPLAY_LATENCY", "0"))
+        return _cassette
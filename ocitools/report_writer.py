@@ -0,0 +1,109 @@
+"""
+Streaming Excel report writer.
+
+Built on openpyxl's write-only mode: rows are serialised to disk as they are
+appended, so memory stays flat whatever the row count. Because written rows
+cannot be revisited, styles are decided at append time (header font, severity
+fills) and charts are built from counts the caller has already computed.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.chart import BarChart, PieChart, Reference
+from openpyxl.styles import Font, PatternFill
+
+HEADER_FONT = Font(bold=True)
+SEVERITY_FONT = Font(bold=True)
+SEVERITY_FILLS = {
+    "High": PatternFill(start_color="FFCCCB", end_color="FFCCCB", fill_type="solid"),
+    "Medium": PatternFill(start_color="FFE4B5", end_color="FFE4B5", fill_type="solid"),
+    "Low": PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid"),
+}
+
+
+def _cell_value(value):
+    # Lists (e.g. Cloud Guard labels) cannot be stored in a cell
+    if isinstance(value, (list, tuple, set)):
+        return ", ".join(str(item) for item in value)
+    if isinstance(value, dict):
+        return ", ".join(f"{key}={item}" for key, item in value.items())
+    return value
+
+
+class SheetWriter:
+    """Appends rows to one write-only worksheet."""
+
+    def __init__(self, worksheet, severity_columns: Sequence[int] = (), severity_fills: Dict = None):
+        self.worksheet = worksheet
+        self.severity_columns = set(severity_columns)
+        self.severity_fills = SEVERITY_FILLS if severity_fills is None else severity_fills
+        self.rows = 0
+
+    @property
+    def title(self) -> str:
+        return self.worksheet.title
+
+    def header(self, values: Iterable) -> None:
+        self.worksheet.append([self._styled(value, font=HEADER_FONT) for value in values])
+        self.rows += 1
+
+    def append(self, values: Iterable, severity: Optional[str] = None) -> None:
+        """Append a row; ``severity`` fills the sheet's severity columns."""
+        fill = self.severity_fills.get(severity)
+        row = []
+        for index, value in enumerate(values):
+            if fill is not None and index in self.severity_columns:
+                row.append(self._styled(value, font=SEVERITY_FONT, fill=fill))
+            else:
+                row.append(_cell_value(value))
+        self.worksheet.append(row)
+        self.rows += 1
+
+    def _styled(self, value, font=None, fill=None) -> WriteOnlyCell:
+        cell = WriteOnlyCell(self.worksheet, value=_cell_value(value))
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        return cell
+
+
+class ReportWriter:
+    """Write-only workbook; sheets appear in the order they are added."""
+
+    def __init__(self):
+        self.workbook = Workbook(write_only=True)
+        self.sheets: Dict[str, SheetWriter] = {}
+
+    def add_sheet(self, title: str, headers: Optional[List] = None,
+                  severity_columns: Sequence[int] = (), severity_fills: Dict = None) -> SheetWriter:
+        """Create a sheet, optionally writing a bold header row.
+
+        ``severity_fills`` (severity -> ``PatternFill``) replaces the default
+        ``SEVERITY_FILLS`` palette for this sheet.
+        """
+        sheet = SheetWriter(self.workbook.create_sheet(title=title), severity_columns, severity_fills)
+        if headers:
+            sheet.header(headers)
+        self.sheets[title] = sheet
+        return sheet
+
+    def add_count_charts(self, title: str, headers: List, counts: Dict[str, int],
+                         pie_title: str, bar_title: str) -> SheetWriter:
+        """Write ``counts`` as a two-column table with a pie chart at D2 and a bar chart at D20."""
+        sheet = self.add_sheet(title, headers)
+        for label, count in counts.items():
+            sheet.append([label, count])
+
+        for chart, chart_title, anchor in ((PieChart(), pie_title, "D2"), (BarChart(), bar_title, "D20")):
+            chart.title = chart_title
+            chart.add_data(Reference(sheet.worksheet, min_col=2, min_row=2, max_row=len(counts) + 1), titles_from_data=False)
+            chart.set_categories(Reference(sheet.worksheet, min_col=1, min_row=2, max_row=len(counts) + 1))
+            sheet.worksheet.add_chart(chart, anchor)
+        return sheet
+
+    def save(self, path: str) -> None:
+        """Write the workbook; a write-only workbook can only be saved once."""
+        self.workbook.save(path)
@@ -0,0 +1,129 @@
+"""
+JSON and Excel reports of a snapshot scored by the rule engine.
+
+The inventory collector and the security audit report write the same two
+documents from a ``Snapshot``; only the sheet titles and headers differ
+(English and Portuguese), so they are passed in as ``ReportLabels``::
+
+    write_json_report(snapshot, rule_engine, "oci_resources.json")
+    write_excel_report(snapshot, rule_engine, "oci_resources.xlsx", ENGLISH_LABELS)
+
+Both walk the snapshot one compartment at a time, so NDJSON snapshots are
+never loaded whole. Findings are highlighted only when the caller passes a
+palette: the collector keeps its original red for High findings
+(``COLLECTOR_FILLS``) and the audit report leaves its summary unstyled, as
+before the shared writer.
+"""
+
+from collections import namedtuple
+from typing import Dict, Iterator, List, Tuple
+
+from openpyxl.styles import PatternFill
+
+from ocitools.report_writer import SEVERITY_FILLS, ReportWriter
+from ocitools.resource_stream import write_json_document
+from ocitools.snapshot import SHEET_COLUMNS, Snapshot, chart_count, chart_label
+
+# Severity fills of the collector's findings summary; High keeps the collector's original colour
+COLLECTOR_FILLS = dict(SEVERITY_FILLS, High=PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid"))
+
+ReportLabels = namedtuple("ReportLabels", [
+    "summary_sheet", "summary_headers", "recommendation",
+    "advisor_headers", "no_advisor",
+    "cloud_guard_headers", "no_cloud_guard",
+    "compartment", "name",
+    "charts_sheet", "charts_headers", "pie_title", "bar_title",
+])
+
+ENGLISH_LABELS = ReportLabels(
+    summary_sheet="Findings Summary", summary_headers=["Compartment", "Issue", "Recommendation"],
+    recommendation="Refer to OCI best practices.",
+    advisor_headers=["Name", "Recommendation"], no_advisor="No Cloud Advisor recommendations found.",
+    cloud_guard_headers=["Resource Name", "Description"], no_cloud_guard="No Cloud Guard findings found.",
+    compartment="Compartment", name="Name",
+    charts_sheet="Visualizations", charts_headers=["Resource Type", "Count"],
+    pie_title="Resource Distribution", bar_title="Resource Counts",
+)
+
+PORTUGUESE_LABELS = ReportLabels(
+    summary_sheet="Sumário de Descobertas", summary_headers=["Compartimento", "Problema", "Recomendação"],
+    recommendation="Consulte as melhores práticas da OCI.",
+    advisor_headers=["Nome", "Recomendação"], no_advisor="Nenhuma recomendação do Cloud Advisor encontrada.",
+    cloud_guard_headers=["Nome do Recurso", "Descrição"], no_cloud_guard="Nenhuma descoberta do Cloud Guard encontrada.",
+    compartment="Compartimento", name="Nome",
+    charts_sheet="Visualizações", charts_headers=["Tipo de Recurso", "Contagem"],
+    pie_title="Distribuição de Recursos", bar_title="Contagem de Recursos",
+)
+
+
+def compartment_groups(snapshot: Snapshot, rule_engine) -> Iterator[Tuple[str, Dict[str, List[Dict]], List]]:
+    """Yield (compartment, resources by type, rule findings) from the snapshot."""
+    for name, resource_data in snapshot.groups():
+        yield name, resource_data, rule_engine.evaluate(resource_data)
+
+
+def write_json_report(snapshot: Snapshot, rule_engine, path: str) -> None:
+    """Resources, findings, Cloud Advisor and Cloud Guard results as one JSON document."""
+    with open(path, "w") as file:
+        write_json_document(file, [
+            ("resources", ((name, data) for name, data, _ in compartment_groups(snapshot, rule_engine)), True),
+            ("findings", ((name, [issue.message for issue in issues])
+                          for name, _, issues in compartment_groups(snapshot, rule_engine)), True),
+            ("cloud_advisor_recommendations", snapshot.cloud_advisor, False),
+            ("cloud_guard_findings", snapshot.cloud_guard, False),
+        ])
+
+
+def write_excel_report(snapshot: Snapshot, rule_engine, path: str, labels: ReportLabels = ENGLISH_LABELS,
+                       severity_fills: Dict = None) -> None:
+    """Findings summary, Cloud Advisor, Cloud Guard, one sheet per resource type and the count charts.
+
+    With ``severity_fills`` the findings are highlighted by rule severity as they are written.
+    """
+    report = ReportWriter()
+    summary_sheet = report.add_sheet(labels.summary_sheet, labels.summary_headers,
+                                     severity_columns=[1] if severity_fills else [], severity_fills=severity_fills)
+
+    advisor_sheet = report.add_sheet("Cloud Advisor", labels.advisor_headers)
+    if snapshot.cloud_advisor:
+        for recommendation in snapshot.cloud_advisor:
+            advisor_sheet.append([recommendation["Name"], recommendation["Recommendation"]])
+    else:
+        advisor_sheet.append([labels.no_advisor])
+
+    cloud_guard_sheet = report.add_sheet("Cloud Guard", labels.cloud_guard_headers)
+    if snapshot.cloud_guard:
+        for finding in snapshot.cloud_guard:
+            cloud_guard_sheet.append([finding["Name"], finding["Description"]])
+    else:
+        cloud_guard_sheet.append([labels.no_cloud_guard])
+
+    resource_types = snapshot.resource_types()
+    resource_sheets = {}
+    for resource_type in resource_types:
+        if resource_type in SHEET_COLUMNS:
+            headers = [labels.compartment] + [header for header, _ in SHEET_COLUMNS[resource_type]]
+        else:
+            headers = [labels.compartment, labels.name, "ID"]
+        resource_sheets[resource_type] = report.add_sheet(resource_type, headers)
+
+    # Findings summary and resource sheets are filled in one pass over the compartments
+    resource_counts = {resource_type: 0 for resource_type in resource_types}
+    for compartment, resource_data, issues in compartment_groups(snapshot, rule_engine):
+        for issue in issues:
+            summary_sheet.append([compartment, issue.message, labels.recommendation], severity=issue.severity)
+        for resource_type in resource_types:
+            for item in resource_data.get(resource_type, []):
+                if resource_type in SHEET_COLUMNS:
+                    resource_sheets[resource_type].append([compartment] + [item.get(key) for _, key in SHEET_COLUMNS[resource_type]])
+                else:
+                    resource_sheets[resource_type].append([compartment, item.get("name"), item.get("id", "N/A")])
+                resource_counts[resource_type] += chart_count(resource_type, item)
+
+    # Bucket summaries are charted by the number of objects they cover
+    report.add_count_charts(
+        labels.charts_sheet, labels.charts_headers,
+        {chart_label(resource_type): count for resource_type, count in resource_counts.items()},
+        pie_title=labels.pie_title, bar_title=labels.bar_title
+    )
+    report.save(path)
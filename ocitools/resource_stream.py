@@ -0,0 +1,232 @@
+"""
+NDJSON stream of discovered resources.
+
+Every resource is written as one JSON line as soon as it is discovered,
+optionally gzip-compressed (paths ending in ``.gz``). Record layout::
+
+    {"record": "snapshot", "version": 1, "created_at": "<iso time>", "tenancy": "...", "bucket_contents": "..."}
+    {"record": "compartment", "compartment": "<name>", "id": "<ocid>"}
+    {"record": "resource", "compartment": "<name>", "resource_type": "VCNs", "data": {...}}
+    {"record": "cloud_advisor", "data": {...}}
+    {"record": "cloud_guard", "data": {...}}
+
+Resource records always follow the compartment record they belong to.
+Findings are not part of the stream: the rule engine derives them from the
+resources when a report reads it. Streams written before that may still
+contain ``{"record": "finding", "compartment": "<name>", "message": "..."}``
+lines; ``read_compartment_groups`` returns them separately and the reports
+ignore them. Units discovered in parallel are spooled to their own temporary
+file and spliced into the main stream in serial order, so the stream (and
+anything derived from it) is identical to a serial run.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+FORMAT_VERSION = 1
+
+
+def open_stream(path: str, mode: str):
+    """Open an NDJSON file for text ("r"/"w") or binary ("rb"/"wb") access."""
+    if path.endswith(".gz"):
+        if "b" in mode:
+            return gzip.open(path, mode)
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if "b" in mode:
+        return open(path, mode)
+    return open(path, mode, encoding="utf-8")
+
+
+def _line(record: Dict) -> str:
+    return json.dumps(record, default=str) + "\n"
+
+
+class MemorySink:
+    """Collects one unit's resources and findings in memory."""
+
+    def __init__(self, compartment_name: str = None):
+        self.compartment_name = compartment_name
+        self.resources: Dict[str, List] = {}
+        self.findings: List[str] = []
+
+    def resource(self, resource_type: str, data: Dict) -> None:
+        self.resources.setdefault(resource_type, []).append(data)
+
+    def finding(self, message: str) -> None:
+        self.findings.append(message)
+
+    def replay(self, sink) -> None:
+        """Send the collected resources and findings to another sink."""
+        for resource_type, items in self.resources.items():
+            for data in items:
+                sink.resource(resource_type, data)
+        for message in self.findings:
+            sink.finding(message)
+
+
+class StreamSink:
+    """Writes one unit's records straight to an open text file."""
+
+    def __init__(self, file, compartment_name: str, lock: threading.Lock = None, path: str = None):
+        self.file = file
+        self.compartment_name = compartment_name
+        self.path = path
+        self._lock = lock or threading.Lock()
+
+    def _write(self, record: Dict) -> None:
+        with self._lock:
+            self.file.write(_line(record))
+
+    def resource(self, resource_type: str, data: Dict) -> None:
+        self._write({"record": "resource", "compartment": self.compartment_name,
+                     "resource_type": resource_type, "data": data})
+
+    def finding(self, message: str) -> None:
+        self._write({"record": "finding", "compartment": self.compartment_name, "message": message})
+
+
+class ResourceStream:
+    """Main NDJSON writer; hands out direct sinks (serial) or spool sinks (parallel)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open_stream(path, "w")
+        self._lock = threading.Lock()
+        self._spool_dir = None
+
+    def header(self, meta: Dict) -> None:
+        """Write the snapshot header; must be the first record."""
+        record = {"record": "snapshot", "version": FORMAT_VERSION,
+                  "created_at": datetime.now(timezone.utc).isoformat()}
+        record.update(meta)
+        with self._lock:
+            self._file.write(_line(record))
+
+    def compartment(self, name: str, compartment_id: str) -> None:
+        with self._lock:
+            self._file.write(_line({"record": "compartment", "compartment": name, "id": compartment_id}))
+
+    def cloud_advisor(self, data: Dict) -> None:
+        with self._lock:
+            self._file.write(_line({"record": "cloud_advisor", "data": data}))
+
+    def cloud_guard(self, data: Dict) -> None:
+        with self._lock:
+            self._file.write(_line({"record": "cloud_guard", "data": data}))
+
+    def sink(self, compartment_name: str) -> StreamSink:
+        """Sink writing directly into the main stream (serial runs)."""
+        return StreamSink(self._file, compartment_name, self._lock)
+
+    def spool(self, compartment_name: str) -> StreamSink:
+        """Sink writing to a private temporary file until ``commit`` is called."""
+        with self._lock:
+            if self._spool_dir is None:
+                self._spool_dir = tempfile.mkdtemp(prefix="oci_resources_spool_")
+        fd, spool_path = tempfile.mkstemp(dir=self._spool_dir, suffix=".ndjson")
+        return StreamSink(os.fdopen(fd, "w", encoding="utf-8"), compartment_name, path=spool_path)
+
+    def commit(self, sink: StreamSink) -> None:
+        """Append a spooled unit to the main stream and delete the spool."""
+        if sink.path is None:
+            return
+        sink.file.close()
+        with open(sink.path, encoding="utf-8") as spool, self._lock:
+            shutil.copyfileobj(spool, self._file)
+        os.remove(sink.path)
+
+    def close(self) -> None:
+        self._file.close()
+        if self._spool_dir:
+            shutil.rmtree(self._spool_dir, ignore_errors=True)
+
+
+def read_records(path: str, kinds: Iterable[str] = None) -> Iterator[Dict]:
+    """Yield the records of a stream, optionally only those of the given kinds."""
+    kinds = set(kinds) if kinds else None
+    with open_stream(path, "r") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if kinds is None or record["record"] in kinds:
+                yield record
+
+
+def _group_offsets(path: str) -> "OrderedDict[str, int]":
+    """Map compartment name -> offset of its last group, in first-seen order.
+
+    A compartment name seen twice keeps its first position but the content of
+    the later group, exactly like assigning ``resources[name] = {}`` twice.
+    """
+    offsets: "OrderedDict[str, int]" = OrderedDict()
+    with open_stream(path, "rb") as file:
+        while True:
+            offset = file.tell()
+            line = file.readline()
+            if not line:
+                break
+            if line.startswith(b'{"record": "compartment"'):
+                offsets[json.loads(line)["compartment"]] = offset
+    return offsets
+
+
+def read_compartment_groups(path: str) -> Iterator[Tuple[str, Dict[str, List], List[str]]]:
+    """Yield ``(compartment, resources_by_type, findings)`` one compartment at a time.
+
+    Memory use is bounded by the largest compartment, not by the tenancy.
+    """
+    offsets = _group_offsets(path)
+    with open_stream(path, "rb") as file:
+        for name, offset in offsets.items():
+            file.seek(offset)
+            file.readline()
+            comp_resources: Dict[str, List] = {}
+            comp_findings: List[str] = []
+            for line in iter(file.readline, b""):
+                record = json.loads(line)
+                kind = record["record"]
+                if kind == "resource":
+                    comp_resources.setdefault(record["resource_type"], []).append(record["data"])
+                elif kind == "finding":
+                    comp_findings.append(record["message"])
+                else:
+                    break
+            yield name, comp_resources, comp_findings
+
+
+def _indented(value, level: int) -> str:
+    # json.dumps never emits a raw newline inside strings, so this is safe
+    return json.dumps(value, indent=4).replace("\n", "\n" + " " * 4 * level)
+
+
+def write_json_document(file, members: List[Tuple[str, Iterable, bool]]) -> None:
+    """Write ``{key: object-or-array, ...}`` incrementally.
+
+    ``members`` is a list of ``(key, items, is_object)``; object members yield
+    ``(name, value)`` pairs. The output is byte-identical to
+    ``json.dump(document, file, indent=4)``.
+    """
+    file.write("{")
+    for index, (key, items, is_object) in enumerate(members):
+        file.write(("," if index else "") + "\n    " + json.dumps(key) + ": ")
+        opener, closer = ("{", "}") if is_object else ("[", "]")
+        file.write(opener)
+        empty = True
+        for item in items:
+            file.write(("" if empty else ",") + "\n        ")
+            if is_object:
+                name, value = item
+                file.write(json.dumps(name) + ": " + _indented(value, 2))
+            else:
+                file.write(_indented(item, 2))
+            empty = False
+        file.write(closer if empty else "\n    " + closer)
+    file.write("\n}" if members else "}")
@@ -0,0 +1,116 @@
+"""
+IAM policy risk patterns, compiled into one matcher.
+
+The patterns live in a JSON file (``rules/iam_risk_patterns.json`` by
+default), so a new risky grant is a one-line change there::
+
+    {"pattern": "manage all-resources", "severity": "High", "risk_type": "High-Risk Permission"}
+
+``RiskPatternMatcher`` compiles every pattern into a single regular expression
+shaped as a trie (``manage (?:all-resources|iam|tenancy|...)|use ...``), so one
+scan of a statement finds every pattern that occurs in it, and the cost of the
+scan barely grows with the number of patterns, unlike one ``in`` test per
+pattern. Patterns are matched on the lowercased statement, like a substring
+test. Hits come back in file order, once per pattern, whatever order or how
+often they occur in the statement.
+
+The regex reports the longest pattern at each match, so each pattern also
+carries the shorter patterns it contains, which are added whenever it
+matches. The next search resumes before the end of the match, by the longest
+overlap between the end of one pattern and the start of another (``"manage
+iam"`` / ``"manage compute"`` share the ``m``), so no occurrence is skipped.
+"""
+
+import json
+import os
+import re
+from collections import namedtuple
+from typing import Dict, List
+
+from ocitools.rules import RuleError
+
+DEFAULT_RISK_PATTERNS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules",
+                                          "iam_risk_patterns.json")
+
+RiskPattern = namedtuple("RiskPattern", ["pattern", "severity", "risk_type"])
+
+
+def _trie_regex(texts) -> str:
+    """Regex matching any of ``texts``, longest first, with shared prefixes factored out."""
+    trie: Dict = {}
+    for text in texts:
+        node = trie
+        for char in text:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if "" in node else group
+
+    return build(trie)
+
+
+def _longest_overlap(texts: List[str]) -> int:
+    """Longest suffix of a pattern that is also a prefix of another one it does not contain."""
+    longest = 0
+    for first in texts:
+        for second in texts:
+            if second in first:
+                continue
+            for size in range(min(len(first), len(second)) - 1, longest, -1):
+                if first.endswith(second[:size]):
+                    longest = size
+                    break
+    return longest
+
+
+class RiskPatternMatcher:
+    """Every risk pattern of a rules file in one compiled regex."""
+
+    def __init__(self, definitions: List[Dict]):
+        try:
+            self.patterns = [RiskPattern(d["pattern"].lower(), d.get("severity", "Medium"),
+                                         d.get("risk_type", "Risky Permission")) for d in definitions]
+        except KeyError as e:
+            raise RuleError(f"Risk pattern is missing {e}") from None
+        if any(not risk.pattern for risk in self.patterns):
+            raise RuleError("Risk patterns cannot be empty")
+        # Pattern -> positions of every pattern it contains (itself and duplicates included)
+        self._implied = {
+            risk.pattern: [position for position, other in enumerate(self.patterns) if other.pattern in risk.pattern]
+            for risk in self.patterns
+        }
+        self._regex = re.compile(_trie_regex(self._implied)) if self._implied else None
+        self._overlap = _longest_overlap(list(self._implied))
+
+    @classmethod
+    def from_file(cls, path: str = None) -> "RiskPatternMatcher":
+        with open(path or DEFAULT_RISK_PATTERNS_PATH, encoding="utf-8") as file:
+            document = json.load(file)
+        return cls(document["patterns"])
+
+    def positions(self, statement: str) -> List[int]:
+        """Positions (in file order) of the patterns found in ``statement``."""
+        if self._regex is None:
+            return []
+        statement = statement.lower()
+        match = self._regex.search(statement)
+        if match is None:
+            return []
+        texts = set()
+        while match is not None:
+            texts.add(match.group())
+            match = self._regex.search(statement, max(match.end() - self._overlap, match.start() + 1))
+        if len(texts) == 1:
+            return list(self._implied[texts.pop()])
+        return sorted({position for text in texts for position in self._implied[text]})
+
+    def match(self, statement: str) -> List[RiskPattern]:
+        """The patterns found in ``statement``, in file order."""
+        return [self.patterns[position] for position in self.positions(statement)]
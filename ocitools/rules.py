@@ -0,0 +1,132 @@
+"""
+Declarative best-practice rules evaluated over collected resources.
+
+Rules live in a JSON file (``rules/best_practices.json`` by default) instead of
+inside the discovery loops, so checks can be added or changed and a tenancy
+re-scored from an existing snapshot without calling any OCI API. A rule::
+
+    {
+        "id": "bucket-public-access",
+        "resource_type": "Buckets",
+        "severity": "High",
+        "for_each": "nsgs",                  # optional: test each element of a list field
+        "when": {"field": "public_access_type", "op": "ne", "value": "NoPublicAccess"},
+        "message": {"en": "Bucket '{name}' allows public access.", "pt": "..."}
+    }
+
+Conditions combine with ``all`` / ``any`` / ``not``; see ``OPERATORS`` for the
+comparison operators. Messages are ``str.format`` templates over the resource
+fields (and, with ``for_each``, the fields of the element being tested).
+Conditions are compiled once and rules are indexed by resource type, so
+evaluation is a single pass over the resources.
+"""
+
+import json
+import os
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules", "best_practices.json")
+
+Finding = namedtuple("Finding", ["rule_id", "severity", "resource_type", "resource_name", "message"])
+
+OPERATORS: Dict[str, Callable] = {
+    "eq": lambda actual, expected: actual == expected,
+    "ne": lambda actual, expected: actual != expected,
+    "gt": lambda actual, expected: actual is not None and actual > expected,
+    "lt": lambda actual, expected: actual is not None and actual < expected,
+    "in": lambda actual, expected: actual in expected,
+    "not_in": lambda actual, expected: actual not in expected,
+    "contains": lambda actual, expected: actual is not None and expected in actual,
+    "not_contains": lambda actual, expected: actual is None or expected not in actual,
+    "startswith": lambda actual, expected: isinstance(actual, str) and actual.startswith(expected),
+    "not_startswith": lambda actual, expected: not (isinstance(actual, str) and actual.startswith(expected)),
+    "truthy": lambda actual, expected: bool(actual),
+    "falsy": lambda actual, expected: not actual,
+}
+
+
+class RuleError(ValueError):
+    """A rule definition is malformed."""
+
+
+def compile_condition(condition: Dict, rule_id: str = "?") -> Callable[[Dict], bool]:
+    """Turn a condition tree into a predicate over a resource dict."""
+    if "all" in condition:
+        parts = [compile_condition(part, rule_id) for part in condition["all"]]
+        return lambda item: all(part(item) for part in parts)
+    if "any" in condition:
+        parts = [compile_condition(part, rule_id) for part in condition["any"]]
+        return lambda item: any(part(item) for part in parts)
+    if "not" in condition:
+        inner = compile_condition(condition["not"], rule_id)
+        return lambda item: not inner(item)
+    try:
+        field, operator = condition["field"], OPERATORS[condition["op"]]
+    except KeyError as e:
+        raise RuleError(f"Rule '{rule_id}': invalid condition {condition!r} ({e})") from None
+    expected = condition.get("value")
+    return lambda item: operator(item.get(field), expected)
+
+
+class Rule:
+    """One compiled rule."""
+
+    def __init__(self, definition: Dict, language: str):
+        try:
+            self.id = definition["id"]
+            self.resource_type = definition["resource_type"]
+            messages = definition["message"]
+        except KeyError as e:
+            raise RuleError(f"Rule {definition!r} is missing {e}") from None
+        self.severity = definition.get("severity", "Medium")
+        self.for_each = definition.get("for_each")
+        self.template = messages.get(language) or messages["en"]
+        self.matches = compile_condition(definition.get("when", {"all": []}), self.id)
+
+    def evaluate(self, item: Dict) -> Iterable[Finding]:
+        if self.for_each:
+            candidates = [dict(item, **element) for element in item.get(self.for_each) or []]
+        else:
+            candidates = [item]
+        for candidate in candidates:
+            if self.matches(candidate):
+                yield Finding(self.id, self.severity, self.resource_type, item.get("name"),
+                              self.template.format_map(_Defaults(candidate)))
+
+
+class _Defaults(dict):
+    # Missing template fields render as N/A instead of raising KeyError
+    def __missing__(self, key):
+        return "N/A"
+
+
+class RuleEngine:
+    """Rules indexed by resource type."""
+
+    def __init__(self, definitions: List[Dict], language: str = "en"):
+        self.rules = [Rule(definition, language) for definition in definitions]
+        self.by_type: Dict[str, List[Rule]] = {}
+        for rule in self.rules:
+            self.by_type.setdefault(rule.resource_type, []).append(rule)
+
+    @classmethod
+    def from_file(cls, path: str = None, language: str = "en") -> "RuleEngine":
+        with open(path or DEFAULT_RULES_PATH, encoding="utf-8") as file:
+            document = json.load(file)
+        return cls(document["rules"], language)
+
+    def evaluate(self, resources_by_type: Dict[str, List[Dict]]) -> List[Finding]:
+        """Findings of one compartment, in resource order and rule declaration order."""
+        findings = []
+        for resource_type, items in resources_by_type.items():
+            rules = self.by_type.get(resource_type)
+            if not rules:
+                continue
+            for item in items:
+                for rule in rules:
+                    findings.extend(rule.evaluate(item))
+        return findings
+
+    def messages(self, resources_by_type: Dict[str, List[Dict]]) -> List[str]:
+        return [finding.message for finding in self.evaluate(resources_by_type)]
@@ -0,0 +1,214 @@
+"""
+Resource Search fast path for first-level inventories.
+
+Listing a tenancy resource by resource takes one call per compartment, per
+service (and sometimes per availability domain), most of them answering with
+an empty list. One structured Resource Search query per region
+(``query instance, volume, vcn resources``) returns the resources of every
+compartment in a few pages::
+
+    search = ResourceSearch(search_client)
+    index = search.index(["instance", "volume", "vcn"])
+    for summary in index.of_type("instance"):
+        ...
+
+Search summaries carry the name, OCID, compartment, lifecycle state,
+availability domain, creation time and tags. ``fetch_details`` fills in the
+fields they lack (shape, size, CIDR, ...) by calling a type's list API only in
+the compartments where Search found that type: one call covers every
+resource of the compartment, so it never costs more than a ``get_*`` per
+resource.
+
+The search index is eventually consistent, so a resource created moments
+ago may be missing. ``verify`` lists every compartment with the list APIs and
+reports what each side has that the other does not.
+"""
+
+from collections import namedtuple
+from typing import Dict, Iterable, List
+
+import oci
+
+SEARCH_PAGE_LIMIT = 1000
+
+# States in which a resource is gone; Search keeps them for a while, list APIs too
+GONE_STATES = ("TERMINATED", "DELETED")
+
+# Resource Search type -> list API used for details and verification.
+# ``name_attr`` is the name field of the list model; ``key_attr`` matches list
+# results to search summaries (buckets have no OCID in ``list_buckets``).
+# ``details`` are (column, function of the list model) pairs.
+SearchType = namedtuple("SearchType", ["label", "client_class", "list_operation", "name_attr", "key_attr", "details"])
+
+SEARCH_TYPES = {
+    "instance": SearchType("Instance", oci.core.ComputeClient, "list_instances", "display_name", "id", [
+        ("Shape", lambda item: item.shape),
+        ("OCPUs", lambda item: item.shape_config.ocpus if item.shape_config else None),
+        ("Memory (GB)", lambda item: item.shape_config.memory_in_gbs if item.shape_config else None),
+    ]),
+    "volume": SearchType("Volume", oci.core.BlockstorageClient, "list_volumes", "display_name", "id", [
+        ("Size (GB)", lambda item: item.size_in_gbs),
+    ]),
+    "bootvolume": SearchType("BootVolume", oci.core.BlockstorageClient, "list_boot_volumes", "display_name", "id", [
+        ("Size (GB)", lambda item: item.size_in_gbs),
+    ]),
+    "vcn": SearchType("Vcn", oci.core.VirtualNetworkClient, "list_vcns", "display_name", "id", [
+        ("CIDR Block", lambda item: item.cidr_block),
+    ]),
+    "subnet": SearchType("Subnet", oci.core.VirtualNetworkClient, "list_subnets", "display_name", "id", [
+        ("CIDR Block", lambda item: item.cidr_block),
+    ]),
+    "networksecuritygroup": SearchType("NetworkSecurityGroup", oci.core.VirtualNetworkClient,
+                                       "list_network_security_groups", "display_name", "id", []),
+    "bucket": SearchType("Bucket", oci.object_storage.ObjectStorageClient, "list_buckets", "name", "name", []),
+    "autonomousdatabase": SearchType("AutonomousDatabase", oci.database.DatabaseClient, "list_autonomous_databases",
+                                     "display_name", "id", [
+                                         ("Workload", lambda item: item.db_workload),
+                                     ]),
+    "dbsystem": SearchType("DbSystem", oci.database.DatabaseClient, "list_db_systems", "display_name", "id", [
+        ("Shape", lambda item: item.shape),
+    ]),
+    "loadbalancer": SearchType("LoadBalancer", oci.load_balancer.LoadBalancerClient, "list_load_balancers",
+                               "display_name", "id", [
+                                   ("Shape", lambda item: item.shape_name),
+                               ]),
+}
+
+DEFAULT_SEARCH_TYPES = ["instance", "volume", "bootvolume", "vcn", "subnet", "bucket", "autonomousdatabase",
+                        "dbsystem", "loadbalancer"]
+
+
+def build_query(types: Iterable[str]) -> str:
+    """``query instance, volume resources``"""
+    return f"query {', '.join(types)} resources"
+
+
+def summary_key(search_type: str, summary) -> str:
+    """Key matching a search summary to its list API item."""
+    return summary.display_name if SEARCH_TYPES[search_type].key_attr == "name" else summary.identifier
+
+
+def detail_columns(types: Iterable[str]) -> List[str]:
+    """Detail columns of ``types`` in ``SEARCH_TYPES`` order, without repeats."""
+    columns = []
+    for search_type in types:
+        for column, _ in SEARCH_TYPES[search_type].details:
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+class SearchIndex:
+    """Search summaries by type and compartment, in the order Search returned them."""
+
+    def __init__(self, types: List[str], summaries: List):
+        self.types = list(types)
+        self.summaries = summaries
+        by_label = {SEARCH_TYPES[search_type].label.lower(): search_type for search_type in self.types}
+        self._by_type: Dict[str, Dict[str, List]] = {search_type: {} for search_type in self.types}
+        for summary in summaries:
+            search_type = by_label.get((summary.resource_type or "").lower())
+            if search_type is not None:
+                self._by_type[search_type].setdefault(summary.compartment_id, []).append(summary)
+
+    def of_type(self, search_type: str) -> List:
+        return [summary for summaries in self._by_type[search_type].values() for summary in summaries]
+
+    def compartments_with(self, search_type: str) -> List[str]:
+        """OCIDs of the compartments where Search found ``search_type``."""
+        return list(self._by_type[search_type])
+
+    def in_compartment(self, search_type: str, compartment_id: str) -> List:
+        return list(self._by_type[search_type].get(compartment_id, []))
+
+    def count(self, search_type: str) -> int:
+        return sum(len(summaries) for summaries in self._by_type[search_type].values())
+
+
+class ResourceSearch:
+    """Structured Resource Search queries of one region."""
+
+    def __init__(self, search_client):
+        self.search_client = search_client
+
+    def search(self, query: str) -> List:
+        """Every ``ResourceSummary`` matching a structured ``query`` (all pages)."""
+        details = oci.resource_search.models.StructuredSearchDetails(
+            query=query, type="Structured", matching_context_type="NONE")
+        return oci.pagination.list_call_get_all_results(
+            self.search_client.search_resources,
+            details,
+            limit=SEARCH_PAGE_LIMIT
+        ).data
+
+    def index(self, types: Iterable[str] = None) -> SearchIndex:
+        """One query for every type in ``types``, grouped by type and compartment."""
+        types = list(types or DEFAULT_SEARCH_TYPES)
+        unknown = [search_type for search_type in types if search_type not in SEARCH_TYPES]
+        if unknown:
+            raise ValueError(f"Unsupported resource types: {', '.join(unknown)}")
+        return SearchIndex(types, self.search(build_query(types)))
+
+
+def list_resources(client, search_type: str, compartment_id: str, namespace: str = None) -> List:
+    """``search_type`` resources of one compartment through its list API."""
+    spec = SEARCH_TYPES[search_type]
+    operation = getattr(client, spec.list_operation)
+    if search_type == "bucket":
+        return oci.pagination.list_call_get_all_results(operation, namespace, compartment_id).data
+    return oci.pagination.list_call_get_all_results(operation, compartment_id=compartment_id).data
+
+
+def fetch_details(index: SearchIndex, clients: Dict, namespace: str = None) -> Dict[str, Dict]:
+    """Detail columns per search key, from one list call per (type, compartment) that Search found.
+
+    ``clients`` maps client classes to clients of the index's region.
+    Compartments whose list call fails are skipped; their resources keep only
+    the search fields.
+    """
+    details: Dict[str, Dict] = {}
+    for search_type in index.types:
+        spec = SEARCH_TYPES[search_type]
+        if not spec.details:
+            continue
+        client = clients[spec.client_class]
+        for compartment_id in index.compartments_with(search_type):
+            try:
+                items = list_resources(client, search_type, compartment_id, namespace)
+            except oci.exceptions.ServiceError:
+                continue
+            for item in items:
+                details[getattr(item, spec.key_attr)] = {column: value(item) for column, value in spec.details}
+    return details
+
+
+def verify(index: SearchIndex, clients: Dict, compartment_ids: Iterable[str], namespace: str = None) -> List[Dict]:
+    """Differences between Search and the list APIs over ``compartment_ids``.
+
+    Returns one dict per resource that only one side has (resources in
+    ``GONE_STATES`` are ignored on both sides), with ``issue`` set to
+    ``missing_in_search`` or ``missing_in_list``, plus a ``list_error`` entry
+    for each list call that failed.
+    """
+    differences = []
+    for compartment_id in compartment_ids:
+        for search_type in index.types:
+            spec = SEARCH_TYPES[search_type]
+            try:
+                items = list_resources(clients[spec.client_class], search_type, compartment_id, namespace)
+            except oci.exceptions.ServiceError as e:
+                differences.append({"type": search_type, "compartment_id": compartment_id, "key": e.code,
+                                    "name": e.message, "issue": "list_error"})
+                continue
+            listed = {getattr(item, spec.key_attr): item for item in items
+                      if getattr(item, "lifecycle_state", None) not in GONE_STATES}
+            found = {summary_key(search_type, summary): summary
+                     for summary in index.in_compartment(search_type, compartment_id)
+                     if summary.lifecycle_state not in GONE_STATES}
+            for key in listed.keys() - found.keys():
+                differences.append({"type": search_type, "compartment_id": compartment_id, "key": key,
+                                    "name": getattr(listed[key], spec.name_attr), "issue": "missing_in_search"})
+            for key in found.keys() - listed.keys():
+                differences.append({"type": search_type, "compartment_id": compartment_id, "key": key,
+                                    "name": found[key].display_name, "issue": "missing_in_list"})
+    return sorted(differences, key=lambda d: (d["compartment_id"], d["type"], d["issue"], d["key"]))
@@ -0,0 +1,52 @@
+"""
+Worker pool with a separate concurrency cap per OCI service.
+
+Each service gets its own ``ThreadPoolExecutor`` so that throttling on one
+service (Object Storage, Compute, ...) only slows down that service's tasks
+instead of occupying workers needed by the others.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict
+
+# Maximum number of concurrent requests per service, regardless of --workers
+DEFAULT_SERVICE_LIMITS = {
+    "identity": 2,
+    "network": 4,
+    "compute": 4,
+    "block_storage": 4,
+    "object_storage": 2,
+    "database": 2,
+    "load_balancer": 2,
+    "optimizer": 1,
+    "cloud_guard": 1,
+}
+
+
+class ServicePool:
+    """Fan out tasks over per-service executors of size ``min(workers, limit)``."""
+
+    def __init__(self, workers: int, limits: Dict[str, int] = None):
+        self.workers = max(1, workers)
+        self.limits = dict(DEFAULT_SERVICE_LIMITS, **(limits or {}))
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+
+    def _executor(self, service: str) -> ThreadPoolExecutor:
+        if service not in self._executors:
+            size = max(1, min(self.workers, self.limits.get(service, self.workers)))
+            self._executors[service] = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"oci-{service}")
+        return self._executors[service]
+
+    def submit(self, service: str, fn: Callable, *args, **kwargs) -> Future:
+        return self._executor(service).submit(fn, *args, **kwargs)
+
+    def shutdown(self, cancel_pending: bool = False) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=True, cancel_futures=cancel_pending)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(cancel_pending=exc_type is not None)
+        return False
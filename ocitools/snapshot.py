@@ -0,0 +1,114 @@
+"""
+Tenancy snapshot: the resources collected by one discovery sweep.
+
+A snapshot is written once (by ``inventory/oci-inventory-snapshot.py`` or by
+the collector with ``--ndjson``) and read by any report with ``--snapshot``.
+On disk it is the NDJSON stream of ``ocitools.resource_stream``, starting
+with a header record::
+
+    {"record": "snapshot", "version": 1, "created_at": "...", "tenancy": "...", "bucket_contents": "summary"}
+
+``Snapshot.load`` also accepts the ``oci_resources.json`` document written by
+the reports, so earlier runs can be re-scored too.
+"""
+
+import json
+import os
+from typing import Dict, Iterator, List, Tuple
+
+from ocitools.resource_stream import open_stream, read_compartment_groups, read_records
+
+BASE_RESOURCE_TYPES = ["VCNs", "Compute Instances", "Block Volumes", "Buckets", None, "Autonomous Databases", "Load Balancers"]
+BUCKET_CONTENT_TYPES = {"summary": "Bucket Summary", "objects": "Bucket Objects"}
+
+# Sheet columns as (header, key) for resource types that are not Compartment/Name/ID
+SHEET_COLUMNS = {
+    "Bucket Summary": [("Bucket", "bucket_name"), ("Scope", "scope"), ("Prefix", "prefix"), ("Objects", "object_count"),
+                       ("Total Bytes", "total_bytes"), ("Newest", "newest"), ("Oldest", "oldest")],
+}
+
+
+def chart_count(resource_type: str, item: Dict) -> int:
+    """How much a resource row adds to the resource charts."""
+    # Summary rows stand for the objects of a bucket; count those, once per bucket
+    if resource_type == "Bucket Summary":
+        return item["object_count"] if item["scope"] == "bucket" else 0
+    return 1
+
+
+def chart_label(resource_type: str) -> str:
+    return "Bucket Objects" if resource_type == "Bucket Summary" else resource_type
+
+
+def is_ndjson(path: str) -> bool:
+    """``.ndjson``/``.ndjson.gz`` files, ``.json`` documents; anything else by its first line."""
+    name = os.path.basename(path)
+    if name.endswith((".ndjson", ".ndjson.gz")):
+        return True
+    if name.endswith(".json"):
+        return False
+    # A stream starts with its one-line header record, the JSON document with a lone "{"
+    with open_stream(path, "r") as file:
+        first_line = file.readline()
+    try:
+        return "record" in json.loads(first_line)
+    except (TypeError, ValueError):
+        return False
+
+
+class Snapshot:
+    """Resources per compartment plus the tenancy-wide Cloud Advisor / Cloud Guard results.
+
+    Snapshots loaded from NDJSON are read back one compartment at a time on
+    every ``groups()`` call, so they never have to fit in memory.
+    """
+
+    def __init__(self, resources: Dict = None, cloud_advisor: List = None, cloud_guard: List = None,
+                 meta: Dict = None, path: str = None):
+        self._resources = resources if resources is not None else {}
+        self.cloud_advisor = cloud_advisor or []
+        self.cloud_guard = cloud_guard or []
+        self.meta = meta or {}
+        self.path = path
+
+    @classmethod
+    def load(cls, path: str) -> "Snapshot":
+        if is_ndjson(path):
+            meta = next(read_records(path, ["snapshot"]), None) or {}
+            return cls(
+                cloud_advisor=[record["data"] for record in read_records(path, ["cloud_advisor"])],
+                cloud_guard=[record["data"] for record in read_records(path, ["cloud_guard"])],
+                meta=meta,
+                path=path,
+            )
+        with open(path) as file:
+            document = json.load(file)
+        return cls(document["resources"], document["cloud_advisor_recommendations"], document["cloud_guard_findings"])
+
+    def groups(self) -> Iterator[Tuple[str, Dict[str, List[Dict]]]]:
+        """Yield ``(compartment name, resources by type)`` in discovery order."""
+        if self.path is None:
+            yield from self._resources.items()
+        else:
+            for name, resources_by_type, _ in read_compartment_groups(self.path):
+                yield name, resources_by_type
+
+    @property
+    def bucket_contents(self) -> str:
+        """``"summary"`` or ``"objects"``; older files without a header are inspected."""
+        if "bucket_contents" not in self.meta:
+            has_objects = any("Bucket Objects" in resources_by_type for _, resources_by_type in self.groups())
+            self.meta["bucket_contents"] = "objects" if has_objects else "summary"
+        return self.meta["bucket_contents"]
+
+    def require_bucket_contents(self, expected: str) -> None:
+        """Refuse a snapshot whose buckets were collected in another mode than the report's own discovery."""
+        if self.bucket_contents != expected:
+            flag = "with" if expected == "objects" else "without"
+            raise ValueError(f"Snapshot '{self.path}' lists bucket {self.bucket_contents}, this report needs "
+                             f"bucket {expected}: take the snapshot {flag} --bucket-objects.")
+
+    def resource_types(self) -> List[str]:
+        """Resource types in report order, with the bucket content type of this snapshot."""
+        bucket_type = BUCKET_CONTENT_TYPES[self.bucket_contents]
+        return [resource_type or bucket_type for resource_type in BASE_RESOURCE_TYPES]
@@ -0,0 +1,566 @@
+"""
+Synthetic tenancies for offline benchmarks.
+
+A synthetic tenancy is a small JSON spec (sizes and a random seed, see
+``DEFAULT_SPEC``) that is expanded deterministically, one compartment at a
+time, into SDK model objects. It plugs into the replay backend: pointing
+``OCITOOLS_CASSETTE`` at a spec written by ``benchmarks/generate_tenancy.py``
+makes every client from ``ocitools.clients`` answer from the synthetic
+tenancy instead of a recording, so any script can run at any scale::
+
+    OCITOOLS_MODE=replay OCITOOLS_CASSETTE=tenancy_1000.json python3 finops/oci-finops-unused-resources.py
+
+List operations page like the service (``limit``/``page`` and
+``opc-next-page``); operations the tenancy does not model return empty lists,
+and unknown ``get_*`` calls raise 404.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+import oci
+
+SPEC_KIND = "synthetic-tenancy"
+SPEC_VERSION = 1
+DEFAULT_PAGE_SIZE = 100
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Per-compartment counts unless noted; users/groups/dynamic_groups are tenancy-wide
+DEFAULT_SPEC = {
+    "seed": 1,
+    "compartments": 10,
+    "fanout": 10,
+    "instances": 5,
+    "volumes": 5,
+    "backups": 3,
+    "nsgs": 2,
+    "buckets": 2,
+    "objects": 50,
+    "policies": 2,
+    "users": None,
+    "groups": None,
+    "dynamic_groups": None,
+    "regions": ["sa-saopaulo-1"],
+    "availability_domains": 1,
+    # Scripts with a hard-coded compartment name find these first compartments
+    "named_compartments": ["LinuxBancoDados"],
+    "latency_ms": 0,
+}
+
+OPERATING_SYSTEMS = ["Oracle Linux", "Windows", "Ubuntu", "CentOS"]
+OBJECT_PREFIXES = ["logs/", "data/", "img/2024/", ""]
+POLICY_TEMPLATES = [
+    "Allow group {group} to read all-resources in compartment {compartment}",
+    "Allow group {group} to manage instance-family in compartment {compartment}",
+    "Allow group {group} to use virtual-network-family in compartment {compartment}",
+    "Allow group {group} to manage object-family in compartment {compartment} where target.bucket.name = 'b{index}'",
+    "Allow dynamic-group {dynamic_group} to use secret-family in compartment {compartment}",
+    "Allow group {group} to inspect users in tenancy",
+    "Allow any-user to read buckets in compartment {compartment}",
+    "Allow group {group} to manage all-resources in compartment {compartment}",
+]
+# Resource Search type -> (resource type label, generated resource kind)
+SEARCH_KINDS = {
+    "instance": ("Instance", "instances"),
+    "volume": ("Volume", "volumes"),
+    "bootvolume": ("BootVolume", "boot_volumes"),
+    "vcn": ("Vcn", "vcns"),
+    "networksecuritygroup": ("NetworkSecurityGroup", "nsgs"),
+    "bucket": ("Bucket", "buckets"),
+    "autonomousdatabase": ("AutonomousDatabase", "adbs"),
+    "loadbalancer": ("LoadBalancer", "load_balancers"),
+    "filesystem": ("FileSystem", "file_systems"),
+    "drg": ("Drg", "drgs"),
+}
+TENANCY_STATEMENTS = [
+    "Allow group Administrators to manage all-resources in tenancy",
+    "Allow group {group} to manage users in tenancy",
+    "Allow group {group} to manage policies in tenancy",
+]
+
+
+def make_spec(**sizes) -> Dict:
+    """A complete spec: defaults, overridden sizes, and tenancy-wide counts derived from the size."""
+    spec = dict(DEFAULT_SPEC, **{key: value for key, value in sizes.items() if value is not None})
+    compartments = spec["compartments"]
+    spec["users"] = spec["users"] if spec["users"] is not None else max(5, compartments * 2)
+    spec["groups"] = spec["groups"] if spec["groups"] is not None else max(3, compartments // 5)
+    spec["dynamic_groups"] = spec["dynamic_groups"] if spec["dynamic_groups"] is not None else max(1, compartments // 20)
+    spec.update({"kind": SPEC_KIND, "version": SPEC_VERSION})
+    return spec
+
+
+def is_spec(document: Dict) -> bool:
+    return document.get("kind") == SPEC_KIND
+
+
+def _ocid(kind: str, *parts) -> str:
+    return f"ocid1.{kind}.oc1..synthetic" + "".join(f".{part}" for part in parts)
+
+
+def _index(ocid: str, prefix: str) -> int:
+    # Compartment index encoded in synthetic OCIDs as ".c<index>"
+    for part in ocid.split("."):
+        if part.startswith(prefix) and part[len(prefix):].isdigit():
+            return int(part[len(prefix):])
+    raise KeyError(ocid)
+
+
+class SyntheticTenancy:
+    """Answers SDK operations from a generated tenancy; same ``respond`` contract as ``Cassette``."""
+
+    def __init__(self, spec: Dict, latency: str = "0"):
+        self.spec = make_spec(**{key: spec[key] for key in DEFAULT_SPEC if key in spec})
+        self.tenancy_id = _ocid("tenancy", f"t{self.spec['compartments']}s{self.spec['seed']}")
+        self.config = {"tenancy": self.tenancy_id, "region": self.spec["regions"][0], "user": _ocid("user", "u0")}
+        self.latency_ms = float(self.spec["latency_ms"]) if latency in ("", "0", "recorded") else float(latency)
+        self.calls = 0
+        self.now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        self._compartments: Dict[int, Dict] = {}
+        self._lock = threading.Lock()
+        self._build_identity()
+
+    # --- Generation ------------------------------------------------------
+
+    def _compartment_name(self, index: int) -> str:
+        named = self.spec["named_compartments"]
+        return named[index] if index < len(named) else f"comp{index:05d}"
+
+    def _parent(self, index: int) -> str:
+        fanout = self.spec["fanout"]
+        return self.tenancy_id if index < fanout else _ocid("compartment", f"c{(index - fanout) // fanout}")
+
+    def _build_identity(self) -> None:
+        spec = self.spec
+        rng = random.Random(spec["seed"])
+        self.compartments = [
+            oci.identity.models.Compartment(id=_ocid("compartment", f"c{i}"), name=self._compartment_name(i),
+                                            compartment_id=self._parent(i), lifecycle_state="ACTIVE",
+                                            description=f"Synthetic compartment {i}", time_created=BASE_TIME)
+            for i in range(spec["compartments"])
+        ]
+        self.groups = [oci.identity.models.Group(id=_ocid("group", f"g{i}"), name="Administrators" if i == 0 else f"group{i:04d}",
+                                                 compartment_id=self.tenancy_id, lifecycle_state="ACTIVE",
+                                                 description=f"Synthetic group {i}", time_created=BASE_TIME)
+                       for i in range(spec["groups"])]
+        self.dynamic_groups = [oci.identity.models.DynamicGroup(
+            id=_ocid("dynamicgroup", f"d{i}"), name=f"dyngroup{i:03d}", compartment_id=self.tenancy_id,
+            matching_rule=f"ALL {{instance.compartment.id = '{self.compartments[i % len(self.compartments)].id}'}}"
+            if self.compartments else "ANY {}", lifecycle_state="ACTIVE", time_created=BASE_TIME)
+            for i in range(spec["dynamic_groups"])]
+        self.users = [oci.identity.models.User(id=_ocid("user", f"u{i}"), name=f"user{i:05d}@example.com",
+                                               email=f"user{i:05d}@example.com", compartment_id=self.tenancy_id,
+                                               lifecycle_state="ACTIVE", is_mfa_activated=rng.random() < 0.6,
+                                               time_created=BASE_TIME, description=f"Synthetic user {i}")
+                      for i in range(spec["users"])]
+        self.memberships = []
+        for i, user in enumerate(self.users):
+            for group in rng.sample(self.groups, min(len(self.groups), rng.randint(1, 3))):
+                self.memberships.append(oci.identity.models.UserGroupMembership(
+                    id=_ocid("groupmembership", f"m{len(self.memberships)}"), user_id=user.id, group_id=group.id,
+                    compartment_id=self.tenancy_id, lifecycle_state="ACTIVE", time_created=BASE_TIME))
+        self.tenancy_policies = [oci.identity.models.Policy(
+            id=_ocid("policy", "root"), name="tenancy-admins", compartment_id=self.tenancy_id, lifecycle_state="ACTIVE",
+            description="Synthetic tenancy policy", time_created=BASE_TIME,
+            statements=[template.format(group=rng.choice(self.groups).name) for template in TENANCY_STATEMENTS])]
+        self.images = [oci.core.models.Image(id=_ocid("image", f"img{i}"), operating_system=OPERATING_SYSTEMS[i % len(OPERATING_SYSTEMS)],
+                                             operating_system_version=str(i), display_name=f"image{i}")
+                       for i in range(8)]
+        self.availability_domains = [oci.identity.models.AvailabilityDomain(name=f"AD-{i + 1}", compartment_id=self.tenancy_id)
+                                     for i in range(spec["availability_domains"])]
+
+    def compartment(self, index: int) -> Dict[str, List]:
+        """Resources of one compartment, generated on first use."""
+        resources = self._compartments.get(index)
+        if resources is None:
+            with self._lock:
+                resources = self._compartments.get(index)
+                if resources is None:
+                    resources = self._compartments[index] = self._generate(index)
+        return resources
+
+    def _generate(self, c: int) -> Dict[str, List]:
+        spec, m = self.spec, oci.core.models
+        rng = random.Random(spec["seed"] * 1_000_003 + c)
+        cid = self.compartments[c].id
+        ads = [ad.name for ad in self.availability_domains]
+        r = {key: [] for key in ("vcns", "nsgs", "rules", "instances", "vnic_attachments", "vnics", "volumes",
+                                 "boot_volumes", "volume_attachments", "boot_volume_attachments", "volume_backups",
+                                 "boot_volume_backups", "buckets", "objects", "adbs", "load_balancers", "public_ips",
+                                 "drgs", "file_systems", "policies")}
+
+        vcn_id = _ocid("vcn", f"c{c}", "v0")
+        r["vcns"].append(m.Vcn(id=vcn_id, display_name=f"vcn-{c}", compartment_id=cid, lifecycle_state="AVAILABLE",
+                               cidr_block="0.0.0.0/0" if rng.random() < 0.1 else f"10.{c % 256}.0.0/16"))
+        for n in range(spec["nsgs"]):
+            nsg_id = _ocid("networksecuritygroup", f"c{c}", f"n{n}")
+            r["nsgs"].append(m.NetworkSecurityGroup(id=nsg_id, display_name=f"nsg-{c}-{n}", compartment_id=cid,
+                                                    vcn_id=vcn_id, lifecycle_state="AVAILABLE"))
+            r["rules"].append((nsg_id, [m.SecurityRule(direction=rng.choice(["INGRESS", "EGRESS"]), protocol="6",
+                                                       source=rng.choice(["0.0.0.0/0", "10.0.0.0/8"]), is_stateless=False)
+                                        for _ in range(rng.randint(1, 4))]))
+
+        for i in range(spec["instances"]):
+            instance_id, ad = _ocid("instance", f"c{c}", f"i{i}"), ads[i % len(ads)]
+            metadata = rng.choice([{}, {"ssh_authorized_keys": "ssh-rsa AAAA"},
+                                   {"ssh_authorized_keys": "ssh-rsa AAAA", "disable_password_auth": "true",
+                                    "logging_agent": "configured"}])
+            r["instances"].append(m.Instance(
+                id=instance_id, display_name=f"instance-{c}-{i}", compartment_id=cid, availability_domain=ad,
+                lifecycle_state=rng.choice(["RUNNING"] * 4 + ["STOPPED"]), shape="VM.Standard.E4.Flex",
+                image_id=rng.choice(self.images).id, metadata=metadata, time_created=BASE_TIME + timedelta(days=i),
+                freeform_tags={"env": rng.choice(["prod", "dev"])}, defined_tags={}))
+            vnic_id = _ocid("vnic", f"c{c}", f"i{i}")
+            r["vnic_attachments"].append(m.VnicAttachment(id=_ocid("vnicattachment", f"c{c}", f"i{i}"), vnic_id=vnic_id,
+                                                          instance_id=instance_id, compartment_id=cid,
+                                                          availability_domain=ad, lifecycle_state="ATTACHED"))
+            nsg_ids = [nsg.id for nsg in rng.sample(r["nsgs"], rng.randint(0, len(r["nsgs"])))]
+            r["vnics"].append(m.Vnic(id=vnic_id, display_name=f"vnic-{c}-{i}", nsg_ids=nsg_ids, private_ip=f"10.{c % 256}.{i // 256}.{i % 256}",
+                                     public_ip=None, is_primary=True, lifecycle_state="AVAILABLE"))
+            boot_id = _ocid("bootvolume", f"c{c}", f"i{i}")
+            r["boot_volumes"].append(m.BootVolume(id=boot_id, display_name=f"instance-{c}-{i} (Boot Volume)",
+                                                  compartment_id=cid, availability_domain=ad, size_in_gbs=50,
+                                                  lifecycle_state="AVAILABLE", time_created=BASE_TIME))
+            r["boot_volume_attachments"].append(m.BootVolumeAttachment(
+                id=_ocid("bootvolumeattachment", f"c{c}", f"i{i}"), boot_volume_id=boot_id, instance_id=instance_id,
+                compartment_id=cid, availability_domain=ad, lifecycle_state="ATTACHED"))
+            r["boot_volume_backups"].extend(self._backups(m.BootVolumeBackup, "boot_volume_id", boot_id, cid, c, f"i{i}", rng))
+
+        for v in range(spec["volumes"]):
+            volume_id = _ocid("volume", f"c{c}", f"v{v}")
+            r["volumes"].append(m.Volume(id=volume_id, display_name=f"volume-{c}-{v}", compartment_id=cid,
+                                         availability_domain=ads[v % len(ads)], size_in_gbs=rng.choice([50, 100, 1024]),
+                                         lifecycle_state="AVAILABLE", is_auto_tune_enabled=rng.random() < 0.5,
+                                         time_created=BASE_TIME + timedelta(days=v)))
+            if r["instances"] and rng.random() < 0.7:
+                r["volume_attachments"].append(m.VolumeAttachment(
+                    id=_ocid("volumeattachment", f"c{c}", f"v{v}"), volume_id=volume_id,
+                    instance_id=rng.choice(r["instances"]).id, compartment_id=cid,
+                    availability_domain=ads[v % len(ads)], lifecycle_state="ATTACHED", attachment_type="paravirtualized"))
+            r["volume_backups"].extend(self._backups(m.VolumeBackup, "volume_id", volume_id, cid, c, f"v{v}", rng))
+
+        for b in range(spec["buckets"]):
+            name = f"bucket-{c}-{b}"
+            r["buckets"].append(oci.object_storage.models.Bucket(
+                name=name, namespace="synthetic", compartment_id=cid, time_created=BASE_TIME,
+                public_access_type=rng.choice(["NoPublicAccess"] * 5 + ["ObjectRead"]),
+                approximate_count=spec["objects"], approximate_size=spec["objects"] * 1000))
+            names = sorted({f"{rng.choice(OBJECT_PREFIXES)}obj{k:05d}" for k in range(spec["objects"])})
+            r["objects"].append((name, [oci.object_storage.models.ObjectSummary(
+                name=object_name, size=rng.randint(1, 10_000), time_created=BASE_TIME + timedelta(hours=k))
+                for k, object_name in enumerate(names)]))
+
+        r["adbs"].append(oci.database.models.AutonomousDatabaseSummary(
+            id=_ocid("autonomousdatabase", f"c{c}"), display_name=f"adb-{c}", compartment_id=cid,
+            db_workload=rng.choice(["OLTP", "DW"]), lifecycle_state="AVAILABLE"))
+        r["load_balancers"].append(oci.load_balancer.models.LoadBalancer(
+            id=_ocid("loadbalancer", f"c{c}"), display_name=f"lb-{c}", compartment_id=cid,
+            shape_name=rng.choice(["flexible", "100Mbps"]), lifecycle_state="ACTIVE"))
+        r["public_ips"].append(m.PublicIp(id=_ocid("publicip", f"c{c}"), ip_address=f"203.0.{c // 256 % 256}.{c % 256}",
+                                          assigned_entity_id=None if rng.random() < 0.3 else r["vnics"][0].id if r["vnics"] else None,
+                                          lifecycle_state="AVAILABLE", time_created=BASE_TIME, compartment_id=cid))
+        r["drgs"].append(m.Drg(id=_ocid("drg", f"c{c}"), display_name=f"drg-{c}", compartment_id=cid,
+                               lifecycle_state=rng.choice(["AVAILABLE"] * 3 + ["TERMINATED"]), time_created=BASE_TIME))
+        r["file_systems"].append(oci.file_storage.models.FileSystemSummary(
+            id=_ocid("filesystem", f"c{c}"), display_name=f"fs-{c}", compartment_id=cid, availability_domain=ads[0],
+            lifecycle_state=rng.choice(["ACTIVE", "ACTIVE", "DELETED"]), time_created=BASE_TIME))
+
+        for p in range(spec["policies"]):
+            statements = [rng.choice(POLICY_TEMPLATES).format(
+                group=rng.choice(self.groups).name, compartment=self.compartments[c].name, index=k,
+                dynamic_group=rng.choice(self.dynamic_groups).name if self.dynamic_groups else "dyngroup000")
+                for k in range(rng.randint(2, 5))]
+            r["policies"].append(oci.identity.models.Policy(
+                id=_ocid("policy", f"c{c}", f"p{p}"), name=f"policy-{c}-{p}", compartment_id=cid,
+                statements=statements, description=f"Synthetic policy {p}", lifecycle_state="ACTIVE",
+                time_created=BASE_TIME))
+        return r
+
+    def _backups(self, model, parent_field, parent_id, compartment_id, c, suffix, rng):
+        # One backup per hour going back from now, so age checks see a healthy schedule
+        return [model(**{parent_field: parent_id}, id=_ocid("backup", f"c{c}", suffix, f"b{k}"),
+                      display_name=f"backup-{c}-{suffix}-{k}", compartment_id=compartment_id,
+                      time_created=self.now - timedelta(hours=k), lifecycle_state="AVAILABLE", size_in_gbs=50,
+                      type=rng.choice(["INCREMENTAL", "INCREMENTAL", "FULL"]),
+                      source_type=rng.choice(["SCHEDULED", "SCHEDULED", "MANUAL"]))
+                for k in range(self.spec["backups"])]
+
+    # --- Serving ---------------------------------------------------------
+
+    def _of(self, compartment_id: str) -> Dict[str, List]:
+        if compartment_id == self.tenancy_id:
+            return {}
+        try:
+            return self.compartment(_index(compartment_id, "c"))
+        except (KeyError, IndexError):
+            return {}
+
+    @staticmethod
+    def _not_found(what: str):
+        raise oci.exceptions.ServiceError(404, "NotAuthorizedOrNotFound", {}, f"{what} not found")
+
+    @staticmethod
+    def _page(items: List, kwargs: Dict, wrap=None) -> oci.response.Response:
+        limit = kwargs.get("limit") or DEFAULT_PAGE_SIZE
+        start = int(kwargs.get("page") or 0)
+        chunk = items[start:start + limit]
+        headers = {"opc-next-page": str(start + limit)} if start + limit < len(items) else {}
+        return oci.response.Response(200, headers, wrap(chunk) if wrap else chunk, None)
+
+    @staticmethod
+    def _one(item) -> oci.response.Response:
+        return oci.response.Response(200, {}, item, None)
+
+    def respond(self, region, service: str, operation: str, args, kwargs):
+        with self._lock:
+            self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        handler = getattr(self, f"_op_{operation}", None)
+        if handler is not None:
+            return handler(*args, **kwargs)
+        if operation.startswith("list_"):
+            return self._page([], kwargs)
+        self._not_found(f"{service}.{operation}")
+
+    def summary(self) -> str:
+        return f"Served {self.calls} OCI calls from the synthetic tenancy ({self.spec['compartments']} compartments)."
+
+    # Identity
+    def _op_list_compartments(self, compartment_id, **kwargs):
+        if kwargs.get("compartment_id_in_subtree"):
+            items = self.compartments if compartment_id == self.tenancy_id else [
+                c for c in self.compartments if self._is_descendant(c, compartment_id)]
+        else:
+            items = [c for c in self.compartments if c.compartment_id == compartment_id]
+        return self._page(items, kwargs)
+
+    def _is_descendant(self, compartment, ancestor_id):
+        parent = compartment.compartment_id
+        while parent != self.tenancy_id:
+            if parent == ancestor_id:
+                return True
+            parent = self.compartments[_index(parent, "c")].compartment_id
+        return False
+
+    def _op_get_compartment(self, compartment_id, **kwargs):
+        if compartment_id == self.tenancy_id:
+            return self._one(oci.identity.models.Compartment(id=self.tenancy_id, name="root", lifecycle_state="ACTIVE",
+                                                             compartment_id=None, time_created=BASE_TIME))
+        try:
+            return self._one(self.compartments[_index(compartment_id, "c")])
+        except (KeyError, IndexError):
+            self._not_found(compartment_id)
+
+    def _op_list_region_subscriptions(self, tenancy_id, **kwargs):
+        return self._one([oci.identity.models.RegionSubscription(region_name=name, region_key=name[:3].upper(),
+                                                                 status="READY", is_home_region=i == 0)
+                          for i, name in enumerate(self.spec["regions"])])
+
+    def _op_list_availability_domains(self, compartment_id, **kwargs):
+        return self._one(self.availability_domains)
+
+    def _op_list_users(self, compartment_id, **kwargs):
+        return self._page(self.users, kwargs)
+
+    def _op_list_groups(self, compartment_id, **kwargs):
+        return self._page(self.groups, kwargs)
+
+    def _op_list_dynamic_groups(self, compartment_id, **kwargs):
+        return self._page(self.dynamic_groups, kwargs)
+
+    def _op_list_user_group_memberships(self, compartment_id, **kwargs):
+        items = self.memberships
+        if kwargs.get("group_id"):
+            items = [m for m in items if m.group_id == kwargs["group_id"]]
+        if kwargs.get("user_id"):
+            items = [m for m in items if m.user_id == kwargs["user_id"]]
+        return self._page(items, kwargs)
+
+    def _op_list_policies(self, compartment_id, **kwargs):
+        if compartment_id == self.tenancy_id:
+            return self._page(self.tenancy_policies, kwargs)
+        return self._page(self._of(compartment_id).get("policies", []), kwargs)
+
+    # Compute
+    def _op_list_instances(self, compartment_id, **kwargs):
+        items = self._of(compartment_id).get("instances", [])
+        if kwargs.get("lifecycle_state"):
+            items = [i for i in items if i.lifecycle_state == kwargs["lifecycle_state"]]
+        return self._page(items, kwargs)
+
+    def _op_get_instance(self, instance_id, **kwargs):
+        return self._find("instances", instance_id)
+
+    def _op_list_vnic_attachments(self, compartment_id, **kwargs):
+        items = self._of(compartment_id).get("vnic_attachments", [])
+        if kwargs.get("instance_id"):
+            items = [a for a in items if a.instance_id == kwargs["instance_id"]]
+        return self._page(items, kwargs)
+
+    def _op_list_volume_attachments(self, compartment_id, **kwargs):
+        items = self._of(compartment_id).get("volume_attachments", [])
+        for field in ("instance_id", "volume_id"):
+            if kwargs.get(field):
+                items = [a for a in items if getattr(a, field) == kwargs[field]]
+        return self._page(items, kwargs)
+
+    def _op_list_boot_volume_attachments(self, availability_domain, compartment_id, **kwargs):
+        items = [a for a in self._of(compartment_id).get("boot_volume_attachments", [])
+                 if a.availability_domain == availability_domain]
+        for field in ("instance_id", "boot_volume_id"):
+            if kwargs.get(field):
+                items = [a for a in items if getattr(a, field) == kwargs[field]]
+        return self._page(items, kwargs)
+
+    def _op_get_image(self, image_id, **kwargs):
+        for image in self.images:
+            if image.id == image_id:
+                return self._one(image)
+        self._not_found(image_id)
+
+    # Network
+    def _op_list_vcns(self, compartment_id, **kwargs):
+        return self._page(self._of(compartment_id).get("vcns", []), kwargs)
+
+    def _op_get_vnic(self, vnic_id, **kwargs):
+        return self._find("vnics", vnic_id)
+
+    def _op_list_network_security_groups(self, **kwargs):
+        return self._page(self._of(kwargs.get("compartment_id", "")).get("nsgs", []), kwargs)
+
+    def _op_list_network_security_group_security_rules(self, network_security_group_id, **kwargs):
+        for nsg_id, rules in self._of_ocid(network_security_group_id).get("rules", []):
+            if nsg_id == network_security_group_id:
+                return self._page(rules, kwargs)
+        self._not_found(network_security_group_id)
+
+    def _op_list_public_ips(self, scope, compartment_id, **kwargs):
+        return self._page(self._of(compartment_id).get("public_ips", []), kwargs)
+
+    def _op_list_drgs(self, compartment_id, **kwargs):
+        return self._page(self._of(compartment_id).get("drgs", []), kwargs)
+
+    # Block storage
+    def _op_list_volumes(self, **kwargs):
+        return self._page(self._of(kwargs.get("compartment_id", "")).get("volumes", []), kwargs)
+
+    def _op_get_volume(self, volume_id, **kwargs):
+        return self._find("volumes", volume_id)
+
+    def _op_list_boot_volumes(self, **kwargs):
+        return self._page(self._of(kwargs.get("compartment_id", "")).get("boot_volumes", []), kwargs)
+
+    def _op_get_boot_volume(self, boot_volume_id, **kwargs):
+        return self._find("boot_volumes", boot_volume_id)
+
+    def _op_list_volume_backups(self, compartment_id, **kwargs):
+        items = self._of(compartment_id).get("volume_backups", [])
+        if kwargs.get("volume_id"):
+            items = [b for b in items if b.volume_id == kwargs["volume_id"]]
+        return self._page(items, kwargs)
+
+    def _op_list_boot_volume_backups(self, compartment_id, **kwargs):
+        items = self._of(compartment_id).get("boot_volume_backups", [])
+        if kwargs.get("boot_volume_id"):
+            items = [b for b in items if b.boot_volume_id == kwargs["boot_volume_id"]]
+        return self._page(items, kwargs)
+
+    # Object storage
+    def _op_get_namespace(self, **kwargs):
+        return self._one("synthetic")
+
+    def _op_list_buckets(self, namespace_name, compartment_id, **kwargs):
+        summaries = [oci.object_storage.models.BucketSummary(name=b.name, namespace=b.namespace,
+                                                             compartment_id=b.compartment_id, time_created=b.time_created)
+                     for b in self._of(compartment_id).get("buckets", [])]
+        return self._page(summaries, kwargs)
+
+    def _op_get_bucket(self, namespace_name, bucket_name, **kwargs):
+        for bucket in self._of_bucket(bucket_name).get("buckets", []):
+            if bucket.name == bucket_name:
+                return self._one(bucket)
+        self._not_found(bucket_name)
+
+    def _op_list_objects(self, namespace_name, bucket_name, **kwargs):
+        objects = next((items for name, items in self._of_bucket(bucket_name).get("objects", []) if name == bucket_name), None)
+        if objects is None:
+            self._not_found(bucket_name)
+        prefix, start = kwargs.get("prefix") or "", kwargs.get("start") or ""
+        delimiter, limit = kwargs.get("delimiter"), kwargs.get("limit") or 1000
+        page, prefixes, next_start = [], [], None
+        for obj in objects:
+            if not obj.name.startswith(prefix) or obj.name < start:
+                continue
+            rest = obj.name[len(prefix):]
+            if delimiter and delimiter in rest:
+                common = prefix + rest.split(delimiter)[0] + delimiter
+                if common not in prefixes:
+                    prefixes.append(common)
+                continue
+            if len(page) == limit:
+                next_start = obj.name
+                break
+            page.append(obj)
+        return self._one(oci.object_storage.models.ListObjects(objects=page, prefixes=prefixes, next_start_with=next_start))
+
+    # Other services
+    def _op_list_autonomous_databases(self, **kwargs):
+        return self._page(self._of(kwargs.get("compartment_id", "")).get("adbs", []), kwargs)
+
+    def _op_list_load_balancers(self, compartment_id, **kwargs):
+        return self._page(self._of(compartment_id).get("load_balancers", []), kwargs)
+
+    def _op_list_file_systems(self, compartment_id, availability_domain, **kwargs):
+        return self._page([fs for fs in self._of(compartment_id).get("file_systems", [])
+                           if fs.availability_domain == availability_domain], kwargs)
+
+    def _op_list_recommendations(self, compartment_id, compartment_id_in_subtree=None, **kwargs):
+        items = [oci.optimizer.models.RecommendationSummary(name=f"recommendation-{i}", description=f"Synthetic recommendation {i}")
+                 for i in range(min(20, len(self.compartments)))]
+        return self._page(items, kwargs, lambda chunk: oci.optimizer.models.RecommendationCollection(items=chunk))
+
+    def _op_list_problems(self, compartment_id, **kwargs):
+        items = [oci.cloud_guard.models.ProblemSummary(resource_name=f"instance-{i}-0", labels=["CIS_OCI_V1.1_NETWORK"])
+                 for i in range(min(20, len(self.compartments)))]
+        return self._page(items, kwargs, lambda chunk: oci.cloud_guard.models.ProblemCollection(items=chunk))
+
+    # Resource Search: structured "query <types> resources" over every compartment
+    def _op_search_resources(self, search_details, **kwargs):
+        types = search_details.query.split("query", 1)[1].rsplit("resources", 1)[0]
+        items = []
+        for search_type in (t.strip().lower() for t in types.split(",")):
+            if search_type not in SEARCH_KINDS:
+                continue
+            label, kind = SEARCH_KINDS[search_type]
+            for c in range(len(self.compartments)):
+                for resource in self.compartment(c)[kind]:
+                    items.append(oci.resource_search.models.ResourceSummary(
+                        resource_type=label, identifier=getattr(resource, "id", None) or _ocid("bucket", f"c{c}", resource.name),
+                        compartment_id=resource.compartment_id, display_name=getattr(resource, "display_name", None) or resource.name,
+                        availability_domain=getattr(resource, "availability_domain", None),
+                        lifecycle_state=getattr(resource, "lifecycle_state", None), time_created=getattr(resource, "time_created", None),
+                        freeform_tags=getattr(resource, "freeform_tags", None) or {}))
+        return self._page(items, kwargs, lambda chunk: oci.resource_search.models.ResourceSummaryCollection(items=chunk))
+
+    # Lookups by OCID; the compartment index is part of every synthetic OCID
+    def _of_ocid(self, ocid: str) -> Dict[str, List]:
+        try:
+            return self.compartment(_index(ocid, "c"))
+        except (KeyError, IndexError):
+            return {}
+
+    def _of_bucket(self, bucket_name: str) -> Dict[str, List]:
+        try:
+            return self.compartment(int(bucket_name.split("-")[1]))
+        except (IndexError, ValueError):
+            return {}
+
+    def _find(self, kind: str, ocid: str):
+        for item in self._of_ocid(ocid).get(kind, []):
+            if item.id == ocid:
+                return self._one(item)
+        self._not_found(ocid)
@@ -0,0 +1,96 @@
+"""
+Compartment-wide index of volume attachments.
+
+Instead of calling ``list_volume_attachments(volume_id=...)`` once per block
+volume, the index lists every attachment of a compartment in a single
+paginated call and answers volume and instance lookups from memory.
+Lookups name the compartment they ask about and only see the attachments
+listed in it, exactly like ``list_volume_attachments(compartment_id=...,
+volume_id=...)``, so an answer never depends on which other compartments
+happen to be loaded already. The index is safe to share between threads;
+concurrent ``load`` calls for the same compartment fetch it only once.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict, List
+
+import oci
+
+
+class VolumeAttachmentIndex:
+    """In-memory volume attachment index keyed by compartment, then volume ID or instance ID."""
+
+    def __init__(self, compute_client):
+        self.compute_client = compute_client
+        self.by_volume: Dict[str, Dict[str, List]] = {}
+        self.by_instance: Dict[str, Dict[str, List]] = {}
+        self._loaded_compartments = set()
+        self._lock = threading.Lock()
+        self._compartment_locks: Dict[str, threading.Lock] = {}
+        self.api_calls = 0
+        self.lookups = 0
+        # Volume lookups each cost one list call per page without the index
+        self.volume_lookups = 0
+
+    def load(self, compartment_id: str) -> None:
+        """List all volume attachments of a compartment (once per run)."""
+        with self._lock:
+            if compartment_id in self._loaded_compartments:
+                return
+            compartment_lock = self._compartment_locks.setdefault(compartment_id, threading.Lock())
+
+        with compartment_lock:
+            if compartment_id in self._loaded_compartments:
+                return
+            pages = 0
+            attachments = []
+            for response in oci.pagination.list_call_get_all_results_generator(
+                self.compute_client.list_volume_attachments,
+                "response",
+                compartment_id=compartment_id
+            ):
+                pages += 1
+                attachments.extend(response.data)
+            by_volume = defaultdict(list)
+            by_instance = defaultdict(list)
+            for attachment in attachments:
+                by_volume[attachment.volume_id].append(attachment)
+                by_instance[attachment.instance_id].append(attachment)
+            with self._lock:
+                self.api_calls += pages
+                self.by_volume[compartment_id] = by_volume
+                self.by_instance[compartment_id] = by_instance
+                self._loaded_compartments.add(compartment_id)
+
+    def attachments_for_volume(self, volume_id: str, compartment_id: str) -> List:
+        """Return the attachments of a volume listed in a compartment (loaded on first use)."""
+        self.load(compartment_id)
+        with self._lock:
+            self.lookups += 1
+            self.volume_lookups += 1
+            return list(self.by_volume[compartment_id].get(volume_id, []))
+
+    def is_attached(self, volume_id: str, compartment_id: str) -> bool:
+        """Return True if the volume has at least one attachment in the compartment."""
+        return bool(self.attachments_for_volume(volume_id, compartment_id))
+
+    def volume_ids_for_instance(self, instance_id: str, compartment_id: str) -> List[str]:
+        """Return the IDs of the block volumes attached to an instance of the compartment."""
+        self.load(compartment_id)
+        with self._lock:
+            self.lookups += 1
+            return [attachment.volume_id for attachment in self.by_instance[compartment_id].get(instance_id, [])]
+
+    @property
+    def calls_saved(self) -> int:
+        """List calls avoided compared to one ``list_volume_attachments(volume_id=...)`` per volume.
+
+        Instance lookups had no list call of their own, so only volume lookups
+        count; the result is negative when the index cost more than it saved.
+        """
+        return self.volume_lookups - self.api_calls
+
+    def summary(self) -> str:
+        return (f"Volume attachment index: {self.lookups} lookups answered with {self.api_calls} API calls; "
+                f"one call per volume would have taken {self.volume_lookups} ({self.calls_saved} calls saved).")
@@ -2,10 +2,17 @@ import oci
 import csv
 import openpyxl
 from openpyxl.styles import Font
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.paging import paginate
 
 def list_iam_users_and_groups():
-    config = oci.config.from_file()
-    identity_client = oci.identity.IdentityClient(config)
+    config = load_config()
+    identity_client = create_client(oci.identity.IdentityClient, config)
     tenancy_id = config["tenancy"]
     
     print("Fetching users...")
@@ -13,7 +20,7 @@ def list_iam_users_and_groups():
     print("Fetching groups...")
     groups = identity_client.list_groups(tenancy_id).data
     print("Fetching policies...")
-    policies = identity_client.list_policies(tenancy_id).data
+    policies = list(paginate(identity_client.list_policies, tenancy_id))
     
     user_group_map = {}
     for group in groups:
@@ -22,7 +29,7 @@ def list_iam_users_and_groups():
             user_group_map.setdefault(member.user_id, []).append(group.name)
     
     print("Fetching user last login info...")
-    auth_client = oci.identity.IdentityClient(config)
+    auth_client = create_client(oci.identity.IdentityClient, config)
     
     # Create an Excel workbook
     workbook = openpyxl.Workbook()
@@ -11,19 +11,31 @@ Requirements:
     - OCI config file properly configured
 """
 
+import argparse
 import os
 import sys
+import time
 import logging
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
 from collections import defaultdict, Counter
+from concurrent.futures import ThreadPoolExecutor
 
 import oci
 import openpyxl
 from openpyxl.styles import Font, PatternFill
 from openpyxl.utils import get_column_letter
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
+from ocitools.iam_permissions import PermissionResolver
+from ocitools.iam_policies import VERBS, PolicyIndex
+from ocitools.paging import paginate
+from ocitools.risk_patterns import RiskPatternMatcher
+
 
 # Configure logging
 logging.basicConfig(
@@ -36,6 +48,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Concurrent fetches in run_audit: the identity collections, policies and memberships
+FETCH_WORKERS = 6
+# Compartments whose policies are listed at the same time
+POLICY_WORKERS = 8
+# Groups whose memberships are listed at the same time
+MEMBERSHIP_WORKERS = 8
+
 
 @dataclass
 class SecurityRisk:
@@ -49,19 +68,26 @@ class SecurityRisk:
 class OCIIAMAuditor:
     """OCI IAM Auditor class for comprehensive IAM analysis."""
     
-    def __init__(self, config_file: Optional[str] = None, profile: str = "DEFAULT"):
-        """Initialize the auditor with OCI configuration."""
+    def __init__(self, config_file: Optional[str] = None, profile: str = "DEFAULT",
+                 risk_patterns: Optional[str] = None):
+        """Initialize the auditor with OCI configuration and the risk patterns file."""
+        self.risk_matcher = RiskPatternMatcher.from_file(risk_patterns)
         try:
             # Use OCI SDK's default behavior when no config_file specified
             if config_file is None:
-                self.config = oci.config.from_file(profile_name=profile)
+                self.config = load_config(profile_name=profile)
                 logger.info("📁 Using default OCI config location")
             else:
-                self.config = oci.config.from_file(config_file, profile)
+                self.config = load_config(config_file, profile)
                 logger.info(f"📁 Using OCI config at: {config_file}")
             
             self.tenancy_id = self.config["tenancy"]
-            self.identity_client = oci.identity.IdentityClient(self.config)
+            self.identity_client = create_client(oci.identity.IdentityClient, self.config, rate_limit=True)
+            self.group_user_map: Dict[str, List[str]] = {}
+            self.timings: Dict[str, float] = {}
+            self.compartment_tree: Optional[CompartmentTree] = None
+            self.policy_index: Optional[PolicyIndex] = None
+            self.permission_resolver: Optional[PermissionResolver] = None
             logger.info("✅ OCI client initialized successfully")
             logger.info(f"🏢 Using tenancy: {self.tenancy_id}")
             
@@ -81,7 +107,7 @@ class OCIIAMAuditor:
     def list_all_results(client_func, **kwargs) -> List:
         """Helper to handle pagination for any OCI list call."""
         try:
-            return oci.pagination.list_call_get_all_results(client_func, **kwargs).data
+            return list(paginate(client_func, **kwargs))
         except Exception as e:
             logger.error(f"Error in pagination: {e}")
             return []
@@ -113,12 +139,8 @@ class OCIIAMAuditor:
     def fetch_compartments(self) -> List:
         """Fetch all compartments including root."""
         logger.info("🔍 Fetching compartments...")
-        compartments = self.list_all_results(
-            self.identity_client.list_compartments,
-            compartment_id=self.tenancy_id,
-            compartment_id_in_subtree=True,
-            access_level="ANY"
-        )
+        self.compartment_tree = CompartmentTree.load(self.identity_client, self.tenancy_id)
+        compartments = self.compartment_tree.compartments()
         # Add root compartment
         root_compartment = oci.identity.models.Compartment(
             id=self.tenancy_id, 
@@ -128,40 +150,66 @@ class OCIIAMAuditor:
         return compartments
     
     def fetch_policies(self, compartments: List) -> List:
-        """Fetch all policies from all compartments."""
+        """Fetch all policies from all compartments, ``POLICY_WORKERS`` compartments at a time."""
         logger.info("🔍 Fetching policies from all compartments...")
-        policies = []
         
-        for compartment in compartments:
+        def compartment_policies(compartment):
             try:
-                comp_policies = self.list_all_results(
+                return self.list_all_results(
                     self.identity_client.list_policies, 
                     compartment_id=compartment.id
                 )
-                policies.extend(comp_policies)
             except Exception as e:
                 logger.warning(f"Failed to fetch policies from compartment {compartment.name}: {e}")
+                return []
         
-        return policies
+        # map() keeps the compartment order, so policies come out as in a serial run
+        with ThreadPoolExecutor(max_workers=POLICY_WORKERS, thread_name_prefix="oci-policies") as executor:
+            return [policy for policies in executor.map(compartment_policies, compartments) for policy in policies]
     
-    def build_user_group_mapping(self, groups: List) -> Dict[str, List[str]]:
-        """Build mapping of users to their groups."""
-        logger.info("🔗 Building user-group mappings...")
-        user_group_map = {}
-        
-        for group in groups:
+    def fetch_memberships(self, groups: List) -> List:
+        """Fetch the user-group memberships, one listing per group, ``MEMBERSHIP_WORKERS`` groups at a time.
+
+        The listing needs a ``group_id`` (or ``user_id``), so there is no
+        tenancy-wide call. A group the request is rejected for (400) or that
+        cannot be read (401/403/404) is logged and skipped; any other error
+        fails the audit instead of leaving the mapping silently incomplete.
+        """
+        def group_memberships(group):
             try:
-                group_members = self.list_all_results(
+                return list(paginate(
                     self.identity_client.list_user_group_memberships,
                     compartment_id=self.tenancy_id,
                     group_id=group.id
-                )
-                for member in group_members:
-                    user_group_map.setdefault(member.user_id, []).append(group.name)
-            except Exception as e:
-                logger.warning(f"Failed to fetch members for group {group.name}: {e}")
-        
-        return user_group_map
+                ))
+            except oci.exceptions.ServiceError as e:
+                if e.status == 400:
+                    logger.error(f"Membership listing rejected for group {group.name} ({e.code}): {e.message}")
+                    return []
+                if e.status in (401, 403, 404):
+                    logger.warning(f"Not authorized to list members of group {group.name} ({e.status})")
+                    return []
+                raise
+
+        # map() keeps the group order, so memberships come out as in a serial run
+        with ThreadPoolExecutor(max_workers=MEMBERSHIP_WORKERS, thread_name_prefix="oci-membership") as executor:
+            return [member for members in executor.map(group_memberships, groups) for member in members]
+    
+    def build_user_group_mapping(self, groups: List) -> Dict[str, List[str]]:
+        """Build mapping of users to their groups.
+
+        The reverse index, group OCID -> user OCIDs, is kept in ``self.group_user_map``.
+        """
+        logger.info("🔗 Building user-group mappings...")
+        group_names = {group.id: group.name for group in groups}
+        user_group_map = defaultdict(list)
+        group_users = defaultdict(list)
+        for member in self.fetch_memberships(groups):
+            user_group_map[member.user_id].append(group_names[member.group_id])
+            group_users[member.group_id].append(member.user_id)
+
+        self.group_user_map = dict(group_users)
+        return dict(user_group_map)
     
     def analyze_security_risks(self, policies: List) -> Tuple[List[SecurityRisk], Dict]:
         """Analyze policies for security risks."""
@@ -170,23 +218,6 @@ class OCIIAMAuditor:
         risks = []
         all_statements = []
         
-        # High-risk patterns
-        HIGH_RISK_PATTERNS = [
-            "manage all-resources",
-            "use all-resources", 
-            "inspect tenancy",
-            "manage tenancy",
-            "manage iam",
-            "manage authentication-policies"
-        ]
-        
-        MEDIUM_RISK_PATTERNS = [
-            "manage compute",
-            "manage database",
-            "manage object-storage-buckets",
-            "manage load-balancers"
-        ]
-        
         for policy in policies:
             if not policy.statements:
                 risks.append(SecurityRisk(
@@ -199,27 +230,15 @@ class OCIIAMAuditor:
             
             for statement in policy.statements:
                 all_statements.append((statement, policy.name))
-                statement_lower = statement.lower()
                 
-                # Check for high-risk permissions
-                for pattern in HIGH_RISK_PATTERNS:
-                    if pattern in statement_lower:
-                        risks.append(SecurityRisk(
-                            policy_name=policy.name,
-                            risk_type="High-Risk Permission",
-                            details=f"Contains '{pattern}': {statement[:100]}...",
-                            severity="High"
-                        ))
-                
-                # Check for medium-risk permissions
-                for pattern in MEDIUM_RISK_PATTERNS:
-                    if pattern in statement_lower:
-                        risks.append(SecurityRisk(
-                            policy_name=policy.name,
-                            risk_type="Broad Permission",
-                            details=f"Contains '{pattern}': {statement[:100]}...",
-                            severity="Medium"
-                        ))
+                # Every risk pattern in one scan of the statement, in rules file order
+                for risk in self.risk_matcher.match(statement):
+                    risks.append(SecurityRisk(
+                        policy_name=policy.name,
+                        risk_type=risk.risk_type,
+                        details=f"Contains '{risk.pattern}': {statement[:100]}...",
+                        severity=risk.severity
+                    ))
         
         # Analyze duplicates
         statement_counter = Counter([stmt for stmt, _ in all_statements])
@@ -228,14 +247,36 @@ class OCIIAMAuditor:
             if count > 1
         }
         
+        # Structured statements, indexed by verb, resource, subject and compartment
+        self.policy_index = PolicyIndex(policies, self.compartment_tree)
+        if self.policy_index.unparsed:
+            logger.warning(f"⚠️ {len(self.policy_index.unparsed)} policy statements could not be parsed")
+        
         analysis = {
             'all_statements': all_statements,
             'duplicate_statements': duplicate_statements,
-            'statement_counter': statement_counter
+            'statement_counter': statement_counter,
+            'policy_index': self.policy_index
         }
         
         return risks, analysis
     
+    def build_permission_resolver(self, users: List, groups: List) -> PermissionResolver:
+        """Resolver of "who can <verb> <resource> in <compartment>" over the parsed policies."""
+        self.permission_resolver = PermissionResolver(self.policy_index, groups, self.group_user_map, users)
+        return self.permission_resolver
+    
+    def who_can(self, verb: str, resource: str, compartment: str) -> List[List[str]]:
+        """Rows (principal, type, via group, policy, statement, conditional) answering one query."""
+        user_names = {user.id: user.name for user in self.permission_resolver.users}
+        rows = []
+        for grant in self.permission_resolver.who_can(verb, resource, compartment):
+            principal = user_names.get(grant.principal, grant.principal) if grant.principal_kind == "user" \
+                else grant.principal or grant.principal_kind
+            rows.append([principal, grant.principal_kind, grant.via or "", grant.statement.policy_name,
+                         grant.statement.text, "Yes" if grant.statement.conditions else "No"])
+        return rows
+    
     def create_excel_report(self, data: Dict, filename: str = None) -> str:
         """Create comprehensive Excel report."""
         if not filename:
@@ -426,23 +467,58 @@ class OCIIAMAuditor:
             adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
             sheet.column_dimensions[column_letter].width = adjusted_width
     
+    def _timed(self, phase: str, fetch, *args):
+        """Run one fetch and log how long it took."""
+        started = time.perf_counter()
+        result = fetch(*args)
+        self.timings[phase] = time.perf_counter() - started
+        logger.info(f"⏱️ {phase}: {self.timings[phase]:.2f}s")
+        return result
+    
+    def fetch_all(self) -> Dict:
+        """Fetch users, groups, dynamic groups, compartments, policies and memberships concurrently.
+        
+        The tenancy-wide collections are independent of each other; policies
+        wait for the compartments and memberships for the groups.
+        """
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="oci-iam") as executor:
+            users = executor.submit(self._timed, "users", self.fetch_users)
+            groups = executor.submit(self._timed, "groups", self.fetch_groups)
+            dynamic_groups = executor.submit(self._timed, "dynamic groups", self.fetch_dynamic_groups)
+            compartments = executor.submit(self._timed, "compartments", self.fetch_compartments)
+            # Submitted last, so the futures they wait on are already running or done
+            policies = executor.submit(
+                lambda: self._timed("policies", self.fetch_policies, compartments.result()))
+            user_group_map = executor.submit(
+                lambda: self._timed("memberships", self.build_user_group_mapping, groups.result()))
+            fetched = {
+                'users': users.result(),
+                'groups': groups.result(),
+                'dynamic_groups': dynamic_groups.result(),
+                'compartments': compartments.result(),
+                'policies': policies.result(),
+                'user_group_map': user_group_map.result()
+            }
+        self.timings["fetch stage"] = time.perf_counter() - started
+        logger.info(f"⏱️ fetch stage: {self.timings['fetch stage']:.2f}s "
+                    f"(sum of phases {sum(v for k, v in self.timings.items() if k != 'fetch stage'):.2f}s)")
+        return fetched
+    
     def run_audit(self) -> str:
         """Run complete IAM audit and generate report."""
         try:
             logger.info("🚀 Starting OCI IAM audit...")
             
             # Fetch all data
-            users = self.fetch_users()
-            groups = self.fetch_groups()
-            dynamic_groups = self.fetch_dynamic_groups()
-            compartments = self.fetch_compartments()
-            policies = self.fetch_policies(compartments)
-            
-            # Build relationships
-            user_group_map = self.build_user_group_mapping(groups)
+            fetched = self.fetch_all()
+            users, groups = fetched['users'], fetched['groups']
+            dynamic_groups, compartments = fetched['dynamic_groups'], fetched['compartments']
+            policies, user_group_map = fetched['policies'], fetched['user_group_map']
             
             # Analyze security
             risks, analysis = self.analyze_security_risks(policies)
+            self.build_permission_resolver(users, groups)
             
             # Prepare data for report
             data = {
@@ -472,6 +548,16 @@ class OCIIAMAuditor:
 
 def main():
     """Main function."""
+    parser = argparse.ArgumentParser(description="Audit OCI IAM users, groups, policies and dynamic groups.")
+    parser.add_argument("--who-can", nargs=3, action="append", default=[],
+                        metavar=("VERB", "RESOURCE", "COMPARTMENT"),
+                        help="After the audit, list who can VERB RESOURCE in COMPARTMENT (a path such as Prod/DB, "
+                             "'' for the tenancy, or an OCID), e.g. --who-can manage volume-family Prod/DB. Repeatable.")
+    args = parser.parse_args()
+    for verb, _, _ in args.who_can:
+        if verb.lower() not in VERBS:
+            parser.error(f"--who-can: unknown verb '{verb}' (one of {', '.join(VERBS)})")
+    
     try:
         # You can specify config file and profile here
         auditor = OCIIAMAuditor()
@@ -479,6 +565,21 @@ def main():
         print(f"\n✅ Audit completed successfully!")
         print(f"📄 Report saved as: {filename}")
         
+        for verb, resource, compartment in args.who_can:
+            started = time.perf_counter()
+            try:
+                rows = auditor.who_can(verb, resource, compartment)
+            except KeyError as e:
+                # Compartment OCID that is not in the tenancy tree; the other queries still run
+                logger.error(f"❌ Who can {verb} {resource} in {compartment}: {e.args[0]}")
+                continue
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"\n🔑 Who can {verb} {resource} in {compartment or 'tenancy'}: "
+                  f"{len(rows)} grants ({elapsed_ms:.1f} ms)")
+            for principal, kind, via, policy_name, statement, conditional in rows:
+                print(f"  {principal:<40} {kind:<14} {via:<25} {policy_name:<30} "
+                      f"{'(conditional) ' if conditional == 'Yes' else ''}{statement}")
+        
     except KeyboardInterrupt:
         logger.info("🛑 Audit interrupted by user")
         sys.exit(1)
@@ -1,11 +1,18 @@
 import oci
 import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
 
 def list_security_lists_and_nsgs():
-    config = oci.config.from_file()
-    identity_client = oci.identity.IdentityClient(config)
-    compartments = identity_client.list_compartments(config["tenancy"], compartment_id_in_subtree=True).data
-    network_client = oci.core.VirtualNetworkClient(config)
+    config = load_config()
+    identity_client = create_client(oci.identity.IdentityClient, config)
+    compartments = CompartmentTree.load(identity_client, config["tenancy"]).compartments()
+    network_client = create_client(oci.core.VirtualNetworkClient, config)
     
     with open("security_nsg_report.csv", mode="w", newline="") as file:
         writer = csv.writer(file)
@@ -1,25 +1,27 @@
 import oci
 import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
 
 COMPARTMENT_NAME = "ClientesAutcom1"
 CSV_FILE = "block_volumes.csv"
 
-config = oci.config.from_file()
+config = load_config()
 config['region'] = 'sa-saopaulo-1'
 
-block_storage = oci.core.BlockstorageClient(config)
-identity = oci.identity.IdentityClient(config)
+block_storage = create_client(oci.core.BlockstorageClient, config)
+identity = create_client(oci.identity.IdentityClient, config)
 
 def get_compartment_id():
-    compartments = oci.pagination.list_call_get_all_results(
-        identity.list_compartments,
-        config['tenancy'],
-        compartment_id_in_subtree=True
-    ).data
-    for comp in compartments:
-        if comp.name == COMPARTMENT_NAME:
-            return comp.id
-    raise ValueError(f"Compartment {COMPARTMENT_NAME} não encontrado")
+    try:
+        return CompartmentTree.load(identity, config['tenancy']).id_of(COMPARTMENT_NAME, lifecycle_state=None)
+    except KeyError:
+        raise ValueError(f"Compartment {COMPARTMENT_NAME} não encontrado")
 
 def get_backup_policy_name(volume_id):
     policies = oci.pagination.list_call_get_all_results(
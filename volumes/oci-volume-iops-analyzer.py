@@ -1,21 +1,23 @@
 import oci
 import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocitools.clients import create_client, load_config
+from ocitools.compartments import CompartmentTree
 
 # Configuração OCI
-config = oci.config.from_file()
+config = load_config()
 config["region"] = "sa-saopaulo-1"  # Região Brazil East
 
-block_client = oci.core.BlockstorageClient(config)
-identity_client = oci.identity.IdentityClient(config)
+block_client = create_client(oci.core.BlockstorageClient, config)
+identity_client = create_client(oci.identity.IdentityClient, config)
 tenancy_id = config["tenancy"]
 
 # Lista todos os compartimentos (inclusive o root)
-compartments = oci.pagination.list_call_get_all_results(
-    identity_client.list_compartments,
-    tenancy_id,
-    compartment_id_in_subtree=True
-).data
-compartments.append(identity_client.get_compartment(tenancy_id).data)
+compartments = CompartmentTree.load(identity_client, tenancy_id).compartments(include_root=True)
 
 # Pega domínios de disponibilidade
 ads = identity_client.list_availability_domains(tenancy_id).data